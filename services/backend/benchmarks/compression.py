@@ -0,0 +1,133 @@
+"""
+Per-item DynamoDB size of jobs with plain and compressed descriptions,
+and the CPU cost of compressing and decompressing them.
+
+By default it measures the description of the saved LinkedIn job page.
+With --table it samples scraped jobs from TABLE_NAME instead, which
+needs AWS access (or DYNAMODB_URL pointing at a local table).
+
+Run from services/backend:
+
+    python -m benchmarks.compression [--table] [--sample N]
+"""
+
+import argparse
+import math
+import statistics
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+from src.job.compression import compress_text, decompress_text, zstandard
+from src.job.model import Job
+from src.job.store import _from_item, _to_item
+from src.linkedin.parser import extract_description
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "linkedin"
+
+
+def item_size(item: dict) -> int:
+    """
+    Bytes DynamoDB bills for an item: attribute names plus values, for the
+    string, binary, number and null attributes jobs are made of.
+    """
+    size = 0
+    for name, value in item.items():
+        size += len(name.encode())
+        if value is None:
+            size += 1
+        elif isinstance(value, str):
+            size += len(value.encode())
+        elif isinstance(value, (int, float)):
+            size += math.ceil(len(str(value).lstrip("-").replace(".", "")) / 2) + 1
+        else:
+            size += len(bytes(value))
+    return size
+
+
+def plain_item(job: Job) -> dict:
+    item = _to_item(Job(**{**job.__dict__, "description": ""}))
+    item["description"] = job.description
+    return item
+
+
+def fixture_jobs() -> List[Job]:
+    description = extract_description((FIXTURES / "job_page.html").read_bytes(), "lxml")
+    return [
+        Job.create(
+            id_=uuid.uuid4(),
+            title="Senior Python Developer",
+            company="Infobip",
+            location="Zagreb, City of Zagreb, Croatia",
+            job_url="https://www.linkedin.com/jobs/view/3984512301/",
+            description=description,
+            logo_url="https://media.licdn.com/dms/image/v2/infobip/company-logo",
+            author="linkedin",
+        )
+    ]
+
+
+def table_jobs(sample: int) -> List[Job]:
+    from boto3.dynamodb.conditions import Attr
+
+    from src.stores import get_job_store
+
+    table = get_job_store().table
+    jobs, scan_kwargs = [], {"FilterExpression": Attr("id").exists()}
+    while len(jobs) < sample:
+        response = table.scan(**scan_kwargs)
+        jobs.extend(_from_item(item) for item in response.get("Items", []))
+        if "LastEvaluatedKey" not in response:
+            break
+        scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+    return jobs[:sample]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--table", action="store_true")
+    arg_parser.add_argument("--sample", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    jobs = table_jobs(args.sample) if args.table else fixture_jobs()
+    print(f"{len(jobs)} jobs, codec {'zstd' if zstandard else 'zlib'}")
+
+    plain = [item_size(plain_item(job)) for job in jobs]
+    stored = [item_size(_to_item(job)) for job in jobs]
+    reductions = [1 - after / before for before, after in zip(plain, stored)]
+    print(
+        f"item size   plain median {statistics.median(plain):8.0f} B   "
+        f"stored median {statistics.median(stored):8.0f} B   "
+        f"reduction median {statistics.median(reductions):.0%}"
+    )
+    print(
+        f"write units plain {sum(math.ceil(size / 1024) for size in plain):>6}   "
+        f"stored {sum(math.ceil(size / 1024) for size in stored):>6}"
+    )
+    print(
+        f"read units  plain {sum(math.ceil(size / 4096) for size in plain):>6}   "
+        f"stored {sum(math.ceil(size / 4096) for size in stored):>6}"
+    )
+
+    texts = [job.description for job in jobs if compress_text(job.description)]
+    if not texts:
+        return
+    repeats = max(1, 2000 // len(texts))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        compressed = [compress_text(text) for text in texts]
+    compress_us = (time.perf_counter() - start) * 1e6 / (repeats * len(texts))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for data in compressed:
+            decompress_text(data)
+    decompress_us = (time.perf_counter() - start) * 1e6 / (repeats * len(texts))
+    print(
+        f"per description: compress {compress_us:.1f} us, "
+        f"decompress {decompress_us:.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+CPU time and peak Python memory per page for each HTML parser backend,
+parsing the saved LinkedIn fixtures in full and with only the subtrees
+the scraper reads.
+
+tracemalloc only sees allocations made through Python, so memory held by
+lexbor inside selectolax is not counted; its figure covers the
+BeautifulSoup tree built from the extracted subtrees.
+
+Run from services/backend:
+
+    python -m benchmarks.html_parsing [iterations]
+"""
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from src.common.html_parser import HtmlParser, available_backends
+from src.linkedin.parser import JOB_CARDS, JOB_DESCRIPTION
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "linkedin"
+
+PAGES = {
+    "search": ("search_page.html", JOB_CARDS),
+    "job": ("job_page.html", JOB_DESCRIPTION),
+}
+
+
+def cpu_ms(parse, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        parse()
+    return (time.process_time() - start) * 1000 / iterations
+
+
+def peak_kib(parse) -> float:
+    tracemalloc.start()
+    soup = parse()  # noqa: F841 - keep the tree alive until the peak is read
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main(iterations: int = 50) -> None:
+    print(f"{iterations} parses per page, mean CPU time and peak traced memory")
+    for page, (fixture, target) in PAGES.items():
+        content = (FIXTURES / fixture).read_bytes()
+        print(f"\n{page} page ({len(content) / 1024:.1f} KiB)")
+        for backend in available_backends():
+            parser = HtmlParser(backend)
+            for mode, only in (("full", None), ("targeted", target)):
+                if backend == "selectolax" and only is None:
+                    continue  # identical to lxml
+
+                def parse():
+                    return parser.parse(content, only=only)
+
+                print(
+                    f"{backend:<12} {mode:<9} "
+                    f"{cpu_ms(parse, iterations):8.2f} ms   "
+                    f"{peak_kib(parse):9.1f} KiB"
+                )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
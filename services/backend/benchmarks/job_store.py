@@ -0,0 +1,85 @@
+"""
+Per-request latency of JobStore reads against moto, comparing a store that
+builds a new boto3 resource for every call (the previous behaviour) with
+one that reuses a single pooled resource.
+
+Run from services/backend:
+
+    python -m benchmarks.job_store [requests]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import boto3
+from moto import mock_aws
+
+from src.create_dynamodb_locally import create_table
+from src.job.model import Job
+from src.job.store import JobStore
+
+TABLE_NAME = "benchmark-jobs-table"
+AUTHOR = "benchmark@email.com"
+
+
+class UnpooledJobStore(JobStore):
+    """Builds a fresh resource and table handle on every call."""
+
+    @property
+    def dynamodb(self):
+        return boto3.resource(
+            "dynamodb", endpoint_url=self.dynamodb_url, config=self.config
+        )
+
+    @property
+    def table(self):
+        return self.dynamodb.Table(self.table_name)
+
+
+def measure(store: JobStore, job_id: str, requests: int) -> list:
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        store.get(job_id, AUTHOR)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list) -> None:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(
+        f"{name:<10} mean {statistics.mean(timings):7.2f} ms   "
+        f"p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms"
+    )
+
+
+def main(requests: int = 200) -> None:
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-central-1")
+    logging.getLogger("job.store").setLevel(logging.WARNING)
+
+    with mock_aws():
+        create_table(TABLE_NAME, endpoint_url=None)
+        job = Job.create(
+            uuid.uuid4(),
+            "Python Developer",
+            "Tech Corp",
+            "Zagreb",
+            "https://example.com/job",
+            "Python role",
+            "https://example.com/logo.png",
+            AUTHOR,
+        )
+        JobStore(TABLE_NAME).add(job)
+
+        print(f"{requests} JobStore.get calls against moto")
+        report("unpooled", measure(UnpooledJobStore(TABLE_NAME), str(job.id), requests))
+        report("pooled", measure(JobStore(TABLE_NAME), str(job.id), requests))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
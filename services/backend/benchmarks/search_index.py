@@ -0,0 +1,99 @@
+"""
+Query latency of the job search index over synthetic jobs, served from a
+memory-mapped snapshot, plus the cost of building and opening it.
+
+Run from services/backend:
+
+    python -m benchmarks.search_index [jobs]
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from src.job.model import Job
+from src.search.index import JobSearchIndex, build_index
+
+TITLES = (
+    "senior junior lead staff python java rust go data backend frontend "
+    "fullstack devops cloud machine learning engineer developer architect "
+    "analyst manager qa mobile android ios security platform".split()
+)
+COMPANIES = [f"company{n}" for n in range(2000)]
+LOCATIONS = [
+    "Zagreb",
+    "Split",
+    "Rijeka",
+    "Osijek",
+    "Berlin",
+    "Munich",
+    "Vienna",
+    "Remote",
+    "Ljubljana",
+    "Belgrade",
+]
+VOCABULARY = TITLES + [f"word{n}" for n in range(20000)]
+
+QUERIES = [
+    "python developer",
+    "senior data engineer",
+    "rust",
+    "machine learning zagreb",
+    "word123 word456",
+    "developer",
+]
+
+
+def synthetic_jobs(count: int, rng: random.Random):
+    for n in range(count):
+        yield Job.create(
+            id_=uuid.UUID(int=rng.getrandbits(128)),
+            title=" ".join(rng.sample(TITLES, 3)),
+            company=rng.choice(COMPANIES),
+            location=rng.choice(LOCATIONS),
+            job_url=f"https://www.linkedin.com/jobs/view/{n}/",
+            description=" ".join(rng.choices(VOCABULARY, k=200)),
+            logo_url="",
+            author="benchmark",
+        )
+
+
+def main(count: int = 100_000) -> None:
+    rng = random.Random(42)
+    start = time.perf_counter()
+    index = build_index(synthetic_jobs(count, rng))
+    print(f"Indexed {count} jobs in {time.perf_counter() - start:.1f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "jobs.idx"
+        start = time.perf_counter()
+        index.write(str(path))
+        print(
+            f"Wrote snapshot in {time.perf_counter() - start:.1f}s "
+            f"({path.stat().st_size / 1024 / 1024:.1f} MiB)"
+        )
+
+        start = time.perf_counter()
+        mapped = JobSearchIndex.open(str(path))
+        print(f"Opened snapshot in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+        for query in QUERIES:
+            timings = []
+            for _ in range(20):
+                start = time.perf_counter()
+                result = mapped.search(query, limit=20)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{query!r:28} {result.total:>7} hits  "
+                f"median {statistics.median(timings):7.2f} ms  "
+                f"max {max(timings):7.2f} ms"
+            )
+        mapped.snapshot.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,94 @@
+"""
+Time to turn a page of jobs into a response body, comparing FastAPI's
+default path (validate against PaginatedJobsResponse, then encode with
+the standard json module) with the orjson fast path the job routes use.
+
+Run from services/backend:
+
+    python -m benchmarks.serialization [repeats]
+"""
+
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.job.model import Job
+from src.job.schema import PaginatedJobsResponse
+
+PAGE_SIZES = (10, 100, 1000)
+DESCRIPTION_WORDS = 600  # roughly 4 KB of text
+
+FIELD = create_model_field(
+    name="Response_get_paginated_jobs",
+    type_=PaginatedJobsResponse,
+    mode="serialization",
+)
+
+
+def synthetic_page(size: int, rng: random.Random) -> dict:
+    words = "python data cloud engineer team remote senior build scale".split()
+    jobs = []
+    for n in range(size):
+        job = Job.create(
+            id_=uuid.uuid4(),
+            title=f"Senior Python Developer {n}",
+            company="Tech Corp",
+            location="Zagreb, Croatia",
+            job_url=f"https://www.linkedin.com/jobs/view/{n}/",
+            description=" ".join(rng.choices(words, k=DESCRIPTION_WORDS)),
+            logo_url="https://media.licdn.com/logo.png",
+            author="benchmark@email.com",
+        )
+        job.activate()
+        jobs.append(job)
+    return {"jobs": jobs, "last_key": "eyJQSyI6ICIjYmVuY2htYXJrIn0="}
+
+
+async def validated(page: dict) -> bytes:
+    content = await serialize_response(field=FIELD, response_content=page)
+    return JSONResponse(content).body
+
+
+async def fast(page: dict) -> bytes:
+    return ORJSONResponse(page).body
+
+
+def measure(render, page: dict, repeats: int) -> float:
+    async def run():
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            await render(page)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    return asyncio.run(run())
+
+
+def main(repeats: int = 50) -> None:
+    rng = random.Random(42)
+    print(f"{'jobs':>6} {'validated':>12} {'orjson':>10} {'speedup':>8}")
+    for size in PAGE_SIZES:
+        page = synthetic_page(size, rng)
+        # Both paths must produce the same document.
+        assert json.loads(asyncio.run(validated(page))) == json.loads(
+            asyncio.run(fast(page))
+        )
+        slow_ms = measure(validated, page, repeats)
+        fast_ms = measure(fast, page, repeats)
+        print(
+            f"{size:>6} {slow_ms:>9.2f} ms {fast_ms:>7.2f} ms "
+            f"{slow_ms / fast_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+from jose import jwk
+from jose.backends.base import Key
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSKeyRegistry:
+    """
+    Public keys of a JWKS endpoint, parsed once and indexed by `kid`.
+
+    Keys older than `ttl` keep being served while a background refresh
+    replaces them. A token signed with an unknown `kid` (for example right
+    after key rotation) triggers an immediate refresh, at most once per
+    `min_refresh_interval`. Concurrent refreshes share a single request to
+    the endpoint.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str,
+        ttl: float = 3600,
+        min_refresh_interval: float = 30,
+        fetch: Optional[Callable[[], Awaitable[dict]]] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            jwks_url: URL of the `.well-known/jwks.json` document
+            ttl: Seconds after which keys are refreshed in the background
+            min_refresh_interval: Minimum seconds between refreshes caused
+                by unknown key ids
+            fetch: Coroutine returning the JWKS document; defaults to an
+                HTTP GET of `jwks_url`
+            timer: Clock used for refresh scheduling, injectable for tests
+        """
+        self.jwks_url = jwks_url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._fetch = fetch or self._fetch_jwks
+        self._timer = timer
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._keys: Dict[str, Key] = {}
+        self._loaded_at: Optional[float] = None
+        self._attempted_at = float("-inf")
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    async def get_key(self, kid: str) -> Optional[Key]:
+        """Return the verification key for `kid`, or None if it is unknown."""
+        if self._loaded_at is None:
+            await self.refresh()
+        elif self._timer() - self._loaded_at >= self.ttl and self._may_refresh():
+            self._start_refresh()
+
+        key = self._keys.get(kid)
+        if key is None and (self._refreshing() or self._may_refresh()):
+            logger.info("Unknown key id %s, refreshing JWKS", kid)
+            await self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    async def refresh(self) -> None:
+        """Reload the keys, joining a refresh that is already in flight."""
+        await asyncio.shield(self._start_refresh())
+
+    def _refreshing(self) -> bool:
+        return self._refresh_task is not None and not self._refresh_task.done()
+
+    def _may_refresh(self) -> bool:
+        return self._timer() - self._attempted_at >= self.min_refresh_interval
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._load())
+            self._refresh_task.add_done_callback(self._log_failure)
+        return self._refresh_task
+
+    @staticmethod
+    def _log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            logger.error("JWKS refresh failed: %s", task.exception())
+
+    async def _load(self) -> None:
+        self._attempted_at = self._timer()
+        jwks = await self._fetch()
+        keys = {}
+        for key in jwks.get("keys", []):
+            try:
+                keys[key["kid"]] = jwk.construct(key, algorithm=key.get("alg", "RS256"))
+            except Exception as e:
+                logger.warning("Skipping unusable JWK %s: %s", key.get("kid"), e)
+        if not keys:
+            raise ValueError(f"No usable keys found at {self.jwks_url}")
+        self._keys = keys
+        self._loaded_at = self._timer()
+        logger.info("Loaded %d JWKS keys", len(keys))
+
+    async def _fetch_jwks(self) -> dict:
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient()
+        response = await self._http_client.get(self.jwks_url)
+        response.raise_for_status()
+        return response.json()
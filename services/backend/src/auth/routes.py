@@ -4,6 +4,7 @@ from botocore.exceptions import ClientError
 from fastapi import APIRouter, Depends, HTTPException, Security, status
 from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from jose import JWTError, jwt
 from pydantic import EmailStr
 
 from src.auth.schema import (
@@ -18,7 +19,7 @@ from src.auth.schema import (
 )
 from src.aws.cognito import Cognito
 from src.common.schema import MessageResponse
-from src.dependencies import get_cognito
+from src.dependencies import evict_user_sessions, get_cognito
 
 logger = logging.getLogger(__name__)
 
@@ -167,3 +168,12 @@ async def sign_out(
         logger.info("User logged out")
     except ClientError as e:
         handle_cognito_error(e)
+
+    # Global sign-out revokes every token of the user, so drop all of
+    # their cached sessions rather than just this token's.
+    try:
+        sub = jwt.get_unverified_claims(token.credentials).get("sub")
+    except JWTError:
+        sub = None
+    if sub:
+        evict_user_sessions(sub)
@@ -0,0 +1,93 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+except ImportError:  # pragma: no cover - lxml is a regular dependency
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+logger = logging.getLogger(__name__)
+
+Markup = Union[bytes, str]
+
+
+@dataclass(frozen=True)
+class Subtree:
+    """Elements of one tag and CSS class whose subtrees are worth parsing."""
+
+    tag: str
+    class_: str
+
+    @property
+    def selector(self) -> str:
+        return f"{self.tag}.{self.class_}"
+
+    def strainer(self) -> SoupStrainer:
+        # The strainer sees the raw class attribute, so match it word-wise.
+        pattern = re.compile(rf"(^|\s){re.escape(self.class_)}(\s|$)")
+        return SoupStrainer(self.tag, class_=pattern)
+
+
+def available_backends() -> List[str]:
+    """Backends usable in this environment, fastest last."""
+    backends = ["html.parser"]
+    if lxml is not None:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    return backends
+
+
+class HtmlParser:
+    """
+    Turns raw HTML into a BeautifulSoup tree using a configurable backend.
+
+    Backends:
+        html.parser: Python's built-in parser, always available but slowest
+        lxml: libxml2 tree builder, several times faster
+        selectolax: lexbor parses the document in C and only the requested
+            subtrees are handed to BeautifulSoup; without a target it
+            behaves like lxml
+
+    Passing `only` restricts the tree to the matching subtrees, which
+    skips building Python objects for the rest of the page. Callers keep
+    working with the usual BeautifulSoup API either way.
+    """
+
+    def __init__(self, backend: str = "lxml"):
+        if backend not in ("html.parser", "lxml", "selectolax"):
+            raise ValueError(f"Unknown HTML parser backend: {backend}")
+        if backend not in available_backends():
+            fallback = "lxml" if lxml is not None else "html.parser"
+            logger.warning(
+                "HTML parser backend %s is not installed, using %s", backend, fallback
+            )
+            backend = fallback
+        self.backend = backend
+        self._tree_builder = "html.parser" if backend == "html.parser" else "lxml"
+        if self._tree_builder == "lxml" and lxml is None:
+            self._tree_builder = "html.parser"
+
+    def parse(self, markup: Markup, only: Optional[Subtree] = None) -> BeautifulSoup:
+        """
+        Args:
+            markup: Raw response body or decoded HTML
+            only: Parse only the subtrees of elements matching this target
+        """
+        if only is None:
+            return BeautifulSoup(markup, self._tree_builder)
+        if self.backend == "selectolax":
+            nodes = LexborHTMLParser(markup).css(only.selector)
+            return BeautifulSoup(
+                "".join(node.html for node in nodes), self._tree_builder
+            )
+        return BeautifulSoup(markup, self._tree_builder, parse_only=only.strainer())
@@ -0,0 +1,196 @@
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+"""
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Validators to send so the server can answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    On-disk cache of successful GET responses, stored zlib-compressed in
+    SQLite.
+
+    An entry younger than the TTL of the first pattern in `ttls` that
+    matches its URL is served without touching the network. Older entries
+    are revalidated with a conditional request using their ETag and
+    Last-Modified validators. Responses with neither a TTL nor validators
+    could never be served again, so they are not stored. When the compressed bodies exceed
+    `max_bytes`, the least recently used entries are evicted.
+
+    Methods are synchronous and may block on disk I/O, so async callers
+    run them in a thread. The database is in WAL mode with
+    synchronous=NORMAL, so commits do not fsync, and lookups only note
+    access times in memory; those are written with the next store or
+    refresh, or once `ACCESS_FLUSH_SIZE` have piled up.
+    """
+
+    ACCESS_FLUSH_SIZE = 256
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        timer: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite database file, created if missing
+            max_bytes: Budget for the compressed bodies
+            ttls: Freshness in seconds by URL regex, tried in order; URLs
+                matching none are always revalidated
+            timer: Wall clock used for freshness, injectable for tests
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._ttls = [
+            (re.compile(pattern), ttl) for pattern, ttl in (ttls or {}).items()
+        ]
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._accessed: Dict[str, float] = {}
+        self._size = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        self.stats: Counter = Counter()
+
+    def ttl_for(self, url: str) -> float:
+        for pattern, ttl in self._ttls:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def is_fresh(self, url: str, entry: CachedResponse) -> bool:
+        return self._timer() - entry.stored_at < self.ttl_for(url)
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, stored_at "
+                "FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[url] = self._timer()
+            if len(self._accessed) >= self.ACCESS_FLUSH_SIZE:
+                self._flush_accessed()
+                self._db.commit()
+        body, etag, last_modified, stored_at = row
+        return CachedResponse(zlib.decompress(body), etag, last_modified, stored_at)
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        if not (self.ttl_for(url) or etag or last_modified):
+            self.stats["uncacheable"] += 1
+            self._discard(url)
+            return
+        compressed = zlib.compress(body)
+        if len(compressed) > self.max_bytes:
+            return
+        now = self._timer()
+        with self._lock:
+            previous = self._db.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, size, etag, last_modified, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, compressed, len(compressed), etag, last_modified, now, now),
+            )
+            self._size += len(compressed) - (previous[0] if previous else 0)
+            self._accessed.pop(url, None)
+            self._flush_accessed()
+            self._evict()
+            self._db.commit()
+
+    def refresh(self, url: str) -> None:
+        """Mark an entry as fresh again after a 304 Not Modified."""
+        now = self._timer()
+        with self._lock:
+            self._accessed.pop(url, None)
+            self._flush_accessed()
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._db.commit()
+            self._db.close()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._db.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, url) for url, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _discard(self, url: str) -> None:
+        """Drop an entry superseded by a response that is not stored."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._size -= row[0]
+            self._accessed.pop(url, None)
+            self._db.commit()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            url, size = self._db.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            self._db.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._size -= size
+            self.stats["evicted"] += 1
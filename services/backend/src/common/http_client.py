@@ -1,21 +1,66 @@
 import asyncio
 import logging
-import random
+import time
+from contextlib import nullcontext
 from dataclasses import dataclass
-from functools import wraps
-from itertools import cycle
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 
 from aiohttp import (
     BasicAuth,
     ClientError,
+    ClientResponse,
+    ClientResponseError,
     ClientSession,
     ClientTimeout,
-    ServerConnectionError,
-    ServerTimeoutError,
+    TCPConnector,
 )
 from bs4 import BeautifulSoup
 
+from src.common.html_parser import HtmlParser
+from src.common.http_cache import HttpCache
+from src.common.proxy_pool import ProxyPool
+from src.common.rate_limiter import AdaptiveConcurrency, RateLimiter
+from src.common.retry import RetryPolicy
+
+# Responses LinkedIn uses to throttle scrapers; 999 is its non-standard
+# "request denied" status.
+THROTTLE_STATUSES = frozenset({429, 999})
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds the client's size cap."""
+
+
+@dataclass
+class ConnectionConfig:
+    """
+    Connection pooling and timeouts for HttpClient.
+
+    Connections are kept alive and shared between requests to the same
+    host, so concurrent scraping reuses TCP/TLS connections instead of
+    opening new ones.
+    """
+
+    limit: int = 100
+    limit_per_host: int = 10
+    dns_cache_ttl: int = 300
+    keepalive_timeout: float = 30
+    connect_timeout: float = 5
+    verify_ssl: bool = False
+    max_response_bytes: int = 5 * 1024 * 1024
+
+    def connector(self) -> TCPConnector:
+        return TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+            ssl=None if self.verify_ssl else False,
+        )
+
 
 @dataclass
 class ProxyConfig:
@@ -55,100 +100,167 @@ class ProxyConfig:
         return None
 
 
-T = TypeVar("T")
-
-
-def async_retry_with_backoff(
-    max_retries: int = 5,
-    base_delay: float = 1.0,
-    max_delay: float = 60.0,
-    exponential_base: float = 2,
-    jitter: bool = True,
-):
-    """
-    Decorator for async functions to retry with exponential backoff.
-
-    Args:
-        max_retries: Maximum number of retries before giving up
-        base_delay: Initial delay between retries in seconds
-        max_delay: Maximum delay between retries in seconds
-        exponential_base: Base for exponential calculation
-        jitter: Whether to add random jitter to delay
-    """
-
-    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
-        @wraps(func)
-        async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            retries = 0
-            while True:
-                try:
-                    return await func(*args, **kwargs)
-
-                except (
-                    ClientError,
-                    ServerConnectionError,
-                    ServerTimeoutError,
-                    asyncio.TimeoutError,
-                ) as e:
-                    retries += 1
-
-                    if retries > max_retries:
-                        logging.error(
-                            f"Max retries ({max_retries}) exceeded. Last error: {str(e)}"
-                        )
-                        return
-
-                    # Calculate delay with exponential backoff
-                    delay = min(
-                        base_delay * (exponential_base ** (retries - 1)), max_delay
-                    )
-
-                    # Add jitter if enabled
-                    if jitter:
-                        delay = delay * (0.5 + random.random())
+class HttpClient:
+    def __init__(
+        self,
+        proxy_config: Optional[ProxyConfig] = None,
+        timeout: int = 30,
+        html_parser: Optional[HtmlParser] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        proxy_pool: Optional[ProxyPool] = None,
+        cache: Optional[HttpCache] = None,
+        connection_config: Optional[ConnectionConfig] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        """
+        Args:
+            proxy_config: Proxies and their credentials, if any
+            timeout: Total timeout of a request in seconds
+            html_parser: Parser used by `get`
+            rate_limiter: Token buckets applied per (host, proxy); requests
+                are not rate limited when omitted
+            concurrency: Adaptive limit on requests in flight; unbounded
+                when omitted
+            proxy_pool: Health-weighted selection over the configured
+                proxies; built with default settings when omitted
+            cache: On-disk response cache consulted before every request
+            connection_config: Connection pool, TLS and size settings
+            retry_policy: Decides which failed requests are retried and
+                when; defaults to three retries without a budget
+        """
+        self.proxy_config = proxy_config
+        self.connection_config = connection_config or ConnectionConfig()
+        self.timeout = ClientTimeout(
+            total=timeout, connect=self.connection_config.connect_timeout
+        )
+        self.html_parser = html_parser or HtmlParser()
+        self.rate_limiter = rate_limiter or RateLimiter(0)
+        self.concurrency = concurrency
+        self.cache = cache
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=3, base_delay=1.0, max_delay=3.0
+        )
+        self.proxy_pool = proxy_pool
+        if proxy_config and not proxy_pool:
+            self.proxy_pool = ProxyPool(proxy_config.proxy_list)
+        self._session = ClientSession(
+            connector=self.connection_config.connector(),
+            timeout=self.timeout,
+            trust_env=True,
+        )
 
-                    logging.warning(
-                        f"Attempt {retries}/{max_retries} failed. "
-                        f"Retrying in {delay:.2f}s. Error: {str(e)}"
-                    )
+    def _get_next_proxy(self) -> Optional[str]:
+        return self.proxy_pool.acquire() if self.proxy_pool else None
 
-                    await asyncio.sleep(delay)
+    def proxy_stats(self) -> List[Dict[str, Any]]:
+        """Health of every proxy in the pool."""
+        return self.proxy_pool.stats() if self.proxy_pool else []
 
-                except Exception as e:
-                    # Don't retry on unhandled exceptions
-                    logging.error(f"Unhandled exception occurred: {str(e)}")
-                    raise
+    async def get(self, url: str) -> Optional[BeautifulSoup]:
+        """Fetch `url` and parse the whole page."""
+        content = await self.get_bytes(url)
+        return self.html_parser.parse(content) if content is not None else None
 
-        return wrapper
+    async def get_bytes(self, url: str) -> Optional[bytes]:
+        """
+        Fetch the raw response body of `url`, leaving decoding and parsing
+        to the caller. Fresh cached responses are returned without a
+        request; stale ones are revalidated with a conditional GET.
+        Returns None if the request fails for good.
+        """
+        return await self.retry_policy.run(url, self._fetch, url)
 
-    return decorator
+    def retry_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retry counters by URL pattern."""
+        return self.retry_policy.metrics.stats()
 
+    async def _fetch(self, url: str) -> Optional[bytes]:
+        # The cache blocks on disk, so it is kept off the event loop.
+        cached = await asyncio.to_thread(self.cache.lookup, url) if self.cache else None
+        if cached and self.cache.is_fresh(url, cached):
+            self.cache.stats["hits"] += 1
+            return cached.body
+        headers = cached.conditional_headers() if cached else None
 
-class HttpClient:
-    def __init__(self, proxy_config: Optional[ProxyConfig] = None, timeout: int = 30):
-        self.proxy_config = proxy_config
-        self.timeout = ClientTimeout(total=timeout)
-        self._proxy_cycle = cycle(proxy_config.proxy_list) if proxy_config else None
-        self._session = ClientSession(trust_env=True)
+        proxy = self._get_next_proxy()
+        proxy_url = self.proxy_config.get_proxy_url(proxy) if proxy else None
+        bucket = self.rate_limiter.bucket((urlsplit(url).netloc, proxy))
+        await bucket.acquire()
+        async with self.concurrency or nullcontext():
+            started = time.monotonic()
+            throttled = False
+            try:
+                async with self._session.get(
+                    url, proxy=proxy_url, headers=headers, timeout=self.timeout
+                ) as response:
+                    if response.status in THROTTLE_STATUSES:
+                        throttled = True
+                        bucket.penalize()
+                        if self.concurrency:
+                            self.concurrency.on_throttled()
+                    if cached and response.status == 304:
+                        self.cache.stats["revalidated"] += 1
+                        await asyncio.to_thread(self.cache.refresh, url)
+                        content = cached.body
+                    else:
+                        response.raise_for_status()
+                        content = await self._read_body(response)
+                        if self.cache:
+                            self.cache.stats["misses"] += 1
+                            await asyncio.to_thread(
+                                self.cache.store,
+                                url,
+                                content,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"),
+                            )
+            except ResponseTooLarge as e:
+                logging.warning(f"Skipping {url}: {str(e)}")
+                return None
+            except (ClientError, asyncio.TimeoutError) as e:
+                if proxy:
+                    self._record_proxy_failure(proxy, e, throttled)
+                logging.warning(f"Proxy {proxy} failed: {str(e)}")
+                raise
+            latency = time.monotonic() - started
+            bucket.reward()
+            if self.concurrency:
+                self.concurrency.on_success(latency)
+            if proxy:
+                self.proxy_pool.record_success(proxy, latency)
+            return content
 
-    def _get_next_proxy(self) -> Optional[Dict[str, str]]:
-        if not self._proxy_cycle or not self.proxy_config:
-            return None
-        proxy = next(self._proxy_cycle)
-        return self.proxy_config.get_proxy_url(proxy)
+    async def _read_body(self, response: ClientResponse) -> bytes:
+        """Stream the body, giving up once it exceeds the size cap."""
+        limit = self.connection_config.max_response_bytes
+        if response.content_length and response.content_length > limit:
+            raise ResponseTooLarge(
+                f"Content-Length {response.content_length} exceeds {limit} bytes"
+            )
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(_READ_CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) > limit:
+                raise ResponseTooLarge(f"Body exceeds {limit} bytes")
+        return bytes(body)
 
-    @async_retry_with_backoff(max_retries=3, base_delay=1.0, max_delay=3.0, jitter=True)
-    async def get(self, url: str) -> Optional[BeautifulSoup]:
-        proxy = self._get_next_proxy()
-        try:
-            response = await self._session.get(url, proxy=proxy, ssl=False)
-            response.raise_for_status()
-            content = await response.text()
-            return BeautifulSoup(content, "html.parser")
-        except ClientError as e:
-            logging.warning(f"Proxy {proxy} failed: {str(e)}")
-            raise
+    def _record_proxy_failure(
+        self, proxy: str, error: Exception, throttled: bool
+    ) -> None:
+        # Client errors other than throttling mean the proxy delivered the
+        # request fine; only connection problems, 5xx and throttling count.
+        if (
+            isinstance(error, ClientResponseError)
+            and error.status < 500
+            and not throttled
+        ):
+            self.proxy_pool.record_success(proxy)
+        else:
+            self.proxy_pool.record_failure(proxy, throttled=throttled)
 
     async def close(self):
         if self._session and not self._session.closed:
             await self._session.close()
+        if self.cache:
+            await asyncio.to_thread(self.cache.close)
@@ -0,0 +1,167 @@
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class ProxyHealth:
+    proxy: str
+    requests: int = 0
+    failures: int = 0
+    throttled: int = 0
+    success_rate: float = 1.0
+    latency: Optional[float] = None
+    state: str = CLOSED
+    consecutive_failures: int = 0
+    opened_at: float = float("-inf")
+    recent_throttles: Deque[float] = field(default_factory=deque)
+
+
+class ProxyPool:
+    """
+    Picks proxies at random, weighted by health.
+
+    Each proxy tracks a success-rate EWMA, a latency EWMA and the 429/999
+    responses it received within `throttle_window` seconds. A proxy's
+    weight is its success rate squared, divided by its latency and by one
+    plus its recent throttles, so slow or throttled proxies get less
+    traffic rather than an equal share.
+
+    A circuit breaker takes a proxy out of rotation after
+    `failure_threshold` consecutive failures. After `cooldown` seconds it
+    is half-open: the next request probes it, and the result either
+    restores it or opens the circuit again. If every proxy is open, the
+    one that has been quarantined longest is used anyway.
+    """
+
+    def __init__(
+        self,
+        proxies: List[str],
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        throttle_window: float = 60.0,
+        smoothing: float = 0.2,
+        timer: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Args:
+            proxies: Proxy addresses as configured
+            failure_threshold: Consecutive failures that open a circuit
+            cooldown: Seconds a proxy stays quarantined before a probe
+            throttle_window: Seconds a throttled response counts against
+                a proxy
+            smoothing: Weight of the newest sample in the EWMAs
+            timer: Clock used for cooldowns, injectable for tests
+            rng: Random source used for selection, injectable for tests
+        """
+        if not proxies:
+            raise ValueError("Proxy list cannot be empty")
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.throttle_window = throttle_window
+        self.smoothing = smoothing
+        self._timer = timer
+        self._rng = rng or random.Random()
+        self._health = {proxy: ProxyHealth(proxy) for proxy in proxies}
+
+    def acquire(self) -> str:
+        """Choose the proxy for the next request."""
+        now = self._timer()
+        available = []
+        for health in self._health.values():
+            if health.state == OPEN and now - health.opened_at >= self.cooldown:
+                # Probe a recovering proxy before anything else.
+                health.state = HALF_OPEN
+                return health.proxy
+            if health.state == CLOSED:
+                available.append(health)
+
+        if not available:
+            quarantined = [h for h in self._health.values() if h.state == OPEN]
+            if not quarantined:
+                # Every proxy is half-open with a probe in flight.
+                quarantined = list(self._health.values())
+            return min(quarantined, key=lambda h: h.opened_at).proxy
+
+        weights = [self._weight(health, now) for health in available]
+        return self._rng.choices(available, weights=weights)[0].proxy
+
+    def record_success(self, proxy: str, latency: Optional[float] = None) -> None:
+        health = self._health[proxy]
+        health.requests += 1
+        health.success_rate = self._smooth(health.success_rate, 1.0)
+        if latency is not None:
+            health.latency = (
+                latency
+                if health.latency is None
+                else self._smooth(health.latency, latency)
+            )
+        health.consecutive_failures = 0
+        health.state = CLOSED
+
+    def record_failure(self, proxy: str, throttled: bool = False) -> None:
+        health = self._health[proxy]
+        now = self._timer()
+        health.requests += 1
+        health.failures += 1
+        health.success_rate = self._smooth(health.success_rate, 0.0)
+        health.consecutive_failures += 1
+        if throttled:
+            health.throttled += 1
+            health.recent_throttles.append(now)
+        if (
+            health.state == HALF_OPEN
+            or health.consecutive_failures >= self.failure_threshold
+        ):
+            health.state = OPEN
+            health.opened_at = now
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Health of every proxy, for logging and monitoring."""
+        now = self._timer()
+        return [
+            {
+                "proxy": health.proxy,
+                "state": health.state,
+                "requests": health.requests,
+                "failures": health.failures,
+                "throttled": health.throttled,
+                "recent_throttles": self._recent_throttles(health, now),
+                "success_rate": round(health.success_rate, 3),
+                "latency_ms": (
+                    round(health.latency * 1000, 1) if health.latency else None
+                ),
+                "weight": round(self._weight(health, now), 3),
+            }
+            for health in self._health.values()
+        ]
+
+    def _weight(self, health: ProxyHealth, now: float) -> float:
+        latency = health.latency or self._mean_latency() or 1.0
+        return (
+            health.success_rate**2
+            / max(latency, 0.01)
+            / (1 + self._recent_throttles(health, now))
+        )
+
+    def _mean_latency(self) -> Optional[float]:
+        latencies = [h.latency for h in self._health.values() if h.latency]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def _recent_throttles(self, health: ProxyHealth, now: float) -> int:
+        while (
+            health.recent_throttles
+            and now - health.recent_throttles[0] > self.throttle_window
+        ):
+            health.recent_throttles.popleft()
+        return len(health.recent_throttles)
+
+    def _smooth(self, average: float, sample: float) -> float:
+        return (1 - self.smoothing) * average + self.smoothing * sample
@@ -0,0 +1,181 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Hashable, Optional
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most
+    `burst` tokens.
+
+    Each caller reserves a token and sleeps until it is due, so concurrent
+    callers are queued fairly without holding a lock while waiting. The
+    rate follows AIMD: `penalize` halves it down to `min_rate`, `reward`
+    raises it by a step back up to `max_rate`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1,
+        min_rate: Optional[float] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate: Steady-state tokens per second, also the ceiling for
+                `reward`; 0 disables limiting
+            burst: Bucket capacity
+            min_rate: Floor for `penalize`, defaults to a tenth of `rate`
+            timer: Clock used for refills, injectable for tests
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = rate / 10 if min_rate is None else min_rate
+        self.burst = max(burst, 1)
+        self._timer = timer
+        self._tokens = self.burst
+        self._updated_at = timer()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        now = self._timer()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self) -> None:
+        if self.rate > 0:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def reward(self) -> None:
+        if self.rate > 0:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by an arbitrary hashable, created on first use with
+    the same settings. HttpClient keys them by (host, proxy) so that every
+    exit IP gets its own allowance on every host.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+
+    def bucket(self, key: Hashable) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    async def acquire(self, key: Hashable) -> None:
+        await self.bucket(key).acquire()
+
+
+class AdaptiveConcurrency:
+    """
+    Limit on requests in flight that adapts to the server (AIMD).
+
+    Every success raises the limit by 1/limit, about one slot per round
+    trip of requests. Throttling responses, or a smoothed latency above
+    `latency_tolerance` times the lowest of the last `baseline_window`
+    latencies, cut the limit by `backoff`. The baseline is windowed so one
+    unusually fast response (a 304, a tiny page) cannot hold it down for
+    good. Cuts are spaced by `cooldown` seconds so one burst of throttled
+    responses counts once.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+        baseline_window: int = 50,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, self.minimum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self._timer = timer
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._latency: Optional[float] = None
+        self._recent_latencies: Deque[float] = deque(maxlen=max(baseline_window, 1))
+        self._decreased_at = float("-inf")
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        while self._in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on a wake-up this waiter can no longer use.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+        self._in_flight += 1
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    async def __aenter__(self) -> "AdaptiveConcurrency":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    def on_success(self, latency: float) -> None:
+        self._recent_latencies.append(latency)
+        self._latency = (
+            latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+        )
+        if self._latency > min(self._recent_latencies) * self.latency_tolerance:
+            self._decrease()
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_throttled(self) -> None:
+        self._decrease()
+
+    def _decrease(self) -> None:
+        now = self._timer()
+        if now - self._decreased_at < self.cooldown:
+            return
+        self._decreased_at = now
+        self.limit = max(self.minimum, self.limit * self.backoff)
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
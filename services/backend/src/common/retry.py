@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from dataclasses import asdict, dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from aiohttp import ClientError, ClientResponseError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 4xx responses worth retrying: request timeout, rate limiting and
+# LinkedIn's non-standard 999 "request denied".
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 429, 999})
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    Connection problems, timeouts, 5xx and throttling are transient; any
+    other HTTP error status is permanent.
+    """
+    if isinstance(error, ClientResponseError):
+        return error.status >= 500 or error.status in RETRYABLE_CLIENT_STATUSES
+    return isinstance(error, (ClientError, asyncio.TimeoutError))
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header on an error response."""
+    headers = getattr(error, "headers", None)
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of first attempts, so a failing site costs
+    at most `ratio` extra requests instead of `max_retries` times as many.
+    `min_retries` lets small runs retry before the ratio means anything.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.requests = 0
+        self.retries = 0
+
+    def record_request(self) -> None:
+        self.requests += 1
+
+    def try_spend(self) -> bool:
+        if self.retries >= self.min_retries + self.ratio * self.requests:
+            return False
+        self.retries += 1
+        return True
+
+
+@dataclass
+class RetryStats:
+    requests: int = 0
+    attempts: int = 0
+    retries: int = 0
+    giveups: int = 0
+    budget_exhausted: int = 0
+    backoff_seconds: float = 0.0
+
+
+class RetryMetrics:
+    """
+    Retry counters grouped by the first pattern in `patterns` whose regex
+    matches the URL, or by host when none does.
+    """
+
+    def __init__(self, patterns: Optional[Dict[str, str]] = None):
+        self._patterns = [
+            (name, re.compile(pattern)) for name, pattern in (patterns or {}).items()
+        ]
+        self._stats: Dict[str, RetryStats] = {}
+
+    def for_url(self, url: str) -> RetryStats:
+        key = next(
+            (name for name, pattern in self._patterns if pattern.search(url)),
+            urlsplit(url).netloc or "other",
+        )
+        return self._stats.setdefault(key, RetryStats())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {key: asdict(stats) for key, stats in self._stats.items()}
+
+
+class RetryPolicy:
+    """
+    Retries transient failures with exponential backoff and jitter,
+    honouring Retry-After, within a shared retry budget.
+
+    Permanent failures and exhausted retries are logged and turn into
+    None, so callers only ever see a result or None.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        exponential_base: float = 2,
+        jitter: bool = True,
+        budget: Optional[RetryBudget] = None,
+        metrics: Optional[RetryMetrics] = None,
+    ):
+        """
+        Args:
+            max_retries: Maximum number of retries before giving up
+            base_delay: Initial delay between retries in seconds
+            max_delay: Maximum delay between retries in seconds, also the
+                cap on a server's Retry-After
+            exponential_base: Base for exponential calculation
+            jitter: Whether to add random jitter to delay
+            budget: Retry budget shared by every call; unlimited if omitted
+            metrics: Collects per-URL-pattern counters
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.exponential_base = exponential_base
+        self.jitter = jitter
+        self.budget = budget
+        self.metrics = metrics or RetryMetrics()
+
+    def backoff(self, retry: int, error: BaseException) -> float:
+        requested = retry_after(error)
+        if requested is not None:
+            return min(requested, self.max_delay)
+        delay = min(
+            self.base_delay * (self.exponential_base ** (retry - 1)), self.max_delay
+        )
+        return delay * (0.5 + random.random()) if self.jitter else delay
+
+    async def run(
+        self, url: str, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> Optional[T]:
+        stats = self.metrics.for_url(url)
+        stats.requests += 1
+        if self.budget:
+            self.budget.record_request()
+
+        retries = 0
+        while True:
+            stats.attempts += 1
+            try:
+                return await func(*args, **kwargs)
+            except (ClientError, asyncio.TimeoutError) as e:
+                if not is_retryable(e):
+                    stats.giveups += 1
+                    logger.warning(f"Not retrying {url}: {str(e)}")
+                    return None
+                if retries >= self.max_retries:
+                    stats.giveups += 1
+                    logger.error(
+                        f"Max retries ({self.max_retries}) exceeded for {url}. "
+                        f"Last error: {str(e)}"
+                    )
+                    return None
+                if self.budget and not self.budget.try_spend():
+                    stats.giveups += 1
+                    stats.budget_exhausted += 1
+                    logger.error(f"Retry budget exhausted, giving up on {url}")
+                    return None
+
+                retries += 1
+                delay = self.backoff(retries, e)
+                stats.retries += 1
+                stats.backoff_seconds += delay
+                logger.warning(
+                    f"Attempt {retries}/{self.max_retries} for {url} failed. "
+                    f"Retrying in {delay:.2f}s. Error: {str(e)}"
+                )
+                await asyncio.sleep(delay)
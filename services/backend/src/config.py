@@ -1,6 +1,6 @@
 import logging
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -10,21 +10,66 @@ log = logging.getLogger("uvicorn")
 
 class Settings(BaseSettings):
     DYNAMODB_URL: Optional[str] = None
+    DYNAMODB_MAX_POOL_CONNECTIONS: int = 10
+    DYNAMODB_CONNECT_TIMEOUT: float = 2
+    DYNAMODB_READ_TIMEOUT: float = 5
+    DYNAMODB_TCP_KEEPALIVE: bool = True
     TABLE_NAME: str = ""
+    FEED_MAX_EMPTY_MONTHS: int = 12
+    SEARCH_INDEX_PATH: str = "/tmp/jobs.idx"
+    SEARCH_INDEX_BUCKET: str = ""
+    SEARCH_INDEX_KEY: str = "search/jobs.idx"
+    SEARCH_INDEX_REFRESH_SECONDS: float = 300
+    JOB_CACHE_TTL: float = 300
+    JOB_CACHE_SIZE: int = 4096
+    JOB_CACHE_URL: str = ""
+    FAST_JSON_RESPONSES: bool = True
     AWS_REGION: str = "eu-central-1"
     AWS_USER_POOL_ID: str = ""
     AWS_USER_POOL_CLIENT_ID: str = ""
     PROXIES: str = ""
     PROXY_USERNAME: str = ""
     PROXY_PASSWORD: str = ""
+    PROXY_FAILURE_THRESHOLD: int = 3
+    PROXY_COOLDOWN: int = 60
     TIMESPAN: str = "r2592000"
+    SCRAPE_LOCATIONS: List[str] = ["Croatia"]
+    SEARCH_CONCURRENCY: int = 4
+    INCREMENTAL_SCRAPE: bool = True
+    WATERMARK_OVERLAP_DAYS: int = 1
+    SCRAPE_LEASE_SECONDS: int = 120
+    SCRAPE_MAX_ATTEMPTS: int = 3
+    SCRAPE_POLL_INTERVAL: float = 10
     PAGES_TO_SCRAPE: int = 10
     ROUNDS: int = 1
     DAYS_TO_SCRAPE: int = 10
-    REQUEST_DELAY: int = 1
     TIMEOUT: int = 5
+    HTTP_CONNECT_TIMEOUT: float = 5
+    HTTP_CONNECTION_LIMIT: int = 100
+    HTTP_CONNECTIONS_PER_HOST: int = 10
+    HTTP_DNS_CACHE_TTL: int = 300
+    HTTP_KEEPALIVE_TIMEOUT: float = 30
+    HTTP_VERIFY_SSL: bool = False
+    HTTP_MAX_RESPONSE_BYTES: int = 5 * 1024 * 1024
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_RETRY_BUDGET: float = 0.1
+    DESCRIPTION_CONCURRENCY: int = 5
+    HOST_RATE_LIMIT: float = 2.0
+    HOST_RATE_BURST: int = 2
+    HTTP_INITIAL_CONCURRENCY: int = 4
+    HTTP_MAX_CONCURRENCY: int = 16
+    HTTP_LATENCY_TOLERANCE: float = 2.0
+    PIPELINE_QUEUE_SIZE: int = 50
+    HTML_PARSER: str = "lxml"
+    PARSE_WORKERS: int = 0
+    HTTP_CACHE_PATH: str = ""
+    HTTP_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    HTTP_CACHE_TTLS: Dict[str, int] = {r"/jobs/view/\d+": 7 * 24 * 3600}
     OPENAI_API_KEY: str = ""
     AUTHOR: str = "Anonymous"
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL: int = 300
+    JWKS_TTL: int = 3600
 
     model_config = SettingsConfigDict(
         env_file=(".env", ".env.development"),
@@ -4,51 +4,89 @@ from typing import Dict
 import boto3
 from botocore.exceptions import ClientError
 
+ATTRIBUTE_DEFINITIONS = [
+    {"AttributeName": "PK", "AttributeType": "S"},
+    {"AttributeName": "SK", "AttributeType": "S"},
+    {"AttributeName": "GS1PK", "AttributeType": "S"},
+    {"AttributeName": "GS1SK", "AttributeType": "S"},
+    {"AttributeName": "GS2PK", "AttributeType": "S"},
+    {"AttributeName": "GS2SK", "AttributeType": "S"},
+]
+
+GLOBAL_SECONDARY_INDEXES = [
+    {
+        "IndexName": "GS1",
+        "KeySchema": [
+            {"AttributeName": "GS1PK", "KeyType": "HASH"},
+            {"AttributeName": "GS1SK", "KeyType": "RANGE"},
+        ],
+        "Projection": {
+            "ProjectionType": "ALL",
+        },
+    },
+    {
+        "IndexName": "GS2",
+        "KeySchema": [
+            {"AttributeName": "GS2PK", "KeyType": "HASH"},
+            {"AttributeName": "GS2SK", "KeyType": "RANGE"},
+        ],
+        "Projection": {
+            "ProjectionType": "ALL",
+        },
+    },
+]
+
 
 def create_table(
     table_name: str, endpoint_url: str, region: str = "eu-central-1"
 ) -> Dict:
-    """Create DynamoDB table for jobs."""
+    """
+    Create DynamoDB table for jobs, or add the secondary indexes an
+    existing one created by an earlier version is missing.
+    """
+    client = boto3.client(
+        "dynamodb",
+        endpoint_url=endpoint_url,
+        region_name=region,
+        aws_access_key_id="dummy",
+        aws_secret_access_key="dummy",
+    )
     try:
-        client = boto3.client(
-            "dynamodb",
-            endpoint_url=endpoint_url,
-            region_name=region,
-            aws_access_key_id="dummy",
-            aws_secret_access_key="dummy",
-        )
-
         response = client.create_table(
-            AttributeDefinitions=[
-                {"AttributeName": "PK", "AttributeType": "S"},
-                {"AttributeName": "SK", "AttributeType": "S"},
-                {"AttributeName": "GS1PK", "AttributeType": "S"},
-                {"AttributeName": "GS1SK", "AttributeType": "S"},
-            ],
+            AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
             TableName=table_name,
             KeySchema=[
                 {"AttributeName": "PK", "KeyType": "HASH"},
                 {"AttributeName": "SK", "KeyType": "RANGE"},
             ],
             BillingMode="PAY_PER_REQUEST",
-            GlobalSecondaryIndexes=[
-                {
-                    "IndexName": "GS1",
-                    "KeySchema": [
-                        {"AttributeName": "GS1PK", "KeyType": "HASH"},
-                        {"AttributeName": "GS1SK", "KeyType": "RANGE"},
-                    ],
-                    "Projection": {
-                        "ProjectionType": "ALL",
-                    },
-                },
-            ],
+            GlobalSecondaryIndexes=GLOBAL_SECONDARY_INDEXES,
         )
         print(f"Table {table_name} created successfully")
         return response
     except ClientError as e:
-        print(f"Error creating table: {e}")
-        raise
+        if e.response["Error"]["Code"] != "ResourceInUseException":
+            print(f"Error creating table: {e}")
+            raise
+    return add_missing_indexes(client, table_name)
+
+
+def add_missing_indexes(client, table_name: str) -> Dict:
+    """Create each index of GLOBAL_SECONDARY_INDEXES the table lacks."""
+    table = client.describe_table(TableName=table_name)["Table"]
+    existing = {index["IndexName"] for index in table.get("GlobalSecondaryIndexes", [])}
+    response = table
+    for index in GLOBAL_SECONDARY_INDEXES:
+        if index["IndexName"] in existing:
+            continue
+        # DynamoDB adds one index per update.
+        response = client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=ATTRIBUTE_DEFINITIONS,
+            GlobalSecondaryIndexUpdates=[{"Create": index}],
+        )
+        print(f"Added index {index['IndexName']} to table {table_name}")
+    return response
 
 
 if __name__ == "__main__":
@@ -1,20 +1,61 @@
 import os
-from typing import Any, Dict
+import time
+from functools import lru_cache
+from typing import Any
 
-import httpx
 from fastapi import Depends, HTTPException, Security
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwk, jwt
+from jose import JWTError, jwt
 
+from src.auth.jwks import JWKSKeyRegistry
 from src.aws.cognito import Cognito
+from src.common.cache import TTLCache
 from src.config import get_settings
-from src.job.store import JobStore
+from src.job.cache import CachedJobStore, MemoryCacheBackend, RedisCacheBackend
+from src.search.index import JobSearchIndex
+from src.search.snapshots import SearchSnapshots
+from src.stores import get_async_job_store, get_job_store
 
 settings = get_settings()
 
 
-def get_job_store() -> JobStore:
-    return JobStore(settings.TABLE_NAME, dynamodb_url=settings.DYNAMODB_URL)
+@lru_cache()
+def get_cached_job_store() -> CachedJobStore:
+    """
+    Read-through cache over the shared AsyncJobStore, kept in process or,
+    with JOB_CACHE_URL set, in Redis.
+    """
+    if settings.JOB_CACHE_URL:
+        backend = RedisCacheBackend(settings.JOB_CACHE_URL)
+    else:
+        backend = MemoryCacheBackend(
+            maxsize=settings.JOB_CACHE_SIZE, ttl=settings.JOB_CACHE_TTL
+        )
+    return CachedJobStore(get_async_job_store(), backend, ttl=settings.JOB_CACHE_TTL)
+
+
+@lru_cache()
+def get_search_snapshots() -> SearchSnapshots:
+    """
+    Search index snapshots of this process, copied from SEARCH_INDEX_BUCKET
+    (or read from SEARCH_INDEX_PATH alone without one) and told about the
+    jobs this process writes.
+    """
+    snapshots = SearchSnapshots(
+        settings.SEARCH_INDEX_PATH,
+        bucket=settings.SEARCH_INDEX_BUCKET,
+        key=settings.SEARCH_INDEX_KEY,
+        refresh_seconds=settings.SEARCH_INDEX_REFRESH_SECONDS,
+    )
+    get_job_store().listeners.subscribe(snapshots)
+    get_async_job_store().listeners.subscribe(snapshots)
+    return snapshots
+
+
+def get_search_index() -> JobSearchIndex:
+    """Job search index of the latest snapshot; never scans the table."""
+    return get_search_snapshots().current()
 
 
 def get_cognito() -> Cognito:
@@ -27,25 +68,21 @@ def get_cognito() -> Cognito:
 
 bearer_scheme = HTTPBearer()
 
-_httpx_client: httpx.AsyncClient = None
-_jwks_cache: Dict[str, Any] = None
-
-
-async def get_jwks():
-    global _httpx_client, _jwks_cache
-
-    if _jwks_cache is None:
-        if _httpx_client is None:
-            _httpx_client = httpx.AsyncClient()
+# Public keys of the user pool, parsed once and refreshed in the background.
+_jwks_registry = JWKSKeyRegistry(
+    f"https://cognito-idp.{settings.AWS_REGION}.amazonaws.com/"
+    f"{settings.AWS_USER_POOL_ID}/.well-known/jwks.json",
+    ttl=settings.JWKS_TTL,
+)
 
-        jwks_url = f"https://cognito-idp.{settings.AWS_REGION}.amazonaws.com/{settings.AWS_USER_POOL_ID}/.well-known/jwks.json"
-        response = await _httpx_client.get(jwks_url)
-        _jwks_cache = response.json()
+# Verified users (token claims merged with Cognito attributes), keyed by
+# (sub, jti) and never kept past the token's own expiry.
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
 
-    if not _jwks_cache.get("keys"):
-        raise HTTPException(status_code=401, detail="No JWKS keys found")
 
-    return _jwks_cache
+def evict_user_sessions(sub: str) -> int:
+    """Drop every cached session of a user, e.g. after a global sign-out."""
+    return _user_cache.evict(lambda key, _: key[0] == sub)
 
 
 def _convert_attribute_value(name: str, value: str) -> Any:
@@ -74,15 +111,11 @@ async def get_current_user(
             headers = jwt.get_unverified_headers(token)
             kid = headers["kid"]
 
-            # Get JWKS and find the public key
-            jwks = await get_jwks()
-            key = next((key for key in jwks["keys"] if key["kid"] == kid), None)
-            if not key:
+            # Look up the pre-parsed public key
+            public_key = await _jwks_registry.get_key(kid)
+            if public_key is None:
                 raise HTTPException(status_code=401, detail="Public key not found")
 
-            # Construct the public key
-            public_key = jwk.construct(key, algorithm="RS256").to_pem()
-
             # Decode and verify the token
             decoded_token = jwt.decode(
                 token,
@@ -91,8 +124,12 @@ async def get_current_user(
                 audience=settings.AWS_USER_POOL_CLIENT_ID,
                 issuer=f"https://cognito-idp.{settings.AWS_REGION}.amazonaws.com/{settings.AWS_USER_POOL_ID}",
             )
+        cache_key = (decoded_token.get("sub"), decoded_token.get("jti"))
+        if cached_user := _user_cache.get(cache_key):
+            return dict(cached_user)
+
         cognito = get_cognito()
-        user = cognito.get_user(token)
+        user = await run_in_threadpool(cognito.get_user, token)
         user_attributes_dict = {
             attr["Name"]: _convert_attribute_value(attr["Name"], attr["Value"])
             for attr in user.get("UserAttributes", [])
@@ -101,6 +138,10 @@ async def get_current_user(
         roles = decoded_token.pop("cognito:groups", [])
         user_attributes_dict["roles"] = roles
         decoded_token.update(user_attributes_dict)
+        if all(cache_key) and "exp" in decoded_token:
+            _user_cache.set(
+                cache_key, dict(decoded_token), ttl=decoded_token["exp"] - time.time()
+            )
         return decoded_token
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
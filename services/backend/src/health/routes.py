@@ -1,4 +1,9 @@
-from fastapi import APIRouter
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from src.dependencies import get_cached_job_store, has_roles
+from src.job.cache import CachedJobStore
 
 router = APIRouter(tags=["Health"])
 
@@ -6,3 +11,12 @@ router = APIRouter(tags=["Health"])
 @router.get("/health")
 async def health():
     return {"message": "OK"}
+
+
+@router.get("/health/cache")
+async def cache_stats(
+    job_store: CachedJobStore = Depends(get_cached_job_store),
+    _: Any = Depends(has_roles(["Admin"])),
+):
+    """Hits and misses of the job read cache in this process, per route."""
+    return job_store.metrics.stats()
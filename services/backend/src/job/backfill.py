@@ -0,0 +1,47 @@
+"""
+One-off backfill of the derived secondary index keys (GS1 status views,
+GS2 feed) on items written before the store maintained them, which also
+takes jobs that are not ACTIVE out of the feed.
+
+Run from services/backend:
+
+    python -m src.job.backfill [--segments N]
+"""
+
+import argparse
+import logging
+from typing import Optional
+
+from src.job.store import JobStore, _from_item, _index_keys
+
+logger = logging.getLogger("job.backfill")
+
+
+def backfill_index_keys(job_store: JobStore, segments: int = 4) -> int:
+    """
+    Rewrite the index keys of every job item whose keys are missing or
+    stale, scanning the table in `segments` parallel segments.
+
+    Returns the number of items updated.
+    """
+    total = job_store.rewrite_items(_stale_index_keys, segments=segments)
+    logger.info("Backfilled index keys on %d items", total)
+    return total
+
+
+def _stale_index_keys(item: dict) -> Optional[dict]:
+    # Feed keys left on a job that is not ACTIVE are removed.
+    index_keys = {"GS2PK": None, "GS2SK": None, **_index_keys(_from_item(item))}
+    if all(item.get(name) == value for name, value in index_keys.items()):
+        return None
+    return index_keys
+
+
+if __name__ == "__main__":
+    from src.stores import get_job_store
+
+    logging.basicConfig(level=logging.INFO)
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--segments", type=int, default=4)
+    args = arg_parser.parse_args()
+    backfill_index_keys(get_job_store(), segments=args.segments)
@@ -0,0 +1,314 @@
+import asyncio
+import base64
+import json
+import logging
+import zlib
+from dataclasses import asdict, dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+from uuid import UUID
+
+from src.common.cache import TTLCache
+from src.job.compression import CompressedText
+from src.job.model import Job, JobStatus
+from src.job.store import COMPRESSED_DESCRIPTION, AsyncJobStore
+
+try:
+    import redis.asyncio as redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger("job.cache")
+
+# Counter bumped on every write; feed pages are cached per generation, since
+# any write can move jobs between pages.
+FEED_GENERATION = "feed-generation"
+
+# Counter per bucket of authors, bumped on writes to the jobs of any of
+# them, so every fieldset of their job lists is dropped at once. Authors
+# share AUTHOR_GENERATION_BUCKETS counters, which keeps them from growing
+# with the number of authors.
+AUTHOR_GENERATION = "author-generation:{bucket}"
+AUTHOR_GENERATION_BUCKETS = 1024
+
+
+class CacheBackend(Protocol):
+    """Where CachedJobStore keeps serialized entries and counters."""
+
+    async def get(self, key: str) -> Optional[str]: ...
+
+    async def set(self, key: str, value: str, ttl: float) -> None: ...
+
+    async def delete(self, *keys: str) -> None: ...
+
+    async def counter(self, key: str) -> int: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class MemoryCacheBackend:
+    """Per-process backend: an LRU of entries with a TTL, plus counters."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Kept apart from the entries so the LRU never evicts them; there
+        # are at most AUTHOR_GENERATION_BUCKETS + 1.
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key)
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend:
+    """
+    Backend shared between processes through Redis, or any server speaking
+    its protocol. Needs the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "jobs:"):
+        if redis is None:
+            raise RuntimeError("RedisCacheBackend needs the redis package installed")
+        self._client = redis.from_url(url, decode_responses=True)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(self._prefix + key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._client.set(self._prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(self._prefix + key for key in keys))
+
+    async def counter(self, key: str) -> int:
+        return int(await self._client.get(self._prefix + key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(self._prefix + key)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    # Misses that loaded from DynamoDB, and misses that waited on a load
+    # already in flight for the same key.
+    misses: int = 0
+    coalesced: int = 0
+
+
+class CacheMetrics:
+    """Hit and miss counters per cached route."""
+
+    def __init__(self):
+        self._stats: Dict[str, CacheStats] = {}
+
+    def for_route(self, route: str) -> CacheStats:
+        return self._stats.setdefault(route, CacheStats())
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {route: asdict(stats) for route, stats in self._stats.items()}
+
+
+def _dump_job(job: Job) -> dict:
+    # Jobs read with a projection may lack a status.
+    status = job.status.value if job.status else None
+    data = {**job.__dict__, "id": str(job.id), "status": status}
+    # Compressed descriptions stay compressed, as the store read them.
+    description = data.pop("description")
+    if isinstance(description, CompressedText):
+        data[COMPRESSED_DESCRIPTION] = base64.b64encode(description.data).decode()
+    else:
+        data["description"] = description
+    return data
+
+
+def _load_job(data: dict) -> Job:
+    status = JobStatus(data["status"]) if data["status"] else None
+    fields = {**data, "id": UUID(data["id"]), "status": status}
+    if COMPRESSED_DESCRIPTION in fields:
+        compressed = base64.b64decode(fields.pop(COMPRESSED_DESCRIPTION))
+        fields["description"] = CompressedText(compressed)
+    return Job(**fields)
+
+
+class CachedJobStore:
+    """
+    Read-through cache in front of an AsyncJobStore for the job, author and
+    feed reads behind the job routes.
+
+    Entries are stored serialized, so every read returns fresh objects that
+    callers may change freely. Writes made through this store drop the
+    job's entry and start new generations of its author's lists (shared
+    with the other authors in its bucket) and of the feed, whose keys carry
+    them; a load that overlapped a write is not cached. Concurrent misses on a key share a single load. Writes that
+    bypass it, such as the scraper's, show up once entries expire after
+    `ttl` seconds.
+
+    Anything else is passed through to the wrapped store.
+    """
+
+    def __init__(self, store: AsyncJobStore, backend: CacheBackend, ttl: float):
+        """
+        Args:
+            store: Store the reads fall through to and writes go to
+            backend: Where entries are kept
+            ttl: Seconds an entry is served before it is loaded again
+        """
+        self.store = store
+        self.backend = backend
+        self.ttl = ttl
+        self.metrics = CacheMetrics()
+        self._loads: Dict[str, asyncio.Future] = {}
+        self._writes = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.store, name)
+
+    async def close(self) -> None:
+        close = getattr(self.backend, "close", None)
+        if close is not None:
+            await close()
+        await self.store.close()
+
+    async def get(self, job_id: str, author: str) -> Job:
+        data = await self._cached(
+            "job",
+            _job_key(job_id, author),
+            lambda: self.store.get(job_id, author),
+            _dump_job,
+        )
+        return _load_job(data)
+
+    async def get_all_by_author(
+        self, author: str, fields: Optional[Sequence[str]] = None
+    ) -> List[Job]:
+        generation = await self.backend.counter(_author_generation(author))
+        data = await self._cached(
+            "mine",
+            f"mine:{author}:{generation}:{_fieldset(fields)}",
+            lambda: self.store.get_all_by_author(author, fields=fields),
+            lambda jobs: [_dump_job(job) for job in jobs],
+        )
+        return [_load_job(job) for job in data]
+
+    async def get_feed(
+        self,
+        limit: int,
+        last_key: dict = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[Job], Optional[dict]]:
+        generation = await self.backend.counter(FEED_GENERATION)
+        cursor = json.dumps(last_key, sort_keys=True)
+        data = await self._cached(
+            "feed",
+            f"feed:{generation}:{limit}:{cursor}:{_fieldset(fields)}",
+            lambda: self.store.get_feed(limit=limit, last_key=last_key, fields=fields),
+            lambda page: {
+                "jobs": [_dump_job(job) for job in page[0]],
+                "last_key": page[1],
+            },
+        )
+        return [_load_job(job) for job in data["jobs"]], data["last_key"]
+
+    async def add(self, job: Job) -> None:
+        await self.store.add(job)
+        await self._invalidate(str(job.id), job.author)
+
+    async def update(self, job: Job) -> None:
+        await self.store.update(job)
+        await self._invalidate(str(job.id), job.author)
+
+    async def delete(self, job_id: str, author: str) -> None:
+        await self.store.delete(job_id, author)
+        await self._invalidate(job_id, author)
+
+    async def _cached(
+        self,
+        route: str,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        dump: Callable[[Any], Any],
+    ) -> Any:
+        stats = self.metrics.for_route(route)
+        cached = await self.backend.get(key)
+        if cached is not None:
+            stats.hits += 1
+            return json.loads(cached)
+        loading = self._loads.get(key)
+        if loading is None:
+            stats.misses += 1
+            loading = self._loads[key] = asyncio.ensure_future(
+                self._fill(key, load, dump)
+            )
+            loading.add_done_callback(lambda _: self._forget(key, loading))
+        else:
+            stats.coalesced += 1
+        # A cancelled caller must not cancel the load others are waiting on.
+        return json.loads(await asyncio.shield(loading))
+
+    async def _fill(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        dump: Callable[[Any], Any],
+    ) -> str:
+        writes = self._writes
+        value = json.dumps(dump(await load()))
+        if self._writes == writes:
+            await self.backend.set(key, value, self.ttl)
+        return value
+
+    def _forget(self, key: str, loading: asyncio.Future) -> None:
+        if self._loads.get(key) is loading:
+            del self._loads[key]
+
+    async def _invalidate(self, job_id: str, author: str) -> None:
+        self._writes += 1
+        key = _job_key(job_id, author)
+        # Later readers must not join a load that started before the write.
+        self._loads.pop(key, None)
+        await self.backend.delete(key)
+        await self.backend.incr(_author_generation(author))
+        await self.backend.incr(FEED_GENERATION)
+        logger.debug("Invalidated cached reads of job %s", job_id)
+
+
+def _author_generation(author: str) -> str:
+    # crc32 rather than hash(), which differs between processes sharing Redis.
+    bucket = zlib.crc32(author.encode()) % AUTHOR_GENERATION_BUCKETS
+    return AUTHOR_GENERATION.format(bucket=bucket)
+
+
+def _job_key(job_id: str, author: str) -> str:
+    return f"job:{author}:{job_id}"
+
+
+def _fieldset(fields: Optional[Sequence[str]]) -> str:
+    return ",".join(sorted(fields)) if fields is not None else "*"
@@ -0,0 +1,53 @@
+"""
+One-off migration compressing the descriptions of items written before
+the store compressed them.
+
+Run from services/backend:
+
+    python -m src.job.compress_descriptions [--segments N]
+"""
+
+import argparse
+import logging
+from typing import Optional
+
+from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.types import Binary
+
+from src.job.compression import compress_text
+from src.job.store import COMPRESSED_DESCRIPTION, JobStore
+
+logger = logging.getLogger("job.compress_descriptions")
+
+
+def compress_descriptions(job_store: JobStore, segments: int = 4) -> int:
+    """
+    Move every long plain-text description into the compressed attribute,
+    scanning the table in `segments` parallel segments.
+
+    Returns the number of items updated.
+    """
+    total = job_store.rewrite_items(
+        _compressed_description,
+        segments=segments,
+        filter_expression=Attr("description").exists(),
+    )
+    logger.info("Compressed descriptions of %d items", total)
+    return total
+
+
+def _compressed_description(item: dict) -> Optional[dict]:
+    data = compress_text(item["description"] or "")
+    if data is None:
+        return None
+    return {COMPRESSED_DESCRIPTION: Binary(data), "description": None}
+
+
+if __name__ == "__main__":
+    from src.stores import get_job_store
+
+    logging.basicConfig(level=logging.INFO)
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--segments", type=int, default=4)
+    args = arg_parser.parse_args()
+    compress_descriptions(get_job_store(), segments=args.segments)
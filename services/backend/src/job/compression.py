@@ -0,0 +1,67 @@
+"""
+Compression of long job descriptions stored in DynamoDB.
+
+Descriptions of at least MIN_COMPRESSED_BYTES are stored compressed in a
+binary attribute: with zstd when the optional `zstandard` package is
+installed, otherwise with zlib. The codec is recognised from the data
+itself, so items written with either can be read back (zstd ones only
+where `zstandard` is installed).
+"""
+
+import zlib
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Shorter texts gain too little to be worth the CPU.
+MIN_COMPRESSED_BYTES = 512
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 6
+
+# Every zstd frame starts with this magic number; zlib streams never do.
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class CompressedText:
+    """Compressed text, decompressed each time it is asked for."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def decompress(self) -> str:
+        return decompress_text(self.data)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, CompressedText) and other.data == self.data
+
+    def __repr__(self) -> str:
+        return f"CompressedText({len(self.data)} bytes)"
+
+
+def compress_text(text: str) -> Optional[bytes]:
+    """
+    The compressed form of `text`, or None when it is too short or would
+    not get smaller.
+    """
+    raw = text.encode()
+    if len(raw) < MIN_COMPRESSED_BYTES:
+        return None
+    if zstandard is not None:
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        data = zlib.compress(raw, ZLIB_LEVEL)
+    return data if len(data) < len(raw) else None
+
+
+def decompress_text(data: bytes) -> str:
+    if data.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise RuntimeError("Reading zstd-compressed text needs zstandard")
+        return zstandard.ZstdDecompressor().decompress(data).decode()
+    return zlib.decompress(data).decode()
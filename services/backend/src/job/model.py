@@ -1,8 +1,10 @@
 import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
 from uuid import UUID
 
+from src.job.compression import CompressedText
+
 
 class JobStatus(str, Enum):
     """
@@ -14,6 +16,28 @@ class JobStatus(str, Enum):
     DRAFT = "DRAFT"
 
 
+class _LazyText:
+    """
+    Text field that may be set to CompressedText, which is decompressed on
+    first read and replaced by the text.
+    """
+
+    def __set_name__(self, owner, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            # Tells dataclasses the field has no default.
+            raise AttributeError(self.name)
+        value = instance.__dict__[self.name]
+        if isinstance(value, CompressedText):
+            value = instance.__dict__[self.name] = value.decompress()
+        return value
+
+    def __set__(self, instance, value) -> None:
+        instance.__dict__[self.name] = value
+
+
 @dataclass
 class Job:
     id: UUID
@@ -21,7 +45,8 @@ class Job:
     company: str
     location: str
     job_url: str
-    description: str
+    # Jobs read from the store may hold it compressed until it is used.
+    description: str = _LazyText()
     logo_url: str
     status: JobStatus
     author: str
@@ -59,3 +84,9 @@ class Job:
     def close(self) -> None:
         self.status = JobStatus.CLOSED
         self.updated_at = datetime.datetime.now(datetime.UTC).isoformat()
+
+
+# Every field of a Job, and the ones list views show: all but the
+# description, which makes up most of a job's size.
+JOB_FIELDS = tuple(field.name for field in fields(Job))
+SUMMARY_FIELDS = tuple(name for name in JOB_FIELDS if name != "description")
@@ -0,0 +1,57 @@
+"""
+One-off migration publishing scraped listings stored as drafts before the
+scraper stored them ACTIVE, so they show up in the feed and in search.
+
+Run from services/backend:
+
+    python -m src.job.publish_scraped [--segments N]
+"""
+
+import argparse
+import logging
+from typing import Optional
+
+from boto3.dynamodb.conditions import Attr
+
+from src.config import get_settings
+from src.job.model import JobStatus
+from src.job.store import JobStore, _from_item, _index_keys
+
+logger = logging.getLogger("job.publish_scraped")
+
+settings = get_settings()
+
+
+def publish_scraped_jobs(
+    job_store: JobStore, author: str = settings.AUTHOR, segments: int = 4
+) -> int:
+    """
+    Mark every DRAFT job of the scraper's `author` ACTIVE, scanning the
+    table in `segments` parallel segments.
+
+    Returns the number of items updated.
+    """
+    total = job_store.rewrite_items(
+        _published,
+        segments=segments,
+        filter_expression=Attr("author").eq(author)
+        & Attr("status").eq(JobStatus.DRAFT.value),
+    )
+    logger.info("Published %d scraped jobs", total)
+    return total
+
+
+def _published(item: dict) -> Optional[dict]:
+    job = _from_item(item)
+    job.status = JobStatus.ACTIVE
+    return {"status": job.status.value, **_index_keys(job)}
+
+
+if __name__ == "__main__":
+    from src.stores import get_job_store
+
+    logging.basicConfig(level=logging.INFO)
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--segments", type=int, default=4)
+    args = arg_parser.parse_args()
+    publish_scraped_jobs(get_job_store(), segments=args.segments)
@@ -2,30 +2,113 @@
 import datetime
 import logging
 import uuid
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
-from fastapi import APIRouter, Depends, Query
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from starlette import status
 
-from src.dependencies import get_current_user, get_job_store
-from src.job.model import Job
+from src.config import get_settings
+from src.dependencies import (
+    get_cached_job_store,
+    get_current_user,
+    get_search_index,
+)
+from src.job.cache import CachedJobStore
+from src.job.compression import CompressedText
+from src.job.model import SUMMARY_FIELDS, Job, JobStatus
 from src.job.schema import (
     CreateJobRequest,
     JobResponse,
+    JobSearchHit,
+    JobSearchResponse,
+    JobSummaryResponse,
     PaginatedJobsResponse,
     UpdateJobRequest,
 )
-from src.job.store import JobStore
-from src.job.util import decode_last_key, encode_last_key
+from src.job.util import encode_last_key, parse_feed_cursor, parse_fields
+from src.search.index import JobSearchIndex
 
 logger = logging.getLogger("job.routes")
 router = APIRouter(prefix="/jobs", tags=["Job"])
 
+settings = get_settings()
+
+
+def _json_default(value):
+    if isinstance(value, CompressedText):
+        return value.decompress()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class JobJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that decompresses descriptions still compressed from
+    the store as it writes them, the only point they are needed.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(
+            content, default=_json_default, option=orjson.OPT_NON_STR_KEYS
+        )
+
+
+def _respond(content, status_code: int = status.HTTP_200_OK):
+    """
+    Jobs come from our own store, so with FAST_JSON_RESPONSES they are
+    written straight to JSON by orjson instead of being validated against
+    the route's response_model, which then only documents the shape.
+    """
+    if settings.FAST_JSON_RESPONSES:
+        return JobJSONResponse(content, status_code=status_code)
+    return content
+
+
+def job_fields(
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated job fields to return, or 'summary' "
+        "(everything but the description, the default) or 'full'",
+    ),
+) -> Tuple[str, ...]:
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+
+def feed_cursor(
+    last_key: Optional[str] = Query(
+        None, description="Base64-encoded cursor returned by the previous page"
+    ),
+) -> Optional[dict]:
+    try:
+        return parse_feed_cursor(last_key)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+
+
+def _listing(jobs: List[Job], fields: Sequence[str]) -> List[dict]:
+    return [{name: getattr(job, name) for name in fields} for job in jobs]
+
+
+def _respond_listing(content, fields: Sequence[str]):
+    if fields == SUMMARY_FIELDS:
+        return _respond(content)
+    # Other fieldsets do not fit the summary model, so there is nothing to
+    # validate them against.
+    return JobJSONResponse(content)
+
 
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
-def create_job(
+async def create_job(
     job_request: CreateJobRequest,
-    job_store: JobStore = Depends(get_job_store),
+    job_store: CachedJobStore = Depends(get_cached_job_store),
     current_user=Depends(get_current_user),
 ):
     """
@@ -42,78 +125,119 @@ def create_job(
         logo_url=job_request.logo_url,
         author=current_user["email"],
     )
-    job_store.add(job)
+    await job_store.add(job)
     logger.debug("Job created with ID %s", job.id)
-    return job
+    return _respond(job, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("/paginated", response_model=PaginatedJobsResponse)
-def get_paginated_jobs(
-    job_store: JobStore = Depends(get_job_store),
+async def get_paginated_jobs(
+    job_store: CachedJobStore = Depends(get_cached_job_store),
     limit: int = Query(10, gt=0),
-    last_key: Optional[str] = Query(
-        None, description="Base64-encoded LastEvaluatedKey"
-    ),
+    last_key: Optional[dict] = Depends(feed_cursor),
+    fields: Tuple[str, ...] = Depends(job_fields),
 ):
+    """
+    Retrieve jobs newest first, one page at a time, without descriptions
+    unless `fields` asks for them. The feed ends once FEED_MAX_EMPTY_MONTHS
+    months in a row have no jobs; anything older is left out.
+    """
     logger.info("Fetching paginated jobs with limit %d", limit)
-    parsed_last_key = decode_last_key(last_key) if last_key else None
-    jobs, new_last_key = job_store.get_all(limit=limit, last_key=parsed_last_key)
+    jobs, new_last_key = await job_store.get_feed(
+        limit=limit, last_key=last_key, fields=fields
+    )
     encoded_last_key = encode_last_key(new_last_key) if new_last_key else None
-    return {"jobs": jobs, "last_key": encoded_last_key}
+    return _respond_listing(
+        {"jobs": _listing(jobs, fields), "last_key": encoded_last_key}, fields
+    )
 
 
-@router.get("/mine", response_model=List[JobResponse])
-def get_jobs_by_author(
-    job_store: JobStore = Depends(get_job_store), current_user=Depends(get_current_user)
+@router.get("/mine", response_model=List[JobSummaryResponse])
+async def get_jobs_by_author(
+    job_store: CachedJobStore = Depends(get_cached_job_store),
+    current_user=Depends(get_current_user),
+    fields: Tuple[str, ...] = Depends(job_fields),
 ):
     """
-    Retrieve all jobs for the current user.
+    Retrieve all jobs for the current user, without descriptions unless
+    `fields` asks for them.
     """
     logger.info("Fetching all jobs for user %s", current_user["email"])
-    jobs = job_store.get_all_by_author(current_user["email"])
+    jobs = await job_store.get_all_by_author(current_user["email"], fields=fields)
     logger.debug("Fetched %d jobs for user %s", len(jobs), current_user["email"])
-    return jobs
+    return _respond_listing(_listing(jobs, fields), fields)
+
+
+@router.get("/search", response_model=JobSearchResponse)
+async def search_jobs(
+    q: str = Query(..., min_length=1, description="Words to search for"),
+    company: Optional[str] = Query(None, description="Only jobs at this company"),
+    location: Optional[str] = Query(None, description="Only jobs in this location"),
+    limit: int = Query(20, gt=0, le=100),
+    offset: int = Query(0, ge=0),
+    search_index: JobSearchIndex = Depends(get_search_index),
+):
+    """
+    Full-text search over the titles, companies, locations and
+    descriptions of active jobs, best matches first.
+    """
+    logger.info("Searching jobs for %r", q)
+    result = search_index.search(
+        q,
+        limit=limit,
+        offset=offset,
+        company=company,
+        location=location,
+        statuses=[JobStatus.ACTIVE],
+    )
+    logger.debug("Search for %r matched %d jobs", q, result.total)
+    return {
+        "total": result.total,
+        "hits": [
+            JobSearchHit.from_hit(summary, score) for summary, score in result.hits
+        ],
+    }
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(
+async def get_job(
     job_id: str,
-    job_store: JobStore = Depends(get_job_store),
+    job_store: CachedJobStore = Depends(get_cached_job_store),
     current_user=Depends(get_current_user),
 ):
     logger.info("Fetching job %s for user %s", job_id, current_user["email"])
-    job = job_store.get(job_id, current_user["email"])
+    job = await job_store.get(job_id, current_user["email"])
     logger.debug("Job %s fetched successfully", job_id)
-    return job
+    return _respond(job)
 
 
 @router.put("/{job_id}", response_model=JobResponse)
-def update_job(
+async def update_job(
     job_id: str,
     job_request: UpdateJobRequest,
-    job_store: JobStore = Depends(get_job_store),
+    job_store: CachedJobStore = Depends(get_cached_job_store),
     current_user=Depends(get_current_user),
 ):
     """
     Update an existing job with new field values.
     """
     logger.info("Updating job %s for user %s", job_id, current_user["email"])
-    job = job_store.get(job_id, current_user["email"])
+    job = await job_store.get(job_id, current_user["email"])
     update_data = job_request.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(job, field, value)
     job.updated_at = datetime.datetime.now(datetime.UTC).isoformat()
-    job_store.update(job)
+    await job_store.update(job)
     logger.debug("Job %s updated successfully", job_id)
-    return job
+    return _respond(job)
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_job(
+async def delete_job(
     job_id: str,
-    job_store: JobStore = Depends(get_job_store),
+    job_store: CachedJobStore = Depends(get_cached_job_store),
     current_user=Depends(get_current_user),
 ):
     logger.info("Deleting job %s for user %s", job_id, current_user["email"])
-    job_store.delete(job_id, current_user["email"])
+    await job_store.delete(job_id, current_user["email"])
     logger.debug("Job %s deleted successfully", job_id)
@@ -48,6 +48,58 @@ class JobResponse(BaseSchema):
     updated_at: str = Field(..., description="ISO formatted update timestamp")
 
 
+class JobSummaryResponse(BaseSchema):
+    """
+    Job data shown in listings: everything but the description. Listings
+    requested with `fields` hold just those fields.
+    """
+
+    id: UUID = Field(..., description="Unique job identifier")
+    title: str = Field(..., description="Job title")
+    company: str = Field(..., description="Company name")
+    location: str = Field(..., description="Job location")
+    job_url: str = Field(..., description="URL to job posting")
+    logo_url: Optional[str] = Field(default=None, description="Company logo URL")
+    status: JobStatus = Field(..., description="Current job status")
+    author: str = Field(..., description="Email of job poster")
+    created_at: str = Field(..., description="ISO formatted creation timestamp")
+    updated_at: str = Field(..., description="ISO formatted update timestamp")
+
+
 class PaginatedJobsResponse(BaseModel):
-    jobs: List[JobResponse]
+    jobs: List[JobSummaryResponse]
     last_key: Optional[str] = None
+
+
+class JobSearchHit(BaseSchema):
+    """
+    A job matching a search, without its description.
+    """
+
+    id: UUID = Field(..., description="Unique job identifier")
+    title: str = Field(..., description="Job title")
+    company: str = Field(..., description="Company name")
+    location: str = Field(..., description="Job location")
+    job_url: str = Field(..., description="URL to job posting")
+    logo_url: Optional[str] = Field(default=None, description="Company logo URL")
+    status: JobStatus = Field(..., description="Current job status")
+    author: str = Field(..., description="Email of job poster")
+    created_at: str = Field(..., description="ISO formatted creation timestamp")
+    score: float = Field(..., description="BM25 relevance score")
+
+    @classmethod
+    def from_hit(cls, summary: dict, score: float) -> "JobSearchHit":
+        """From a search index hit, whose summary holds plain JSON values."""
+        return cls(
+            **{
+                **summary,
+                "id": UUID(summary["id"]),
+                "status": JobStatus(summary["status"]),
+            },
+            score=score,
+        )
+
+
+class JobSearchResponse(BaseModel):
+    total: int
+    hits: List[JobSearchHit]
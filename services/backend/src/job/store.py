@@ -1,48 +1,458 @@
 # python
+import asyncio
+import datetime
+import hashlib
 import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
 from uuid import UUID
 
+import aioboto3
 import boto3
-from boto3.dynamodb.conditions import Key
+from aiobotocore.config import AioConfig
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import Binary
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
-from src.job.model import Job, JobStatus
+from src.job.compression import CompressedText, compress_text
+from src.job.model import JOB_FIELDS, Job, JobStatus
 
 logger = logging.getLogger("job.store")
 logger.setLevel(logging.INFO)
 
+# DynamoDB accepts at most 25 put/delete requests per BatchWriteItem call.
+BATCH_WRITE_SIZE = 25
+
+# DynamoDB accepts at most 100 keys per BatchGetItem call.
+BATCH_GET_SIZE = 100
+
+# GS2 ("feed") partitions jobs by creation month and sorts them by
+# created_at, so the newest jobs can be paged with a Query. Only ACTIVE
+# jobs, the public ones, have GS2 keys.
+FEED_INDEX = "GS2"
+DEFAULT_FEED_MAX_EMPTY_MONTHS = 12
+
+DEFAULT_CONFIG = Config(
+    max_pool_connections=10,
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=5,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+DEFAULT_ASYNC_CONFIG = AioConfig(
+    max_pool_connections=10,
+    tcp_keepalive=True,
+    connect_timeout=2,
+    read_timeout=5,
+    retries={"max_attempts": 3, "mode": "standard"},
+)
+
+_RETRYABLE_ERROR_CODES = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+    "InternalServerError",
+}
+
+
+class JobListener(Protocol):
+    """Told about every job a store writes or deletes."""
+
+    def job_saved(self, job: Job) -> None: ...
+
+    def job_deleted(self, job_id: str, author: str) -> None: ...
+
+
+class JobListeners:
+    """
+    The listeners subscribed to a store. A failing listener is logged and
+    never fails the write that notified it.
+    """
+
+    def __init__(self):
+        self._listeners: List[JobListener] = []
+
+    def subscribe(self, listener: JobListener) -> None:
+        self._listeners.append(listener)
+
+    def saved(self, jobs: Iterable[Job]) -> None:
+        for job in jobs:
+            for listener in self._listeners:
+                try:
+                    listener.job_saved(job)
+                except Exception:
+                    logger.exception("Listener failed on saved job %s", job.id)
+
+    def deleted(self, job_id: str, author: str) -> None:
+        for listener in self._listeners:
+            try:
+                listener.job_deleted(job_id, author)
+            except Exception:
+                logger.exception("Listener failed on deleted job %s", job_id)
+
+
+class LookupThrottled(RuntimeError):
+    """
+    Some keys were still unprocessed after every retry. `found` holds the
+    fingerprints of the jobs that were looked up.
+    """
+
+    def __init__(self, found: Dict[UUID, str]):
+        super().__init__("Could not look up all keys: throttled")
+        self.found = found
+
+
+@dataclass
+class BatchWriteResult:
+    """
+    Outcome of a bulk write: how many jobs were stored, and the reason
+    each remaining job could not be.
+    """
+
+    written: int = 0
+    failed: Dict[UUID, str] = field(default_factory=dict)
+
+
+def _to_item(job: Job) -> dict:
+    description_attribute, description = _description_attribute(job)
+    return {
+        "PK": f"#{job.author}",
+        "SK": f"#{job.id}",
+        "id": str(job.id),
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "job_url": job.job_url,
+        description_attribute: description,
+        "logo_url": job.logo_url,
+        "status": job.status.value,
+        "author": job.author,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+        "fingerprint": listing_fingerprint(job),
+        **_index_keys(job),
+    }
+
+
+# Long descriptions are stored compressed under their own binary attribute.
+COMPRESSED_DESCRIPTION = "description_z"
+
+
+def _stored_description(job: Job):
+    """
+    The description as it is stored: CompressedText when long, else text.
+    A description still compressed from a read is written back as it is.
+    """
+    raw = job.__dict__["description"]
+    if isinstance(raw, CompressedText):
+        return raw
+    data = compress_text(raw or "")
+    return CompressedText(data) if data else raw
+
+
+def _description_attribute(job: Job) -> Tuple[str, Any]:
+    """The attribute name and value the job's description is stored as."""
+    stored = _stored_description(job)
+    if isinstance(stored, CompressedText):
+        return COMPRESSED_DESCRIPTION, Binary(stored.data)
+    return "description", stored
+
+
+# An update storing the description under one attribute removes the other.
+_OTHER_DESCRIPTION_ATTRIBUTE = {
+    "description": COMPRESSED_DESCRIPTION,
+    COMPRESSED_DESCRIPTION: "description",
+}
+
+
+def _description_from_item(item: dict):
+    """CompressedText for compressed descriptions, left to decompress on use."""
+    if COMPRESSED_DESCRIPTION in item:
+        return CompressedText(bytes(item[COMPRESSED_DESCRIPTION]))
+    return item.get("description")
+
+
+def listing_fingerprint(job: Job) -> str:
+    """
+    Hash of the fields shown on a search result card. A re-scraped posting
+    whose fingerprint matches the stored one has not changed.
+    """
+    fields = (job.title, job.company, job.location, job.job_url, job.logo_url or "")
+    return hashlib.sha256("\x1f".join(fields).encode()).hexdigest()[:32]
+
+
+def _index_keys(job: Job) -> dict:
+    """
+    Secondary index attributes derived from a job:
+    GS1 lists an author's jobs per status, most recently updated last;
+    GS2 is the newest-first feed of ACTIVE jobs, so other jobs get no GS2
+    keys.
+    """
+    keys = {
+        "GS1PK": f"#{job.author}#{job.status.value}",
+        "GS1SK": job.updated_at,
+    }
+    if job.status == JobStatus.ACTIVE:
+        keys["GS2PK"] = _feed_partition(job.created_at[:7])
+        keys["GS2SK"] = job.created_at
+    return keys
+
+
+def _from_item(item: dict) -> Job:
+    return Job(
+        id=UUID(item["id"]),
+        title=item["title"],
+        company=item["company"],
+        location=item["location"],
+        job_url=item["job_url"],
+        description=_description_from_item(item),
+        logo_url=item.get("logo_url"),
+        status=JobStatus[item["status"]],
+        author=item["author"],
+        created_at=item["created_at"],
+        updated_at=item["updated_at"],
+    )
+
+
+def _from_partial_item(item: dict) -> Job:
+    """A job read with a projection; fields left out are None."""
+    values = {name: item.get(name) for name in JOB_FIELDS}
+    values["id"] = UUID(item["id"])
+    values["description"] = _description_from_item(item)
+    if values["status"] is not None:
+        values["status"] = JobStatus[values["status"]]
+    return Job(**values)
+
+
+def _projection(fields: Optional[Sequence[str]]) -> dict:
+    """
+    Query/Scan arguments reading only `fields` (and the id) of each job,
+    or nothing to add when every field is wanted.
+    """
+    if fields is None or set(JOB_FIELDS) <= set(fields):
+        return {}
+    names = ["id", *(name for name in fields if name != "id")]
+    if "description" in names:
+        names.append(COMPRESSED_DESCRIPTION)
+    return {
+        "ProjectionExpression": ", ".join(f"#{name}" for name in names),
+        "ExpressionAttributeNames": {f"#{name}": name for name in names},
+    }
+
+
+def _converter(projection: dict):
+    return _from_partial_item if projection else _from_item
+
+
+def _update_kwargs(job: Job) -> dict:
+    index_keys = _index_keys(job)
+    description_attribute, description = _description_attribute(job)
+    # Jobs leave the feed once they are no longer ACTIVE.
+    if "GS2PK" in index_keys:
+        feed_set, feed_remove = ", #GS2PK=:GS2PK, #GS2SK=:GS2SK", ""
+    else:
+        feed_set, feed_remove = "", ", #GS2PK, #GS2SK"
+    return dict(
+        Key={
+            "PK": f"#{job.author}",
+            "SK": f"#{job.id}",
+        },
+        UpdateExpression=f"""
+            SET #title=:title, 
+                #company=:company, 
+                #location=:location,
+                #job_url=:job_url, 
+                #description=:description, 
+                #logo_url=:logo_url,
+                #status=:status, 
+                #updated_at=:updated_at,
+                #fingerprint=:fingerprint,
+                #GS1PK=:GS1PK,
+                #GS1SK=:GS1SK{feed_set}
+            REMOVE #stale_description{feed_remove}
+        """,
+        ExpressionAttributeNames={
+            "#title": "title",
+            "#company": "company",
+            "#location": "location",
+            "#job_url": "job_url",
+            "#description": description_attribute,
+            "#stale_description": _OTHER_DESCRIPTION_ATTRIBUTE[description_attribute],
+            "#logo_url": "logo_url",
+            "#status": "status",
+            "#updated_at": "updated_at",
+            "#fingerprint": "fingerprint",
+            "#GS1PK": "GS1PK",
+            "#GS1SK": "GS1SK",
+            "#GS2PK": "GS2PK",
+            "#GS2SK": "GS2SK",
+        },
+        ExpressionAttributeValues={
+            ":title": job.title,
+            ":company": job.company,
+            ":location": job.location,
+            ":job_url": job.job_url,
+            ":description": description,
+            ":logo_url": job.logo_url,
+            ":status": job.status.value,
+            ":updated_at": job.updated_at,
+            ":fingerprint": listing_fingerprint(job),
+            **{f":{name}": value for name, value in index_keys.items()},
+        },
+    )
+
+
+def _feed_partition(month: str) -> str:
+    return f"#FEED#{month}"
+
+
+def _previous_month(month: str) -> str:
+    year, month_number = map(int, month.split("-"))
+    if month_number == 1:
+        return f"{year - 1}-12"
+    return f"{year}-{month_number - 1:02d}"
+
+
+class _FeedPager:
+    """
+    Plans the queries for one page of the newest-first job feed.
+
+    The feed is read one monthly GS2 partition at a time, newest month
+    first, until the page is full or `max_empty_months` months in a row
+    had no jobs, which ends the feed. The cursor records the month being
+    read and DynamoDB's LastEvaluatedKey within it; a page only ends early
+    in a month that has jobs, so the run of empty months starts over.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        last_key: Optional[dict],
+        max_empty_months: int,
+        fields: Optional[Sequence[str]] = None,
+    ):
+        month = datetime.datetime.now(datetime.UTC).strftime("%Y-%m")
+        self.limit = limit
+        self.max_empty_months = max_empty_months
+        self.month = last_key["bucket"] if last_key else month
+        self.start_key = last_key["key"] if last_key else None
+        self.projection = _projection(fields)
+        self.jobs: List[Job] = []
+        self.month_jobs = 0
+        self.empty_months = 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.empty_months >= self.max_empty_months
+
+    def next_query(self) -> Optional[dict]:
+        if len(self.jobs) >= self.limit or self.exhausted:
+            return None
+        query_kwargs = {
+            "IndexName": FEED_INDEX,
+            "KeyConditionExpression": Key("GS2PK").eq(_feed_partition(self.month)),
+            "ScanIndexForward": False,
+            "Limit": self.limit - len(self.jobs),
+            **self.projection,
+        }
+        if self.start_key is not None:
+            query_kwargs["ExclusiveStartKey"] = self.start_key
+        return query_kwargs
+
+    def consume(self, response: dict) -> None:
+        convert = _converter(self.projection)
+        items = response.get("Items", [])
+        self.jobs.extend(convert(item) for item in items)
+        self.month_jobs += len(items)
+        self.start_key = response.get("LastEvaluatedKey")
+        if self.start_key is None:
+            self.empty_months = 0 if self.month_jobs else self.empty_months + 1
+            self.month_jobs = 0
+            self.month = _previous_month(self.month)
+
+    def result(self):
+        if self.exhausted:
+            return self.jobs, None
+        return self.jobs, {"bucket": self.month, "key": self.start_key}
+
 
 class JobStore:
     """
     DynamoDB-based implementation for storing and retrieving Job entities.
     """
 
-    def __init__(self, table_name: str, dynamodb_url: str = None):
+    def __init__(
+        self,
+        table_name: str,
+        dynamodb_url: str = None,
+        config: Optional[Config] = None,
+        feed_max_empty_months: int = DEFAULT_FEED_MAX_EMPTY_MONTHS,
+    ):
+        """
+        Args:
+            table_name: Name of the DynamoDB table
+            dynamodb_url: Optional endpoint override, e.g. DynamoDB Local
+            config: botocore client configuration (connection pool size,
+                keep-alive, timeouts); defaults to DEFAULT_CONFIG
+            feed_max_empty_months: How many months in a row without jobs
+                end the `get_feed` feed
+        """
         self.table_name = table_name
         self.dynamodb_url = dynamodb_url
+        self.config = config or DEFAULT_CONFIG
+        self.feed_max_empty_months = feed_max_empty_months
+        self._lock = threading.Lock()
+        self._resource = None
+        self._table = None
+        self.listeners = JobListeners()
         logger.info("Initialized JobStore with table: %s", table_name)
 
+    @property
+    def dynamodb(self):
+        """
+        DynamoDB resource shared by every call on this store, created on
+        first use so that a warm Lambda reuses its pooled connections.
+
+        Only the underlying client, which is thread-safe, is used across
+        threads; resource attributes are never lazily loaded.
+        """
+        if self._resource is None:
+            with self._lock:
+                if self._resource is None:
+                    session = boto3.session.Session()
+                    self._resource = session.resource(
+                        "dynamodb", endpoint_url=self.dynamodb_url, config=self.config
+                    )
+        return self._resource
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = self.dynamodb.Table(self.table_name)
+        return self._table
+
     def add(self, job: Job) -> None:
         logger.info("Adding job with id: %s for author: %s", job.id, job.author)
         try:
-            dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-            table = dynamodb.Table(self.table_name)
-            result = table.put_item(
-                Item={
-                    "PK": f"#{job.author}",
-                    "SK": f"#{job.id}",
-                    "id": str(job.id),
-                    "title": job.title,
-                    "company": job.company,
-                    "location": job.location,
-                    "job_url": job.job_url,
-                    "description": job.description,
-                    "logo_url": job.logo_url,
-                    "status": job.status.value,
-                    "author": job.author,
-                    "created_at": job.created_at,
-                    "updated_at": job.updated_at,
-                }
-            )
+            result = self.table.put_item(Item=_to_item(job))
             http_status = result.get("ResponseMetadata", {}).get("HTTPStatusCode")
             if http_status == 200:
                 logger.debug(
@@ -59,29 +469,115 @@ class JobStore:
                 "Error adding job %s for author %s: %s", job.id, job.author, e
             )
             raise
+        self.listeners.saved([job])
+
+    def add_many(
+        self,
+        jobs: Iterable[Job],
+        max_retries: int = 5,
+        base_delay: float = 0.05,
+        max_delay: float = 2.0,
+    ) -> BatchWriteResult:
+        """
+        Store jobs in batches of 25 using BatchWriteItem.
+
+        Items DynamoDB returns as unprocessed are resubmitted with
+        exponential backoff and jitter. Jobs that still are not written
+        after `max_retries` attempts, or whose batch fails with a
+        non-retryable error, are reported in the result instead of raising.
+        """
+        dynamodb = self.dynamodb
+        result = BatchWriteResult()
+        jobs = iter(jobs)
+        while batch := list(islice(jobs, BATCH_WRITE_SIZE)):
+            self._write_batch(
+                dynamodb, batch, result, max_retries, base_delay, max_delay
+            )
+            self.listeners.saved(job for job in batch if job.id not in result.failed)
+        logger.info(
+            "Batch write finished: %d written, %d failed",
+            result.written,
+            len(result.failed),
+        )
+        return result
+
+    def _write_batch(
+        self,
+        dynamodb,
+        batch: List[Job],
+        result: BatchWriteResult,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+    ) -> None:
+        # Keyed by primary key so unprocessed items can be traced back to
+        # their jobs; this also drops duplicates, which BatchWriteItem rejects.
+        pending = {(f"#{job.author}", f"#{job.id}"): job for job in batch}
+        attempt = 0
+        while pending:
+            requests = [
+                {"PutRequest": {"Item": _to_item(job)}} for job in pending.values()
+            ]
+            try:
+                response = dynamodb.batch_write_item(
+                    RequestItems={self.table_name: requests}
+                )
+                unprocessed = response.get("UnprocessedItems", {}).get(
+                    self.table_name, []
+                )
+                error = "Unprocessed after retries"
+            except ClientError as e:
+                code = e.response["Error"]["Code"]
+                if code not in _RETRYABLE_ERROR_CODES:
+                    logger.error("Batch write failed: %s", e)
+                    for job in pending.values():
+                        result.failed[job.id] = code
+                    return
+                unprocessed = requests
+                error = code
+
+            unprocessed_keys = {
+                (
+                    request["PutRequest"]["Item"]["PK"],
+                    request["PutRequest"]["Item"]["SK"],
+                )
+                for request in unprocessed
+            }
+            result.written += len(pending) - len(unprocessed_keys)
+            pending = {key: pending[key] for key in unprocessed_keys}
+            if not pending:
+                return
+
+            attempt += 1
+            if attempt > max_retries:
+                logger.error(
+                    "Giving up on %d unprocessed jobs after %d retries",
+                    len(pending),
+                    max_retries,
+                )
+                for job in pending.values():
+                    result.failed[job.id] = error
+                return
+
+            delay = min(base_delay * 2 ** (attempt - 1), max_delay)
+            delay *= 0.5 + random.random()
+            logger.warning(
+                "Retrying %d unprocessed jobs in %.2fs (attempt %d/%d)",
+                len(pending),
+                delay,
+                attempt,
+                max_retries,
+            )
+            time.sleep(delay)
 
     def get(self, job_id: str, author: str) -> Job:
         logger.info("Retrieving job with id: %s for author: %s", job_id, author)
-        dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-        table = dynamodb.Table(self.table_name)
-        record = table.get_item(Key={"PK": f"#{author}", "SK": f"#{job_id}"})
+        record = self.table.get_item(Key={"PK": f"#{author}", "SK": f"#{job_id}"})
         item = record.get("Item")
         if not item:
             logger.error("Job %s not found for author %s", job_id, author)
             raise ValueError(f"Job {job_id} not found for author {author}")
-        job = Job(
-            id=UUID(item["id"]),
-            title=item["title"],
-            company=item["company"],
-            location=item["location"],
-            job_url=item["job_url"],
-            description=item["description"],
-            logo_url=item["logo_url"],
-            status=JobStatus[item["status"]],
-            author=item["author"],
-            created_at=item["created_at"],
-            updated_at=item["updated_at"],
-        )
+        job = _from_item(item)
         logger.debug("Job retrieved successfully: %s", job_id)
         return job
 
@@ -97,8 +593,6 @@ class JobStore:
         logger.info(
             "Retrieving jobs for author: %s with status: %s", author, status.value
         )
-        dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-        table = dynamodb.Table(self.table_name)
         last_key = None
         query_kwargs = {
             "IndexName": "GS1",
@@ -108,25 +602,8 @@ class JobStore:
         while True:
             if last_key is not None:
                 query_kwargs["ExclusiveStartKey"] = last_key
-            response = table.query(**query_kwargs)
-            jobs.extend(
-                [
-                    Job(
-                        id=UUID(record["id"]),
-                        title=record["title"],
-                        company=record["company"],
-                        location=record["location"],
-                        job_url=record["job_url"],
-                        description=record["description"],
-                        logo_url=record["logo_url"],
-                        status=JobStatus[record["status"]],
-                        author=record["author"],
-                        created_at=record["created_at"],
-                        updated_at=record["updated_at"],
-                    )
-                    for record in response["Items"]
-                ]
-            )
+            response = self.table.query(**query_kwargs)
+            jobs.extend([_from_item(record) for record in response["Items"]])
             last_key = response.get("LastEvaluatedKey")
             if last_key is None:
                 break
@@ -138,113 +615,399 @@ class JobStore:
         )
         return jobs
 
-    def get_all(self, limit: int, last_key: dict = None):
+    def get_all(
+        self, limit: int, last_key: dict = None, fields: Optional[Sequence[str]] = None
+    ):
         """
         Retrieve up to a limited number of jobs from the table using pagination.
-        Use last_key to continue from a previous scan, if provided.
+        Use last_key to continue from a previous scan, if provided, and
+        `fields` to read only those fields of each job.
         """
         logger.info("Retrieving up to %d jobs", limit)
-        dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-        table = dynamodb.Table(self.table_name)
-        scan_kwargs = {"Limit": limit}
+        # Skip non-job items, such as scrape watermarks, sharing the table.
+        projection = _projection(fields)
+        scan_kwargs = {
+            "Limit": limit,
+            "FilterExpression": Attr("id").exists(),
+            **projection,
+        }
         if last_key is not None:
             scan_kwargs["ExclusiveStartKey"] = last_key
 
-        response = table.scan(**scan_kwargs)
-        jobs = [
-            Job(
-                id=UUID(item["id"]),
-                title=item["title"],
-                company=item["company"],
-                location=item["location"],
-                job_url=item["job_url"],
-                description=item["description"],
-                logo_url=item.get("logo_url"),
-                status=JobStatus[item["status"]],
-                author=item["author"],
-                created_at=item["created_at"],
-                updated_at=item["updated_at"],
-            )
-            for item in response.get("Items", [])
-        ]
+        response = self.table.scan(**scan_kwargs)
+        jobs = [_converter(projection)(item) for item in response.get("Items", [])]
         new_last_key = response.get("LastEvaluatedKey")
         logger.debug("Retrieved %d jobs; new_last_key: %s", len(jobs), new_last_key)
         return jobs, new_last_key
 
-    def get_all_by_author(self, author: str):
+    def get_feed(
+        self, limit: int, last_key: dict = None, fields: Optional[Sequence[str]] = None
+    ):
+        """
+        Retrieve a page of jobs, newest first, from the GS2 feed index.
+        Use last_key to continue from a previous page, if provided, and
+        `fields` to read only those fields of each job.
+        """
+        logger.info("Retrieving feed page of up to %d jobs", limit)
+        pager = _FeedPager(limit, last_key, self.feed_max_empty_months, fields)
+        while (query_kwargs := pager.next_query()) is not None:
+            pager.consume(self.table.query(**query_kwargs))
+        jobs, new_last_key = pager.result()
+        logger.debug("Retrieved %d jobs; new_last_key: %s", len(jobs), new_last_key)
+        return jobs, new_last_key
+
+    def get_all_by_author(self, author: str, fields: Optional[Sequence[str]] = None):
+        """
+        Retrieve every job of an author, reading only `fields` of each if
+        given.
+        """
         logger.info("Retrieving all jobs for author: %s", author)
-        dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-        table = dynamodb.Table(self.table_name)
-        response = table.query(KeyConditionExpression=Key("PK").eq(f"#{author}"))
-        jobs = [
-            Job(
-                id=UUID(item["id"]),
-                title=item["title"],
-                company=item["company"],
-                location=item["location"],
-                job_url=item["job_url"],
-                description=item["description"],
-                logo_url=item.get("logo_url"),
-                status=JobStatus[item["status"]],
-                author=item["author"],
-                created_at=item["created_at"],
-                updated_at=item["updated_at"],
-            )
-            for item in response["Items"]
-        ]
+        projection = _projection(fields)
+        response = self.table.query(
+            KeyConditionExpression=Key("PK").eq(f"#{author}"), **projection
+        )
+        jobs = [_converter(projection)(item) for item in response["Items"]]
         logger.debug("Retrieved %d total jobs for author %s", len(jobs), author)
         return jobs
 
     def update(self, job: Job) -> None:
         logger.info("Updating job with id: %s for author: %s", job.id, job.author)
-        dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-        table = dynamodb.Table(self.table_name)
-        table.update_item(
-            Key={
-                "PK": f"#{job.author}",
-                "SK": f"#{job.id}",
-            },
-            UpdateExpression="""
-                SET #title=:title, 
-                    #company=:company, 
-                    #location=:location,
-                    #job_url=:job_url, 
-                    #description=:description, 
-                    #logo_url=:logo_url,
-                    #status=:status, 
-                    #updated_at=:updated_at
-            """,
-            ExpressionAttributeNames={
-                "#title": "title",
-                "#company": "company",
-                "#location": "location",
-                "#job_url": "job_url",
-                "#description": "description",
-                "#logo_url": "logo_url",
-                "#status": "status",
-                "#updated_at": "updated_at",
-            },
-            ExpressionAttributeValues={
-                ":title": job.title,
-                ":company": job.company,
-                ":location": job.location,
-                ":job_url": job.job_url,
-                ":description": job.description,
-                ":logo_url": job.logo_url,
-                ":status": job.status.value,
-                ":updated_at": job.updated_at,
-            },
-        )
+        self.table.update_item(**_update_kwargs(job))
+        self.listeners.saved([job])
         logger.debug("Job updated successfully: %s", job.id)
 
+    def update_listing(self, job: Job) -> bool:
+        """
+        Refresh the scraped fields of a stored job, keeping its status and
+        creation time. The write is conditional on the listing fingerprint
+        having changed; returns False if the stored job was already current.
+        """
+        logger.info("Refreshing listing %s for author: %s", job.id, job.author)
+        description_attribute, description = _description_attribute(job)
+        try:
+            self.table.update_item(
+                Key={"PK": f"#{job.author}", "SK": f"#{job.id}"},
+                UpdateExpression="""
+                    SET #title=:title,
+                        #company=:company,
+                        #location=:location,
+                        #job_url=:job_url,
+                        #description=:description,
+                        #logo_url=:logo_url,
+                        #updated_at=:updated_at,
+                        #fingerprint=:fingerprint,
+                        #GS1SK=:updated_at
+                    REMOVE #stale_description
+                """,
+                ConditionExpression=(
+                    "attribute_exists(PK) AND "
+                    "(attribute_not_exists(#fingerprint) OR #fingerprint <> :fingerprint)"
+                ),
+                ExpressionAttributeNames={
+                    "#title": "title",
+                    "#company": "company",
+                    "#location": "location",
+                    "#job_url": "job_url",
+                    "#description": description_attribute,
+                    "#stale_description": _OTHER_DESCRIPTION_ATTRIBUTE[
+                        description_attribute
+                    ],
+                    "#logo_url": "logo_url",
+                    "#updated_at": "updated_at",
+                    "#fingerprint": "fingerprint",
+                    "#GS1SK": "GS1SK",
+                },
+                ExpressionAttributeValues={
+                    ":title": job.title,
+                    ":company": job.company,
+                    ":location": job.location,
+                    ":job_url": job.job_url,
+                    ":description": description,
+                    ":logo_url": job.logo_url,
+                    ":updated_at": job.updated_at,
+                    ":fingerprint": listing_fingerprint(job),
+                },
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            logger.debug("Listing %s unchanged, skipped update", job.id)
+            return False
+        self.listeners.saved([job])
+        logger.debug("Listing refreshed successfully: %s", job.id)
+        return True
+
+    def get_fingerprints(
+        self, jobs: Iterable[Job], max_retries: int = 5
+    ) -> Dict[UUID, str]:
+        """
+        Look up which of the given jobs are already stored, in batches of
+        100 keys. Returns the stored listing fingerprint of each job found;
+        jobs missing from the result are not in the table.
+
+        Raises LookupThrottled, with what was found, once every batch has
+        been tried if some keys stayed unprocessed after `max_retries`.
+        """
+        fingerprints = {}
+        throttled = False
+        keys = iter({(f"#{job.author}", f"#{job.id}") for job in jobs})
+        while batch := list(islice(keys, BATCH_GET_SIZE)):
+            request = {
+                self.table_name: {
+                    "Keys": [{"PK": pk, "SK": sk} for pk, sk in batch],
+                    "ProjectionExpression": "id, fingerprint",
+                }
+            }
+            for attempt in range(max_retries + 1):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response["Responses"].get(self.table_name, []):
+                    fingerprints[UUID(item["id"])] = item.get("fingerprint", "")
+                request = response.get("UnprocessedKeys")
+                if not request:
+                    break
+                time.sleep(min(0.05 * 2**attempt, 2.0))
+            else:
+                throttled = True
+        if throttled:
+            raise LookupThrottled(fingerprints)
+        logger.debug("Found %d stored jobs", len(fingerprints))
+        return fingerprints
+
     def delete(self, job_id: str, author: str) -> None:
         logger.info("Deleting job with id: %s for author: %s", job_id, author)
-        dynamodb = boto3.resource("dynamodb", endpoint_url=self.dynamodb_url)
-        table = dynamodb.Table(self.table_name)
-        table.delete_item(
+        self.table.delete_item(
             Key={
                 "PK": f"#{author}",
                 "SK": f"#{job_id}",
             }
         )
+        self.listeners.deleted(job_id, author)
+        logger.debug("Job deleted successfully: %s", job_id)
+
+    def rewrite_items(
+        self,
+        rewrite: Callable[[dict], Optional[dict]],
+        segments: int = 4,
+        filter_expression=None,
+    ) -> int:
+        """
+        Migrate job items already in the table: scan them in `segments`
+        parallel segments, narrowed by `filter_expression` if given, and
+        apply `rewrite` to each.
+
+        `rewrite` returns the new values of the attributes to change, None
+        for those to remove, or None to leave the item as it is. An item is
+        only written if it has not changed since it was scanned; a
+        concurrent write already stores it the way the store does now.
+        Listeners are not told. Returns the number of items rewritten.
+        """
+        with ThreadPoolExecutor(max_workers=segments) as executor:
+            rewritten = executor.map(
+                lambda segment: self._rewrite_segment(
+                    rewrite, segment, segments, filter_expression
+                ),
+                range(segments),
+            )
+            return sum(rewritten)
+
+    def _rewrite_segment(
+        self, rewrite, segment: int, segments: int, filter_expression
+    ) -> int:
+        scan_kwargs = {
+            "Segment": segment,
+            "TotalSegments": segments,
+            "FilterExpression": Attr("id").exists()
+            if filter_expression is None
+            else Attr("id").exists() & filter_expression,
+        }
+        rewritten = 0
+        while True:
+            response = self.table.scan(**scan_kwargs)
+            for item in response.get("Items", []):
+                changes = rewrite(item)
+                if changes and self._rewrite_item(item, changes):
+                    rewritten += 1
+            if "LastEvaluatedKey" not in response:
+                break
+            scan_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        logger.info("Segment %d/%d: rewrote %d items", segment + 1, segments, rewritten)
+        return rewritten
+
+    def _rewrite_item(self, item: dict, changes: dict) -> bool:
+        names = {"#updated_at": "updated_at"}
+        values = {":seen_updated_at": item["updated_at"]}
+        conditions = ["#updated_at = :seen_updated_at"]
+        updates, removals = [], []
+        for number, (name, value) in enumerate(changes.items()):
+            names[f"#a{number}"] = name
+            if value is None:
+                removals.append(f"#a{number}")
+            else:
+                values[f":a{number}"] = value
+                updates.append(f"#a{number} = :a{number}")
+            if name in item:
+                values[f":seen_a{number}"] = item[name]
+                conditions.append(f"#a{number} = :seen_a{number}")
+            else:
+                conditions.append(f"attribute_not_exists(#a{number})")
+        update_expression = " ".join(
+            f"{action} {', '.join(parts)}"
+            for action, parts in (("SET", updates), ("REMOVE", removals))
+            if parts
+        )
+        try:
+            self.table.update_item(
+                Key={"PK": item["PK"], "SK": item["SK"]},
+                UpdateExpression=update_expression,
+                ConditionExpression=" AND ".join(conditions),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            return False
+        return True
+
+
+class AsyncJobStore:
+    """
+    Non-blocking counterpart of JobStore built on aioboto3, for use from
+    async request handlers.
+
+    The DynamoDB resource is opened on first use and kept open, so its
+    aiohttp connection pool is shared by every request on the event loop.
+    Call `close` on shutdown to release it.
+    """
+
+    def __init__(
+        self,
+        table_name: str,
+        dynamodb_url: str = None,
+        config: Optional[AioConfig] = None,
+        feed_max_empty_months: int = DEFAULT_FEED_MAX_EMPTY_MONTHS,
+    ):
+        self.table_name = table_name
+        self.dynamodb_url = dynamodb_url
+        self.config = config or DEFAULT_ASYNC_CONFIG
+        self.feed_max_empty_months = feed_max_empty_months
+        self._session = aioboto3.Session()
+        self._lock = asyncio.Lock()
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._table = None
+        self.listeners = JobListeners()
+        logger.info("Initialized AsyncJobStore with table: %s", table_name)
+
+    async def table(self):
+        if self._table is None:
+            async with self._lock:
+                if self._table is None:
+                    exit_stack = AsyncExitStack()
+                    dynamodb = await exit_stack.enter_async_context(
+                        self._session.resource(
+                            "dynamodb",
+                            endpoint_url=self.dynamodb_url,
+                            config=self.config,
+                        )
+                    )
+                    self._table = await dynamodb.Table(self.table_name)
+                    self._exit_stack = exit_stack
+        return self._table
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._exit_stack = None
+        self._table = None
+
+    async def add(self, job: Job) -> None:
+        logger.info("Adding job with id: %s for author: %s", job.id, job.author)
+        table = await self.table()
+        await table.put_item(Item=_to_item(job))
+        self.listeners.saved([job])
+        logger.debug("Job added successfully: %s", job.id)
+
+    async def get(self, job_id: str, author: str) -> Job:
+        logger.info("Retrieving job with id: %s for author: %s", job_id, author)
+        table = await self.table()
+        record = await table.get_item(Key={"PK": f"#{author}", "SK": f"#{job_id}"})
+        item = record.get("Item")
+        if not item:
+            logger.error("Job %s not found for author %s", job_id, author)
+            raise ValueError(f"Job {job_id} not found for author {author}")
+        logger.debug("Job retrieved successfully: %s", job_id)
+        return _from_item(item)
+
+    async def get_all(
+        self, limit: int, last_key: dict = None, fields: Optional[Sequence[str]] = None
+    ):
+        """
+        Retrieve up to a limited number of jobs from the table using pagination.
+        Use last_key to continue from a previous scan, if provided, and
+        `fields` to read only those fields of each job.
+        """
+        logger.info("Retrieving up to %d jobs", limit)
+        table = await self.table()
+        # Skip non-job items, such as scrape watermarks, sharing the table.
+        projection = _projection(fields)
+        scan_kwargs = {
+            "Limit": limit,
+            "FilterExpression": Attr("id").exists(),
+            **projection,
+        }
+        if last_key is not None:
+            scan_kwargs["ExclusiveStartKey"] = last_key
+
+        response = await table.scan(**scan_kwargs)
+        jobs = [_converter(projection)(item) for item in response.get("Items", [])]
+        new_last_key = response.get("LastEvaluatedKey")
+        logger.debug("Retrieved %d jobs; new_last_key: %s", len(jobs), new_last_key)
+        return jobs, new_last_key
+
+    async def get_feed(
+        self, limit: int, last_key: dict = None, fields: Optional[Sequence[str]] = None
+    ):
+        """
+        Retrieve a page of jobs, newest first, from the GS2 feed index.
+        Use last_key to continue from a previous page, if provided, and
+        `fields` to read only those fields of each job.
+        """
+        logger.info("Retrieving feed page of up to %d jobs", limit)
+        table = await self.table()
+        pager = _FeedPager(limit, last_key, self.feed_max_empty_months, fields)
+        while (query_kwargs := pager.next_query()) is not None:
+            pager.consume(await table.query(**query_kwargs))
+        jobs, new_last_key = pager.result()
+        logger.debug("Retrieved %d jobs; new_last_key: %s", len(jobs), new_last_key)
+        return jobs, new_last_key
+
+    async def get_all_by_author(
+        self, author: str, fields: Optional[Sequence[str]] = None
+    ):
+        """
+        Retrieve every job of an author, reading only `fields` of each if
+        given.
+        """
+        logger.info("Retrieving all jobs for author: %s", author)
+        table = await self.table()
+        projection = _projection(fields)
+        response = await table.query(
+            KeyConditionExpression=Key("PK").eq(f"#{author}"), **projection
+        )
+        jobs = [_converter(projection)(item) for item in response["Items"]]
+        logger.debug("Retrieved %d total jobs for author %s", len(jobs), author)
+        return jobs
+
+    async def update(self, job: Job) -> None:
+        logger.info("Updating job with id: %s for author: %s", job.id, job.author)
+        table = await self.table()
+        await table.update_item(**_update_kwargs(job))
+        self.listeners.saved([job])
+        logger.debug("Job updated successfully: %s", job.id)
+
+    async def delete(self, job_id: str, author: str) -> None:
+        logger.info("Deleting job with id: %s for author: %s", job_id, author)
+        table = await self.table()
+        await table.delete_item(Key={"PK": f"#{author}", "SK": f"#{job_id}"})
+        self.listeners.deleted(job_id, author)
         logger.debug("Job deleted successfully: %s", job_id)
@@ -1,5 +1,9 @@
 import base64
 import json
+import re
+from typing import Optional, Tuple
+
+from src.job.model import JOB_FIELDS, SUMMARY_FIELDS
 
 
 def encode_last_key(last_key: dict) -> str:
@@ -10,3 +14,52 @@ def encode_last_key(last_key: dict) -> str:
 def decode_last_key(token: str) -> dict:
     """Decode the base64 string into a LastEvaluatedKey dict."""
     return json.loads(base64.urlsafe_b64decode(token.encode()).decode())
+
+
+_FEED_MONTH = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+
+def parse_feed_cursor(token: Optional[str]) -> Optional[dict]:
+    """
+    Decode a feed cursor returned by a previous page. Raises ValueError if
+    it is not one, e.g. a cursor from before the feed index or one mangled
+    by the client.
+    """
+    if token is None:
+        return None
+    try:
+        cursor = decode_last_key(token)
+    except ValueError:
+        raise ValueError("last_key is not a valid cursor")
+    if (
+        not isinstance(cursor, dict)
+        or set(cursor) != {"bucket", "key"}
+        or not isinstance(cursor["bucket"], str)
+        or not _FEED_MONTH.fullmatch(cursor["bucket"])
+        or not (
+            cursor["key"] is None
+            or isinstance(cursor["key"], dict)
+            and all(isinstance(value, str) for value in cursor["key"].values())
+        )
+    ):
+        raise ValueError("last_key is not a feed cursor")
+    return cursor
+
+
+def parse_fields(value: Optional[str]) -> Tuple[str, ...]:
+    """
+    Job fields named by a `fields` query parameter: a comma-separated list
+    of field names, or "summary" (the default) or "full".
+    """
+    if value is None or value == "summary":
+        return SUMMARY_FIELDS
+    if value == "full":
+        return JOB_FIELDS
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in JOB_FIELDS]
+    if unknown or not names:
+        raise ValueError(
+            f"Unknown job fields: {', '.join(unknown) or value!r}; "
+            f"choose from {', '.join(JOB_FIELDS)}"
+        )
+    return tuple(dict.fromkeys(["id", *names]))
@@ -1,9 +1,12 @@
+import asyncio
 import logging
 import uuid
-from typing import List, Optional
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
 from bs4 import BeautifulSoup, Tag
 
+from src.common.html_parser import HtmlParser, Markup, Subtree
 from src.common.http_client import HttpClient
 from src.config import get_settings
 from src.job.model import Job
@@ -12,113 +15,193 @@ logger = logging.getLogger("linkedin.parser")
 
 settings = get_settings()
 
+T = TypeVar("T")
 
-class LinkedInJobParser:
-    def __init__(self, http_client: HttpClient):
-        self.http_client = http_client
-        self._logger = logging.getLogger(__name__)
+# The only parts of a page the parser reads. Cards are taken whole because
+# the job id lives on the card and the logo sits beside its info div.
+JOB_CARDS = Subtree("div", "base-search-card")
+JOB_DESCRIPTION = Subtree("div", "description__text")
 
-    def _extract_text(self, element: Optional[Tag], strip: bool = True) -> str:
-        if not element:
-            return ""
-        return (
-            element.get_text(strip=strip).replace("\n", " ")
-            if strip
-            else element.get_text()
-        )
 
-    def _extract_job_id(self, parent_div: Tag) -> str:
-        entity_urn = parent_div.get("data-entity-urn", "")
-        return entity_urn.split(":")[-1]
+# Extraction works on raw bytes and returns plain data, so it can run in a
+# worker process as well as on the event loop.
 
-    def _build_job_url(self, job_id: str) -> str:
-        return f"https://www.linkedin.com/jobs/view/{job_id}/"
 
-    async def parse_job_cards(self, soup: BeautifulSoup) -> List[Job]:
-        jobs = []
-        divs = soup.find_all("div", class_="base-search-card__info")
+def extract_job_cards(content: Markup, backend: str) -> List[Dict[str, str]]:
+    """
+    Return the fields of every job card with a job id on a raw search
+    page, in page order.
+    """
+    soup = HtmlParser(backend).parse(content, only=JOB_CARDS)
+    cards = []
+    for item in find_job_cards(soup):
+        try:
+            fields = card_fields(item)
+        except Exception as e:
+            logger.error(f"Error parsing job card: {str(e)}")
+            continue
+        if fields["job_id"]:
+            cards.append(fields)
+        else:
+            logger.warning("Skipping job card without a job id")
+    return cards
 
-        if not divs:
-            self._logger.info("No jobs found on the page.")
-            return jobs
 
-        for item in divs:
-            try:
-                job = await self._parse_single_job_card(item)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                self._logger.error(f"Error parsing job card: {str(e)}")
-                continue
+def extract_description(content: Markup, backend: str) -> str:
+    """Return the description text of a raw job page."""
+    return description_text(HtmlParser(backend).parse(content, only=JOB_DESCRIPTION))
 
-        return jobs
 
-    async def _parse_single_job_card(self, item: Tag) -> Optional[Job]:
-        try:
-            parent_div = item.parent
-            job_id = self._extract_job_id(parent_div)
-            job_url = self._build_job_url(job_id)
-
-            title = self._extract_text(item.find("h3"))
-            company = self._extract_text(item.find("a", class_="hidden-nested-link"))
-            location = self._extract_text(
-                item.find("span", class_="job-search-card__location")
-            )
-            description_soup = await self.http_client.get(job_url)
-            description = (
-                self.parse_job_description(description_soup) if description_soup else ""
-            )
-            logo_url = self._extract_logo_url(item)
+def find_job_cards(soup: BeautifulSoup) -> List[Tag]:
+    return soup.find_all("div", class_="base-search-card__info")
 
-            job = Job.create(
-                id_=uuid.uuid4(),
-                title=title,
-                company=company,
-                location=location,
-                job_url=job_url,
-                description=description,
-                logo_url=logo_url,
-                author=settings.AUTHOR,
-            )
 
-            return job
+def card_fields(item: Tag) -> Dict[str, str]:
+    return {
+        "job_id": _extract_job_id(item.parent),
+        "title": _extract_text(item.find("h3")),
+        "company": _extract_text(item.find("a", class_="hidden-nested-link")),
+        "location": _extract_text(
+            item.find("span", class_="job-search-card__location")
+        ),
+        "logo_url": _extract_logo_url(item),
+        "listed_at": _extract_date(item),
+    }
 
-        except Exception as e:
-            self._logger.error(f"Error parsing job card: {str(e)}")
-            return None
 
-    def _extract_date(self, item: Tag) -> str:
-        date_tag = item.find("time", class_="job-search-card__listdate") or item.find(
-            "time", class_="job-search-card__listdate--new"
-        )
-        return date_tag["datetime"] if date_tag else ""
+def description_text(soup: BeautifulSoup) -> str:
+    try:
+        div = soup.find("div", class_="description__text description__text--rich")
+        if not div:
+            return "Could not find Job Description"
 
-    def _extract_logo_url(self, item: Tag) -> str:
-        logo_img = item.find_previous("img", class_="artdeco-entity-image")
-        return logo_img.get("data-delayed-url", "") if logo_img else ""
+        # Remove unwanted elements
+        for element in div.find_all(["span", "a"]):
+            element.decompose()
 
-    def parse_job_description(self, soup: BeautifulSoup) -> str:
-        try:
-            div = soup.find("div", class_="description__text description__text--rich")
-            if not div:
-                return "Could not find Job Description"
+        # Format bullet points
+        for ul in div.find_all("ul"):
+            for li in ul.find_all("li"):
+                li.insert(0, "- ")
+
+        # Clean up text
+        text = div.get_text(separator="\n").strip()
+        text = text.replace("::marker", "-").replace("-\n", "- ")
+        text = text.replace("Show less", "").replace("Show more", "")
+
+        return text
+
+    except Exception as e:
+        logger.error(f"Error parsing job description: {str(e)}")
+        return "Error parsing job description"
+
+
+def _extract_text(element: Optional[Tag], strip: bool = True) -> str:
+    if not element:
+        return ""
+    return (
+        element.get_text(strip=strip).replace("\n", " ")
+        if strip
+        else element.get_text()
+    )
 
-            # Remove unwanted elements
-            for element in div.find_all(["span", "a"]):
-                element.decompose()
 
-            # Format bullet points
-            for ul in div.find_all("ul"):
-                for li in ul.find_all("li"):
-                    li.insert(0, "- ")
+def _extract_job_id(parent_div: Tag) -> str:
+    entity_urn = parent_div.get("data-entity-urn", "")
+    return entity_urn.split(":")[-1]
 
-            # Clean up text
-            text = div.get_text(separator="\n").strip()
-            text = text.replace("::marker", "-").replace("-\n", "- ")
-            text = text.replace("Show less", "").replace("Show more", "")
 
-            return text
+def _extract_date(item: Tag) -> str:
+    date_tag = item.find("time", class_="job-search-card__listdate") or item.find(
+        "time", class_="job-search-card__listdate--new"
+    )
+    return date_tag["datetime"] if date_tag else ""
 
+
+def _extract_logo_url(item: Tag) -> str:
+    logo_img = item.find_previous("img", class_="artdeco-entity-image")
+    return logo_img.get("data-delayed-url", "") if logo_img else ""
+
+
+def build_job_url(job_id: str) -> str:
+    return f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+
+class LinkedInJobParser:
+    def __init__(
+        self,
+        http_client: HttpClient,
+        concurrency: int = settings.DESCRIPTION_CONCURRENCY,
+        html_parser: Optional[HtmlParser] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            http_client: Client used to fetch job description pages
+            concurrency: Maximum number of description fetches in flight
+            html_parser: Parser for fetched pages
+            executor: Runs HTML extraction off the event loop, typically a
+                ProcessPoolExecutor; extraction runs inline when omitted
+        """
+        self.http_client = http_client
+        self.html_parser = html_parser or HtmlParser(settings.HTML_PARSER)
+        self.executor = executor
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._logger = logging.getLogger(__name__)
+
+    async def _extract(self, func: Callable[..., T], content: Markup) -> T:
+        if self.executor is None:
+            return func(content, self.html_parser.backend)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, func, content, self.html_parser.backend
+        )
+
+    async def parse_search_results(self, content: Markup) -> List[Tuple[Job, str]]:
+        """
+        Parse the job cards of a raw search page into jobs without
+        descriptions, in page order, each paired with the date its card
+        says it was listed (an ISO date, or "" when the card has none).
+        The job id is derived from the LinkedIn job id, so the same
+        posting always maps to the same Job.
+        """
+        cards = await self._extract(extract_job_cards, content)
+        return [
+            (job, fields["listed_at"])
+            for fields in cards
+            if (job := self._job_from_card(fields))
+        ]
+
+    async def _fetch_description(self, job_url: str) -> str:
+        async with self._semaphore:
+            content = await self.http_client.get_bytes(job_url)
+        if content is None:
+            return ""
+        return await self._extract(extract_description, content)
+
+    def _job_from_card(self, fields: Dict[str, Any]) -> Optional[Job]:
+        try:
+            job_url = build_job_url(fields["job_id"])
+            job = Job.create(
+                id_=uuid.uuid5(uuid.NAMESPACE_URL, job_url),
+                title=fields["title"],
+                company=fields["company"],
+                location=fields["location"],
+                job_url=job_url,
+                description="",
+                logo_url=fields["logo_url"],
+                author=settings.AUTHOR,
+            )
+        except Exception as e:
+            self._logger.error(f"Error parsing job card: {str(e)}")
+            return None
+        # Listings are already public on LinkedIn, so they are published
+        # as they are stored rather than kept as drafts.
+        job.activate()
+        return job
+
+    async def fill_description(self, job: Job) -> None:
+        try:
+            job.description = await self._fetch_description(job.job_url)
         except Exception as e:
-            self._logger.error(f"Error parsing job description: {str(e)}")
-            return "Error parsing job description"
+            self._logger.error(f"Error fetching job description: {str(e)}")
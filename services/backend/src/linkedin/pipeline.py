@@ -0,0 +1,362 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
+
+from src.common.http_client import HttpClient
+from src.config import get_settings
+from src.job.model import Job
+from src.job.store import (
+    BATCH_WRITE_SIZE,
+    JobStore,
+    LookupThrottled,
+    listing_fingerprint,
+)
+from src.linkedin.parser import LinkedInJobParser
+from src.linkedin.watermark import SearchWatermark
+
+logger = logging.getLogger("linkedin.pipeline")
+
+settings = get_settings()
+
+# Marks the end of a stage's output on the queue feeding the next stage.
+_DONE = None
+
+# Awaited with (search index, page to resume from, finished).
+Checkpoint = Callable[[int, int, bool], Awaitable[None]]
+
+
+@dataclass
+class PipelineStats:
+    searches: int = 0
+    searches_caught_up: int = 0
+    pages_fetched: int = 0
+    cards_found: int = 0
+    jobs_skipped: int = 0
+    jobs_parsed: int = 0
+    jobs_stored: int = 0
+    jobs_updated: int = 0
+    jobs_failed: int = 0
+
+
+@dataclass(eq=False)
+class _SearchState:
+    """Progress of one search through the pipeline stages."""
+
+    index: int
+    build_url: Callable[[int], str]
+    watermark: Optional[SearchWatermark]
+    next_page: int
+    # Cards of each fetched page still on their way to the store.
+    pending: Dict[int, int] = field(default_factory=dict)
+    # Finished pages after the first unfinished one.
+    done: Set[int] = field(default_factory=set)
+    # The page paging stopped before, once `paged`.
+    end: int = 0
+    paged: bool = False
+    finished: bool = False
+
+
+_Entry = Tuple[Job, bool, _SearchState, int]
+
+
+class ScrapePipeline:
+    """
+    Streams LinkedIn searches through concurrent stages connected by
+    bounded queues:
+
+        search pages -> job cards -> description fetch -> persistence
+
+    Up to `search_concurrency` tasks page through searches and emit job
+    cards, a pool of workers fetches descriptions, and one task persists
+    finished jobs in BatchWriteItem-sized batches. All searches share the
+    stages, and with them the HTTP client's rate limits.
+
+    Job ids are derived from LinkedIn job ids, so each page's cards are
+    checked against the store before any description is fetched: postings
+    stored with unchanged card fields are skipped, changed ones are
+    refreshed in place and only new ones are inserted. Postings already
+    seen earlier in the run, by any search, are skipped too.
+
+    Bounded queues give backpressure: a slow stage stalls the stages in
+    front of it instead of letting work pile up in memory, so only a
+    handful of jobs are ever held at once. Paging stops at the first
+    empty search page. If any stage fails, the task group cancels the
+    others.
+
+    A search given a watermark also stops at the first page that reaches
+    postings covered by earlier runs. When a search pages through to its
+    end that way, to an empty page or to `max_pages`, without a failed
+    fetch, its
+    watermark advances past the postings it found and is listed in
+    `advanced`, ready to be saved.
+
+    A page is finished once every card on it has been persisted. Each
+    search's resume point, the first page not yet finished, is reported to
+    the `checkpoint` callback as it moves, so an interrupted run can pick
+    up where it left off; cards of a replayed page that were already
+    stored are skipped like any other stored posting.
+    """
+
+    def __init__(
+        self,
+        http_client: HttpClient,
+        parser: LinkedInJobParser,
+        job_store: JobStore,
+        workers: int = settings.DESCRIPTION_CONCURRENCY,
+        queue_size: int = settings.PIPELINE_QUEUE_SIZE,
+        search_concurrency: int = settings.SEARCH_CONCURRENCY,
+    ):
+        self.http_client = http_client
+        self.parser = parser
+        self.job_store = job_store
+        self.workers = max(workers, 1)
+        self.queue_size = queue_size
+        self.search_concurrency = max(search_concurrency, 1)
+        self.stats = PipelineStats()
+        self._seen: Set[UUID] = set()
+        self.advanced: List[SearchWatermark] = []
+        self._checkpoint: Optional[Checkpoint] = None
+
+    async def run(
+        self, build_url: Callable[[int], str], max_pages: int
+    ) -> PipelineStats:
+        """
+        Run the pipeline over up to `max_pages` search pages.
+
+        Args:
+            build_url: Returns the search URL for a zero-based page number
+            max_pages: Page budget for this run
+        """
+        return await self.run_many([build_url], max_pages)
+
+    async def run_many(
+        self,
+        searches: Sequence[Callable[[int], str]],
+        max_pages: int,
+        watermarks: Optional[Sequence[Optional[SearchWatermark]]] = None,
+        start_pages: Optional[Sequence[int]] = None,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> PipelineStats:
+        """
+        Run the pipeline over several searches at once.
+
+        Args:
+            searches: URL builders, one per search, taking a zero-based
+                page number
+            max_pages: Page budget for each search
+            watermarks: Watermark of each search, in the same order, for
+                searches sorted newest first
+            start_pages: Page each search resumes from, in the same order
+            checkpoint: Awaited with a search's index, the page it would
+                resume from and whether it is finished, whenever every
+                card of its earlier pages has been persisted
+        """
+        self.stats = PipelineStats()
+        self._seen = set()
+        self.advanced = []
+        self._checkpoint = checkpoint
+        count = len(searches)
+        states = [
+            _SearchState(index, build_url, watermark, start)
+            for index, build_url, watermark, start in zip(
+                range(count),
+                searches,
+                watermarks or [None] * count,
+                start_pages or [0] * count,
+                strict=True,
+            )
+        ]
+        # Both queues carry (job, is_new, search, page) entries.
+        cards: asyncio.Queue[Optional[_Entry]] = asyncio.Queue(self.queue_size)
+        jobs: asyncio.Queue[Optional[_Entry]] = asyncio.Queue(self.queue_size)
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._fetch_searches(states, max_pages, cards))
+            group.create_task(self._parse_cards(cards, jobs))
+            group.create_task(self._store_jobs(jobs))
+
+        logger.info("Pipeline finished: %s", self.stats)
+        return self.stats
+
+    async def _fetch_searches(
+        self, states: List[_SearchState], max_pages: int, cards: asyncio.Queue
+    ) -> None:
+        semaphore = asyncio.Semaphore(self.search_concurrency)
+
+        async def fetch(search: _SearchState) -> None:
+            async with semaphore:
+                self.stats.searches += 1
+                await self._fetch_pages(search, max_pages, cards)
+
+        async with asyncio.TaskGroup() as group:
+            for search in states:
+                group.create_task(fetch(search))
+
+        for _ in range(self.workers):
+            await cards.put(_DONE)
+
+    async def _fetch_pages(
+        self, search: _SearchState, max_pages: int, cards: asyncio.Queue
+    ) -> None:
+        watermark = search.watermark
+        listed: List[Tuple[str, str]] = []
+        complete = True
+        caught_up = False
+        search.end = max_pages
+        for page in range(search.next_page, max_pages):
+            content = await self.http_client.get_bytes(search.build_url(page))
+            if content is None:
+                logger.warning("Skipping page %d: fetch failed", page + 1)
+                complete = False
+                continue
+
+            self.stats.pages_fetched += 1
+            results = await self.parser.parse_search_results(content)
+            if not results:
+                logger.info("Page %d is empty, stopping pagination", page + 1)
+                search.end = page
+                caught_up = True
+                break
+
+            logger.info("Found %d jobs on page %d", len(results), page + 1)
+            self.stats.cards_found += len(results)
+            fresh = await self._select_fresh([job for job, _ in results])
+            search.pending[page] = len(fresh)
+            for job, is_new in fresh:
+                await cards.put((job, is_new, search, page))
+            if not fresh:
+                await self._page_done(search, page)
+
+            page_listed = [(str(job.id), listed_at) for job, listed_at in results]
+            listed.extend(page_listed)
+            if watermark and watermark.reached(page_listed):
+                logger.info(
+                    "Page %d reaches postings seen in earlier runs, "
+                    "stopping pagination",
+                    page + 1,
+                )
+                self.stats.searches_caught_up += 1
+                search.end = page + 1
+                caught_up = True
+                break
+
+        # Pages past max_pages are never scraped, so a search that was paged
+        # all the way to the limit has covered everything it can.
+        if watermark and complete and (caught_up or search.end == max_pages):
+            watermark.advance(listed)
+            self.advanced.append(watermark)
+        search.paged = True
+        await self._advance(search)
+
+    async def _page_done(self, search: _SearchState, page: int) -> None:
+        del search.pending[page]
+        search.done.add(page)
+        await self._advance(search)
+
+    async def _advance(self, search: _SearchState) -> None:
+        """
+        Move a search's resume point past its finished pages and report
+        it. Pages that failed to fetch never finish, so a resumed run
+        starts over from the first of them.
+        """
+        next_page = search.next_page
+        while next_page in search.done:
+            search.done.remove(next_page)
+            next_page += 1
+        # The empty page a search stopped at counts as finished too.
+        finished = search.paged and next_page >= search.end
+        if next_page == search.next_page and finished == search.finished:
+            return
+        search.next_page, search.finished = next_page, finished
+        if self._checkpoint:
+            await self._checkpoint(search.index, next_page, finished)
+
+    async def _select_fresh(self, jobs: List[Job]) -> List[Tuple[Job, bool]]:
+        """
+        Drop postings already seen in this run or stored unchanged, and
+        flag each remaining job with whether it is new to the store.
+        """
+        unseen = []
+        for job in jobs:
+            if job.id not in self._seen:
+                self._seen.add(job.id)
+                unseen.append(job)
+
+        try:
+            stored = await asyncio.to_thread(self.job_store.get_fingerprints, unseen)
+        except LookupThrottled as e:
+            # Postings that could not be looked up are stored as new; one
+            # that is stored already is written again rather than lost.
+            logger.warning(
+                "Could not look up %d postings, storing them as new",
+                len(unseen) - len(e.found),
+            )
+            stored = e.found
+        fresh = []
+        for job in unseen:
+            if job.id not in stored:
+                fresh.append((job, True))
+            elif stored[job.id] != listing_fingerprint(job):
+                fresh.append((job, False))
+        self.stats.jobs_skipped += len(jobs) - len(fresh)
+        return fresh
+
+    async def _parse_cards(self, cards: asyncio.Queue, jobs: asyncio.Queue) -> None:
+        await asyncio.gather(
+            *(self._parse_worker(cards, jobs) for _ in range(self.workers))
+        )
+        await jobs.put(_DONE)
+
+    async def _parse_worker(self, cards: asyncio.Queue, jobs: asyncio.Queue) -> None:
+        while (entry := await cards.get()) is not _DONE:
+            await self.parser.fill_description(entry[0])
+            self.stats.jobs_parsed += 1
+            await jobs.put(entry)
+
+    async def _store_jobs(self, jobs: asyncio.Queue) -> None:
+        batch: List[_Entry] = []
+        while (entry := await jobs.get()) is not _DONE:
+            if not entry[1]:
+                await self._refresh(entry[0])
+                await self._persisted([entry])
+                continue
+            batch.append(entry)
+            if len(batch) == BATCH_WRITE_SIZE:
+                await self._flush([job for job, *_ in batch])
+                await self._persisted(batch)
+                batch = []
+        if batch:
+            await self._flush([job for job, *_ in batch])
+            await self._persisted(batch)
+
+    async def _persisted(self, entries: List[_Entry]) -> None:
+        """Count written or failed cards against the pages they came from."""
+        for _, _, search, page in entries:
+            search.pending[page] -= 1
+            if not search.pending[page]:
+                await self._page_done(search, page)
+
+    async def _refresh(self, job: Job) -> None:
+        try:
+            if await asyncio.to_thread(self.job_store.update_listing, job):
+                self.stats.jobs_updated += 1
+            else:
+                self.stats.jobs_skipped += 1
+        except Exception as e:
+            self.stats.jobs_failed += 1
+            logger.error("Failed to update job %s: %s", job.id, str(e))
+
+    async def _flush(self, batch: List[Job]) -> None:
+        try:
+            result = await asyncio.to_thread(self.job_store.add_many, batch)
+        except Exception as e:
+            self.stats.jobs_failed += len(batch)
+            logger.error("Failed to add batch of %d jobs: %s", len(batch), str(e))
+            return
+        self.stats.jobs_stored += result.written
+        self.stats.jobs_failed += len(result.failed)
+        for job_id, reason in result.failed.items():
+            logger.error("Failed to add job %s: %s", job_id, reason)
+        logger.info("Stored batch of %d jobs", result.written)
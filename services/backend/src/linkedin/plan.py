@@ -0,0 +1,63 @@
+from dataclasses import dataclass, field
+from itertools import product
+from typing import List, Sequence
+from urllib.parse import quote
+
+from src.config import get_settings
+
+settings = get_settings()
+
+
+def build_linkedin_url(keyword: str, location: str, timespan: str, page: int) -> str:
+    return (
+        f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+        f"keywords={quote(keyword)}"
+        f"&location={quote(location)}"
+        f"&f_WT=''"
+        f"&f_TPR={timespan}"
+        f"&sortBy=DD"
+        f"&start={page * 25}"
+    )
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    keywords: str
+    location: str
+    timespan: str
+
+    @property
+    def key(self) -> str:
+        """Identifies the search across runs, ignoring case."""
+        return f"{self.keywords.casefold()}|{self.location.casefold()}"
+
+    def url(self, page: int) -> str:
+        return build_linkedin_url(self.keywords, self.location, self.timespan, page)
+
+
+@dataclass
+class ScrapePlan:
+    """
+    Every combination of keywords and locations over one timespan, run as
+    a single coordinated scrape.
+    """
+
+    keywords: Sequence[str]
+    locations: Sequence[str] = field(default_factory=lambda: settings.SCRAPE_LOCATIONS)
+    timespan: str = settings.TIMESPAN
+    max_pages: int = settings.PAGES_TO_SCRAPE
+
+    def queries(self) -> List[SearchQuery]:
+        """
+        The searches to run, ignoring blank entries and repeats that differ
+        only in case or surrounding whitespace.
+        """
+        seen = set()
+        queries = []
+        for keywords, location in product(self.keywords, self.locations):
+            keywords, location = keywords.strip(), location.strip()
+            key = (keywords.casefold(), location.casefold())
+            if keywords and location and key not in seen:
+                seen.add(key)
+                queries.append(SearchQuery(keywords, location, self.timespan))
+        return queries
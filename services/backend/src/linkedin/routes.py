@@ -1,32 +1,82 @@
 # python
 import logging
-from typing import Any
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from starlette import status
 
+from src.config import get_settings
 from src.dependencies import has_roles
-from src.linkedin.scraper import main as run_scraper
+from src.linkedin.runs import ScrapeRun, ScrapeRunStore
+from src.linkedin.schema import ScrapeRunResponse
+from src.stores import get_scrape_run_store
 
 router = APIRouter(tags=["Scraper"])
 logger = logging.getLogger("linkedin.routes")
 
+settings = get_settings()
 
-@router.get("/scrape/linkedin", response_model=dict)
+
+@router.post(
+    "/scrape/linkedin",
+    response_model=ScrapeRunResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 async def scrape_linkedin(
-    background_tasks: BackgroundTasks,
-    keywords: str = Query(..., description="Keywords to guide the scraping process"),
+    keywords: List[str] = Query(
+        ..., description="Keywords to search for; repeat to run several searches"
+    ),
+    locations: Optional[List[str]] = Query(
+        None, description="Locations to search in; defaults to SCRAPE_LOCATIONS"
+    ),
+    timespan: Optional[str] = Query(
+        None, description="LinkedIn f_TPR filter, e.g. r86400 for the past day"
+    ),
+    max_pages: int = Query(
+        settings.PAGES_TO_SCRAPE, gt=0, description="Page budget of each search"
+    ),
+    run_store: ScrapeRunStore = Depends(get_scrape_run_store),
     _: Any = Depends(has_roles(["Admin"])),
-) -> dict:
+) -> ScrapeRunResponse:
     """
-    Endpoint to trigger LinkedIn scraping in the background.
+    Queue a LinkedIn scrape for the scrape workers.
 
-    This endpoint accepts a `keywords` query parameter, which will be passed to the scraper
-    to determine the best method for processing.
+    Every combination of `keywords` and `locations` is searched in a single
+    run that shares one HTTP client and skips postings found by another
+    search. Follow its progress at `/scrape/jobs/{run_id}`.
     """
+    run = ScrapeRun.create(
+        keywords=keywords,
+        locations=locations or settings.SCRAPE_LOCATIONS,
+        timespan=timespan or settings.TIMESPAN,
+        max_pages=max_pages,
+    )
     try:
-        background_tasks.add_task(run_scraper, keywords)
-        logger.info("Scraping task added with keywords: %s", keywords)
-        return {"message": f"LinkedIn scraping started with keywords: {keywords}"}
+        await run_in_threadpool(run_store.add, run)
     except Exception:
-        logger.error("Failed to launch LinkedIn scraping task", exc_info=True)
+        logger.error("Failed to queue LinkedIn scraping run", exc_info=True)
         raise HTTPException(status_code=500, detail="Scraping could not be started.")
+    logger.info(
+        "Queued scrape run %s with keywords: %s, locations: %s",
+        run.id,
+        run.keywords,
+        run.locations,
+    )
+    return ScrapeRunResponse.from_run(run)
+
+
+@router.get("/scrape/jobs/{run_id}", response_model=ScrapeRunResponse)
+async def get_scrape_run(
+    run_id: str,
+    run_store: ScrapeRunStore = Depends(get_scrape_run_store),
+    _: Any = Depends(has_roles(["Admin"])),
+) -> ScrapeRunResponse:
+    """
+    Report a scrape run's status, progress and throughput.
+    """
+    try:
+        run = await run_in_threadpool(run_store.get, run_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Scrape run not found")
+    return ScrapeRunResponse.from_run(run)
@@ -0,0 +1,321 @@
+import asyncio
+import copy
+import datetime
+import logging
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+from src.linkedin.pipeline import PipelineStats
+from src.linkedin.plan import SearchQuery
+
+logger = logging.getLogger("linkedin.runs")
+
+# Scrape runs share the jobs table under their own partition. They are
+# keyed by `run_id` rather than `id` so job scans skip them, and queue up
+# in the GS1 status index under their own partition keys.
+RUN_PK = "#scrape-run"
+
+
+class ScrapeRunStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+
+
+class LeaseLost(Exception):
+    """Another worker took over the run, or it was finished elsewhere."""
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.UTC).isoformat()
+
+
+@dataclass
+class ScrapeRun:
+    """
+    A queued LinkedIn scrape and its progress.
+
+    `searches` holds a checkpoint per search key: the f_TPR timespan it
+    was started with, the page it resumes from and whether it finished.
+    `stats` accumulates pipeline counters over every attempt, and
+    `active_seconds` the time workers spent on it.
+    """
+
+    id: UUID
+    keywords: List[str]
+    locations: List[str]
+    timespan: str
+    max_pages: int
+    status: ScrapeRunStatus
+    created_at: str
+    updated_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    attempts: int = 0
+    worker: Optional[str] = None
+    lease_expires_at: int = 0
+    searches: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    stats: Dict[str, int] = field(default_factory=dict)
+    active_seconds: int = 0
+    error: Optional[str] = None
+
+    @classmethod
+    def create(
+        cls, keywords: List[str], locations: List[str], timespan: str, max_pages: int
+    ) -> "ScrapeRun":
+        """Factory method to create a new run in the QUEUED state."""
+        now = _now()
+        return cls(
+            id=uuid.uuid4(),
+            keywords=keywords,
+            locations=locations,
+            timespan=timespan,
+            max_pages=max_pages,
+            status=ScrapeRunStatus.QUEUED,
+            created_at=now,
+            updated_at=now,
+        )
+
+    @property
+    def searches_finished(self) -> int:
+        return sum(1 for search in self.searches.values() if search.get("finished"))
+
+
+def _to_item(run: ScrapeRun) -> dict:
+    return {
+        "PK": RUN_PK,
+        "SK": f"#{run.id}",
+        "GS1PK": f"{RUN_PK}#{run.status.value}",
+        "GS1SK": run.created_at,
+        "run_id": str(run.id),
+        "keywords": run.keywords,
+        "locations": run.locations,
+        "timespan": run.timespan,
+        "max_pages": run.max_pages,
+        "status": run.status.value,
+        "created_at": run.created_at,
+        "updated_at": run.updated_at,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "attempts": run.attempts,
+        "worker": run.worker,
+        "lease_expires_at": run.lease_expires_at,
+        "searches": run.searches,
+        "stats": run.stats,
+        "active_seconds": run.active_seconds,
+        "error": run.error,
+    }
+
+
+def _plain(value: Any) -> Any:
+    """Turn the Decimals DynamoDB returns for numbers back into ints."""
+    if isinstance(value, Decimal):
+        return int(value)
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _from_item(item: dict) -> ScrapeRun:
+    item = _plain(item)
+    return ScrapeRun(
+        id=UUID(item["run_id"]),
+        keywords=item["keywords"],
+        locations=item["locations"],
+        timespan=item["timespan"],
+        max_pages=item["max_pages"],
+        status=ScrapeRunStatus[item["status"]],
+        created_at=item["created_at"],
+        updated_at=item["updated_at"],
+        started_at=item.get("started_at"),
+        finished_at=item.get("finished_at"),
+        attempts=item.get("attempts", 0),
+        worker=item.get("worker"),
+        lease_expires_at=item.get("lease_expires_at", 0),
+        searches=item.get("searches", {}),
+        stats=item.get("stats", {}),
+        active_seconds=item.get("active_seconds", 0),
+        error=item.get("error"),
+    )
+
+
+class ScrapeRunStore:
+    """
+    DynamoDB-backed queue of scrape runs, kept in the jobs table.
+
+    Workers claim the oldest queued run, or a running one whose lease has
+    expired, with a conditional write, so each run has one worker at a
+    time. A worker keeps its lease by saving the run before it expires;
+    saves from a worker that lost its lease raise LeaseLost.
+    """
+
+    def __init__(self, table, lease_seconds: int = 120):
+        """
+        Args:
+            table: boto3 DynamoDB Table resource holding the jobs
+            lease_seconds: How long a claim or save keeps a run for its
+                worker
+        """
+        self.table = table
+        self.lease_seconds = lease_seconds
+
+    def add(self, run: ScrapeRun) -> None:
+        logger.info("Queueing scrape run %s", run.id)
+        self.table.put_item(Item=_to_item(run))
+
+    def get(self, run_id: str) -> ScrapeRun:
+        record = self.table.get_item(Key={"PK": RUN_PK, "SK": f"#{run_id}"})
+        item = record.get("Item")
+        if not item:
+            logger.error("Scrape run %s not found", run_id)
+            raise ValueError(f"Scrape run {run_id} not found")
+        return _from_item(item)
+
+    def claim(self, worker: str) -> Optional[ScrapeRun]:
+        """
+        Take the oldest queued run, or else the oldest abandoned one, for
+        `worker`. Returns None when there is nothing to do.
+        """
+        now = int(time.time())
+        for status in (ScrapeRunStatus.QUEUED, ScrapeRunStatus.RUNNING):
+            query_kwargs = {
+                "IndexName": "GS1",
+                "KeyConditionExpression": Key("GS1PK").eq(f"{RUN_PK}#{status.value}"),
+                "FilterExpression": Attr("lease_expires_at").lt(now),
+            }
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get("Items", []):
+                    run = self._try_claim(_from_item(item), worker, now)
+                    if run:
+                        return run
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+        return None
+
+    def _try_claim(self, run: ScrapeRun, worker: str, now: int) -> Optional[ScrapeRun]:
+        seen_status = run.status
+        run.status = ScrapeRunStatus.RUNNING
+        run.worker = worker
+        run.attempts += 1
+        run.started_at = run.started_at or _now()
+        run.updated_at = _now()
+        run.lease_expires_at = now + self.lease_seconds
+        try:
+            self.table.put_item(
+                Item=_to_item(run),
+                ConditionExpression="#status = :status AND lease_expires_at < :now",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":status": seen_status.value,
+                    ":now": now,
+                },
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                # Another worker claimed it first.
+                return None
+            raise
+        logger.info(
+            "Worker %s claimed scrape run %s (attempt %d)", worker, run.id, run.attempts
+        )
+        return run
+
+    def save(self, run: ScrapeRun) -> None:
+        """
+        Store the run's progress and renew its worker's lease, or release
+        it if the run is no longer RUNNING.
+        """
+        worker = run.worker
+        run.updated_at = _now()
+        if run.status == ScrapeRunStatus.RUNNING:
+            run.lease_expires_at = int(time.time()) + self.lease_seconds
+        else:
+            run.worker = None
+            run.lease_expires_at = 0
+        try:
+            self.table.put_item(
+                Item=_to_item(run),
+                ConditionExpression="#worker = :worker AND #status = :running",
+                ExpressionAttributeNames={"#worker": "worker", "#status": "status"},
+                ExpressionAttributeValues={
+                    ":worker": worker,
+                    ":running": ScrapeRunStatus.RUNNING.value,
+                },
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                raise LeaseLost(f"Worker {worker} no longer holds run {run.id}")
+            raise
+
+
+class RunCheckpoint:
+    """
+    Connects a scrape to the run it belongs to: resumes its searches from
+    their checkpoints and saves progress as the pipeline reports it.
+    """
+
+    def __init__(self, run: ScrapeRun, store: ScrapeRunStore):
+        self.run = run
+        self.store = store
+        self._base_stats = dict(run.stats)
+        self._base_seconds = run.active_seconds
+        self._started = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def resume(self, queries: List[SearchQuery]) -> Tuple[List[SearchQuery], List[int]]:
+        """
+        The unfinished searches with the page each resumes from. A search
+        keeps the timespan it started with, so its pages line up again.
+        """
+        resumed, start_pages = [], []
+        for query in queries:
+            checkpoint = self.run.searches.setdefault(
+                query.key,
+                {"timespan": query.timespan, "next_page": 0, "finished": False},
+            )
+            if checkpoint["finished"]:
+                continue
+            resumed.append(replace(query, timespan=checkpoint["timespan"]))
+            start_pages.append(checkpoint["next_page"])
+        return resumed, start_pages
+
+    async def record(
+        self, query: SearchQuery, next_page: int, finished: bool, stats: PipelineStats
+    ) -> None:
+        self.run.searches[query.key].update(next_page=next_page, finished=finished)
+        await self.save(stats)
+
+    async def save(self, stats: Optional[PipelineStats] = None) -> None:
+        """
+        Persist the run's progress, which also renews the lease. Without
+        `stats`, the counters from the last save are kept.
+        """
+        if stats is not None:
+            self.run.stats = {
+                name: self._base_stats.get(name, 0) + value
+                for name, value in asdict(stats).items()
+            }
+        self.run.active_seconds = self._base_seconds + int(
+            time.monotonic() - self._started
+        )
+        # The pipeline keeps going while the save runs in a thread, so the
+        # thread gets its own copy. One save at a time keeps them in order.
+        async with self._lock:
+            snapshot = copy.deepcopy(self.run)
+            await asyncio.to_thread(self.store.save, snapshot)
+        self.run.worker = snapshot.worker
+        self.run.updated_at = snapshot.updated_at
+        self.run.lease_expires_at = snapshot.lease_expires_at
@@ -0,0 +1,82 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import Field
+
+from src.common.schema import BaseSchema
+from src.linkedin.runs import ScrapeRun, ScrapeRunStatus
+
+
+class ScrapeProgress(BaseSchema):
+    searches_total: int = Field(..., description="Searches in the run")
+    searches_finished: int = Field(..., description="Searches paged to the end")
+    pages_fetched: int = Field(..., description="Search result pages fetched")
+    cards_found: int = Field(..., description="Job cards found on those pages")
+    jobs_stored: int = Field(..., description="New jobs stored")
+    jobs_updated: int = Field(..., description="Stored jobs refreshed")
+    jobs_skipped: int = Field(..., description="Postings seen or unchanged")
+    jobs_failed: int = Field(..., description="Jobs that could not be stored")
+
+
+class ScrapeThroughput(BaseSchema):
+    active_seconds: int = Field(..., description="Time workers spent on the run")
+    pages_per_minute: float = Field(..., description="Search pages per minute")
+    jobs_per_minute: float = Field(..., description="Jobs stored or updated per minute")
+
+
+class ScrapeRunResponse(BaseSchema):
+    """
+    Schema representing a scrape run and its progress.
+    """
+
+    id: UUID = Field(..., description="Unique run identifier")
+    status: ScrapeRunStatus = Field(..., description="Current run status")
+    keywords: List[str] = Field(..., description="Keywords searched for")
+    locations: List[str] = Field(..., description="Locations searched in")
+    timespan: str = Field(..., description="LinkedIn f_TPR filter")
+    max_pages: int = Field(..., description="Page budget of each search")
+    attempts: int = Field(..., description="Times a worker picked the run up")
+    created_at: str = Field(..., description="ISO formatted queueing timestamp")
+    started_at: Optional[str] = Field(None, description="When work first started")
+    finished_at: Optional[str] = Field(None, description="When the run ended")
+    error: Optional[str] = Field(None, description="Last error, if any")
+    progress: ScrapeProgress
+    throughput: ScrapeThroughput
+
+    @classmethod
+    def from_run(cls, run: ScrapeRun) -> "ScrapeRunResponse":
+        stats = run.stats
+        minutes = run.active_seconds / 60
+        jobs = stats.get("jobs_stored", 0) + stats.get("jobs_updated", 0)
+        return cls(
+            id=run.id,
+            status=run.status,
+            keywords=run.keywords,
+            locations=run.locations,
+            timespan=run.timespan,
+            max_pages=run.max_pages,
+            attempts=run.attempts,
+            created_at=run.created_at,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            error=run.error,
+            progress=ScrapeProgress(
+                searches_total=len(run.searches),
+                searches_finished=run.searches_finished,
+                pages_fetched=stats.get("pages_fetched", 0),
+                cards_found=stats.get("cards_found", 0),
+                jobs_stored=stats.get("jobs_stored", 0),
+                jobs_updated=stats.get("jobs_updated", 0),
+                jobs_skipped=stats.get("jobs_skipped", 0),
+                jobs_failed=stats.get("jobs_failed", 0),
+            ),
+            throughput=ScrapeThroughput(
+                active_seconds=run.active_seconds,
+                pages_per_minute=(
+                    round(stats.get("pages_fetched", 0) / minutes, 2)
+                    if minutes
+                    else 0.0
+                ),
+                jobs_per_minute=round(jobs / minutes, 2) if minutes else 0.0,
+            ),
+        )
@@ -1,17 +1,29 @@
 # python
 import asyncio
 import logging
+import multiprocessing
 import sys
-from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Optional, Sequence, Union
 
 from dotenv import load_dotenv
 
 # from langchain_core.prompts import PromptTemplate
 # from langchain_openai import ChatOpenAI
-from src.common.http_client import HttpClient
+from src.common.html_parser import HtmlParser
+from src.common.http_cache import HttpCache
+from src.common.http_client import ConnectionConfig, HttpClient, ProxyConfig
+from src.common.proxy_pool import ProxyPool
+from src.common.rate_limiter import AdaptiveConcurrency, RateLimiter
+from src.common.retry import RetryBudget, RetryMetrics, RetryPolicy
 from src.config import get_settings
-from src.job.store import JobStore
 from src.linkedin.parser import LinkedInJobParser
+from src.linkedin.pipeline import PipelineStats, ScrapePipeline
+from src.linkedin.plan import ScrapePlan
+from src.linkedin.runs import RunCheckpoint, ScrapeRun
+from src.linkedin.watermark import WatermarkStore
+from src.stores import get_job_store, get_scrape_run_store
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,19 +34,12 @@ logging.basicConfig(
 load_dotenv()
 
 settings = get_settings()
-job_store = JobStore(table_name=settings.TABLE_NAME, dynamodb_url=settings.DYNAMODB_URL)
-
-
-def build_linkedin_url(keyword: str, location: str, timespan: str, page: int) -> str:
-    return (
-        f"https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?"
-        f"keywords={quote(keyword)}"
-        f"&location={quote(location)}"
-        f"&f_WT=''"
-        f"&f_TPR={timespan}"
-        f"&start={page * 25}"
-    )
 
+# URL patterns retry metrics are grouped by.
+URL_PATTERNS = {
+    "search": r"/jobs-guest/jobs/api/seeMoreJobPostings/",
+    "job": r"/jobs/view/\d+",
+}
 
 # def get_job_summary(job: Job) -> str:
 #     summary_template = """
@@ -49,47 +54,218 @@ def build_linkedin_url(keyword: str, location: str, timespan: str, page: int) ->
 #     return result.content
 
 
-async def main(keywords: str = "python developer"):
+def build_http_client(html_parser: HtmlParser) -> HttpClient:
+    """HttpClient with the proxies, rate limits and concurrency from settings."""
+    proxy_config = (
+        ProxyConfig(
+            settings.PROXIES,
+            settings.PROXY_USERNAME or None,
+            settings.PROXY_PASSWORD or None,
+        )
+        if settings.PROXIES
+        else None
+    )
+    return HttpClient(
+        proxy_config=proxy_config,
+        timeout=settings.TIMEOUT,
+        connection_config=ConnectionConfig(
+            limit=settings.HTTP_CONNECTION_LIMIT,
+            limit_per_host=settings.HTTP_CONNECTIONS_PER_HOST,
+            dns_cache_ttl=settings.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+            verify_ssl=settings.HTTP_VERIFY_SSL,
+            max_response_bytes=settings.HTTP_MAX_RESPONSE_BYTES,
+        ),
+        proxy_pool=(
+            ProxyPool(
+                proxy_config.proxy_list,
+                failure_threshold=settings.PROXY_FAILURE_THRESHOLD,
+                cooldown=settings.PROXY_COOLDOWN,
+            )
+            if proxy_config
+            else None
+        ),
+        cache=(
+            HttpCache(
+                settings.HTTP_CACHE_PATH,
+                max_bytes=settings.HTTP_CACHE_MAX_BYTES,
+                ttls=settings.HTTP_CACHE_TTLS,
+            )
+            if settings.HTTP_CACHE_PATH
+            else None
+        ),
+        retry_policy=RetryPolicy(
+            max_retries=settings.HTTP_MAX_RETRIES,
+            budget=RetryBudget(settings.HTTP_RETRY_BUDGET),
+            metrics=RetryMetrics(URL_PATTERNS),
+        ),
+        html_parser=html_parser,
+        rate_limiter=RateLimiter(settings.HOST_RATE_LIMIT, settings.HOST_RATE_BURST),
+        concurrency=AdaptiveConcurrency(
+            initial=settings.HTTP_INITIAL_CONCURRENCY,
+            maximum=settings.HTTP_MAX_CONCURRENCY,
+            latency_tolerance=settings.HTTP_LATENCY_TOLERANCE,
+        ),
+    )
+
+
+async def main(
+    keywords: Union[str, Sequence[str]] = "python developer",
+    locations: Optional[Sequence[str]] = None,
+    timespan: Optional[str] = None,
+) -> PipelineStats:
+    """
+    Run the LinkedIn scraper for every combination of keywords and
+    locations. Locations default to `SCRAPE_LOCATIONS` and the timespan to
+    `TIMESPAN`.
+    """
+    plan = ScrapePlan(
+        keywords=[keywords] if isinstance(keywords, str) else keywords,
+        locations=locations or settings.SCRAPE_LOCATIONS,
+        timespan=timespan or settings.TIMESPAN,
+    )
+    return await run_plan(plan)
+
+
+async def run_plan(
+    plan: ScrapePlan, checkpoint: Optional[RunCheckpoint] = None
+) -> PipelineStats:
     """
-    Run the LinkedIn scraper using the provided keywords.
-    If no keywords are supplied, defaults to "python developer".
+    Run every search of the plan in one pipeline over one HTTP client, so
+    they share rate limits and skip postings another search already found.
+
+    With INCREMENTAL_SCRAPE, each search only asks for postings listed
+    since its watermark and stops paging once it reaches them. Watermarks
+    are saved only after a run that stored every job it found.
+
+    With a checkpoint, finished searches are skipped, the others resume
+    from their last finished page and progress is saved as pages finish.
     """
     logger = logging.getLogger("linkedin.scraper")
-    logger.info("Starting LinkedIn scraper with keywords: %s", keywords)
+    job_store = get_job_store()
+    queries = plan.queries()
+    watermark_store = (
+        WatermarkStore(job_store.table, overlap_days=settings.WATERMARK_OVERLAP_DAYS)
+        if settings.INCREMENTAL_SCRAPE
+        else None
+    )
+    loaded = (
+        await asyncio.to_thread(
+            lambda: {query.key: watermark_store.get(query.key) for query in queries}
+        )
+        if watermark_store
+        else {}
+    )
+    queries = [
+        replace(query, timespan=loaded[query.key].timespan(query.timespan))
+        if query.key in loaded
+        else query
+        for query in queries
+    ]
+    start_pages = [0] * len(queries)
+    if checkpoint:
+        queries, start_pages = checkpoint.resume(queries)
+    # A watermark can only advance past a search paged from the start.
+    watermarks = (
+        [
+            loaded[query.key] if start == 0 else None
+            for query, start in zip(queries, start_pages)
+        ]
+        if watermark_store
+        else None
+    )
+    logger.info(
+        "Starting LinkedIn scraper with %d searches: %s",
+        len(queries),
+        ", ".join(f"{q.keywords} in {q.location} ({q.timespan})" for q in queries),
+    )
     logger.debug("Settings: %s", settings.model_dump_json(indent=2))
 
-    client = HttpClient()
-    parser = LinkedInJobParser(client)
-    jobs = []
+    html_parser = HtmlParser(settings.HTML_PARSER)
+    client = build_http_client(html_parser)
+    # Workers are spawned rather than forked: forking a process that is
+    # already running threads can deadlock the children.
+    executor = (
+        ProcessPoolExecutor(
+            settings.PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+        if settings.PARSE_WORKERS
+        else None
+    )
+    parser = LinkedInJobParser(client, html_parser=html_parser, executor=executor)
+    pipeline = ScrapePipeline(client, parser, job_store)
 
     try:
-        location = "Croatia"
-        for page in range(settings.PAGES_TO_SCRAPE):
-            url = build_linkedin_url(keywords, location, settings.TIMESPAN, page)
-            if soup := await client.get(url):
-                job_cards = await parser.parse_job_cards(soup)
-                jobs.extend(job_cards)
-                logger.info("Found %d jobs on page %d", len(job_cards), page + 1)
-                await asyncio.sleep(settings.REQUEST_DELAY)
-
-        logger.info("Found total of %d jobs, starting import to DynamoDB", len(jobs))
-        for job in jobs:
-            try:
-                logger.debug("Adding job: %s", job)
-                job_store.add(job)
-                logger.info("Successfully added job with ID: %s", job.id)
-            except Exception as e:
-                logger.error("Failed to add job %s: %s", job.id, str(e))
+        stats = await pipeline.run_many(
+            [query.url for query in queries],
+            max_pages=plan.max_pages,
+            watermarks=watermarks,
+            start_pages=start_pages,
+            checkpoint=(
+                (
+                    lambda index, next_page, finished: checkpoint.record(
+                        queries[index], next_page, finished, pipeline.stats
+                    )
+                )
+                if checkpoint
+                else None
+            ),
+        )
+        if watermark_store and not stats.jobs_failed:
+            await asyncio.to_thread(
+                lambda: [
+                    watermark_store.put(watermark)
+                    for watermark in pipeline.advanced
+                    if watermark.newest
+                ]
+            )
+        logger.info(
+            "Ran %d searches (%d caught up with earlier runs) over %d pages, "
+            "stored %d new jobs, updated %d, skipped %d seen or unchanged "
+            "(%d failed)",
+            stats.searches,
+            stats.searches_caught_up,
+            stats.pages_fetched,
+            stats.jobs_stored,
+            stats.jobs_updated,
+            stats.jobs_skipped,
+            stats.jobs_failed,
+        )
+        return stats
 
     except Exception as e:
         logger.error("Error during scraping: %s", str(e))
         raise
     finally:
+        for proxy in client.proxy_stats():
+            logger.info("Proxy health: %s", proxy)
+        for pattern, counters in client.retry_stats().items():
+            logger.info("Retries for %s: %s", pattern, counters)
+        if client.cache:
+            logger.info("HTTP cache: %s", dict(client.cache.stats))
         await client.close()
+        if executor:
+            executor.shutdown(cancel_futures=True)
 
 
 def handler(event, context):
-    asyncio.run(main(event.get("keywords", "python developer")))
+    """
+    Scheduled Lambda entry point: queue a scrape run for the scrape
+    workers, which have the time to carry it out. The event may carry
+    `keywords` (a string or a list), `locations`, `timespan` and
+    `max_pages`; anything missing uses the defaults.
+    """
+    keywords = event.get("keywords", "python developer")
+    run = ScrapeRun.create(
+        keywords=[keywords] if isinstance(keywords, str) else keywords,
+        locations=event.get("locations") or settings.SCRAPE_LOCATIONS,
+        timespan=event.get("timespan") or settings.TIMESPAN,
+        max_pages=event.get("max_pages", settings.PAGES_TO_SCRAPE),
+    )
+    get_scrape_run_store().add(run)
+    logging.getLogger("linkedin.scraper").info("Queued scrape run %s", run.id)
+    return {"run_id": str(run.id)}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+import datetime
+import logging
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger("linkedin.watermark")
+
+# Watermarks share the jobs table under their own partition. They carry no
+# `id` attribute and no index keys, so job scans and queries skip them.
+WATERMARK_PK = "#watermark"
+
+# Shortest f_TPR window ever requested; LinkedIn's own filters start at a day.
+MIN_TIMESPAN = 24 * 3600
+
+
+def timespan_seconds(timespan: str) -> int:
+    """Seconds in an f_TPR value such as "r86400"."""
+    return int(timespan.lstrip("r"))
+
+
+@dataclass
+class SearchWatermark:
+    """
+    How far a search has been scraped: the newest listing date seen and
+    the postings, by id, listed within `overlap_days` of it.
+
+    Search cards only carry a listing date, so postings dated on or just
+    before the newest date are told apart by id. The overlap also catches
+    postings that show up in results a little after the date they carry.
+    """
+
+    search: str
+    newest: str = ""
+    seen: Dict[str, str] = field(default_factory=dict)
+    overlap_days: int = 1
+
+    @property
+    def cutoff(self) -> str:
+        """Postings listed before this date were covered by earlier runs."""
+        if not self.newest:
+            return ""
+        newest = datetime.date.fromisoformat(self.newest)
+        return (newest - datetime.timedelta(days=self.overlap_days)).isoformat()
+
+    def timespan(self, default: str, now: Optional[datetime.datetime] = None) -> str:
+        """
+        The f_TPR window reaching back to the cutoff, never longer than
+        `default`.
+        """
+        if not self.newest:
+            return default
+        now = now or datetime.datetime.now(datetime.UTC)
+        since = datetime.datetime.fromisoformat(self.cutoff).replace(
+            tzinfo=datetime.UTC
+        )
+        seconds = max(math.ceil((now - since).total_seconds()), MIN_TIMESPAN)
+        return f"r{min(seconds, timespan_seconds(default))}"
+
+    def knows(self, job_id: str, listed_at: str) -> bool:
+        """Whether a posting was covered by an earlier run."""
+        return job_id in self.seen or self._older(listed_at)
+
+    def reached(self, cards: Sequence[Tuple[str, str]]) -> bool:
+        """
+        Whether a page of (job id, listed at) cards from a newest-first
+        search reaches postings covered by earlier runs, so no later page
+        can hold anything new.
+        """
+        if not self.newest or not cards:
+            return False
+        return all(self.knows(*card) for card in cards) or any(
+            self._older(listed_at) for _, listed_at in cards
+        )
+
+    def advance(self, cards: Iterable[Tuple[str, str]]) -> None:
+        """Move the watermark past the (job id, listed at) cards of a run."""
+        for job_id, listed_at in cards:
+            if listed_at:
+                self.seen[job_id] = listed_at
+                self.newest = max(self.newest, listed_at)
+        cutoff = self.cutoff
+        self.seen = {
+            job_id: listed_at
+            for job_id, listed_at in self.seen.items()
+            if listed_at >= cutoff
+        }
+
+    def _older(self, listed_at: str) -> bool:
+        return bool(self.newest and listed_at and listed_at < self.cutoff)
+
+
+class WatermarkStore:
+    """
+    Keeps search watermarks in the jobs table, one item per search under
+    the WATERMARK_PK partition.
+    """
+
+    def __init__(self, table, overlap_days: int = 1):
+        """
+        Args:
+            table: boto3 DynamoDB Table resource holding the jobs
+            overlap_days: Overlap given to watermarks loaded from the table
+        """
+        self.table = table
+        self.overlap_days = overlap_days
+
+    def get(self, search: str) -> SearchWatermark:
+        """The watermark of a search; an empty one if it never completed."""
+        response = self.table.get_item(Key=self._key(search))
+        item = response.get("Item")
+        if not item:
+            return SearchWatermark(search, overlap_days=self.overlap_days)
+        return SearchWatermark(
+            search,
+            newest=item["newest"],
+            seen=dict(item.get("seen", {})),
+            overlap_days=self.overlap_days,
+        )
+
+    def put(self, watermark: SearchWatermark) -> None:
+        logger.info(
+            "Watermark for %s at %s with %d recent postings",
+            watermark.search,
+            watermark.newest,
+            len(watermark.seen),
+        )
+        self.table.put_item(
+            Item={
+                **self._key(watermark.search),
+                "newest": watermark.newest,
+                "seen": watermark.seen,
+                "updated_at": datetime.datetime.now(datetime.UTC).isoformat(),
+            }
+        )
+
+    @staticmethod
+    def _key(search: str) -> dict:
+        return {"PK": WATERMARK_PK, "SK": f"#linkedin#{search}"}
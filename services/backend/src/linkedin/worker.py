@@ -0,0 +1,177 @@
+"""
+Worker that drains the scrape run queue.
+
+The `handler` Lambda is invoked on a schedule and works through one run
+per invocation. Locally, run from services/backend:
+
+    python -m src.linkedin.worker
+"""
+
+import asyncio
+import datetime
+import logging
+import os
+import socket
+import uuid
+from typing import Optional
+
+from src.config import get_settings
+from src.linkedin.pipeline import PipelineStats
+from src.linkedin.plan import ScrapePlan
+from src.linkedin.runs import (
+    LeaseLost,
+    RunCheckpoint,
+    ScrapeRun,
+    ScrapeRunStatus,
+    ScrapeRunStore,
+)
+from src.linkedin.scraper import run_plan
+from src.search.build import publish_snapshot
+from src.stores import get_job_store, get_scrape_run_store
+
+logger = logging.getLogger("linkedin.worker")
+
+settings = get_settings()
+
+
+def _lease_lost(error: BaseException) -> bool:
+    """Whether LeaseLost was raised, possibly from inside a task group."""
+    if isinstance(error, LeaseLost):
+        return True
+    return any(_lease_lost(e) for e in getattr(error, "exceptions", ()))
+
+
+class ScrapeWorker:
+    """
+    Claims queued scrape runs and carries them out, resuming runs another
+    worker abandoned from their last checkpoint.
+
+    While a run is in progress its lease is renewed every third of the
+    lease period, on top of the saves made as pages finish. A run that
+    fails is queued again until it has used `max_attempts`, then marked
+    FAILED. If the lease is lost, the worker stops without touching the
+    run, which now belongs to someone else. A run that stored or updated
+    jobs ends by publishing a new search index snapshot.
+    """
+
+    def __init__(
+        self,
+        run_store: ScrapeRunStore,
+        worker_id: Optional[str] = None,
+        max_attempts: int = settings.SCRAPE_MAX_ATTEMPTS,
+    ):
+        self.run_store = run_store
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.max_attempts = max_attempts
+
+    async def run_next(self) -> Optional[ScrapeRun]:
+        """Carry out the next run in the queue, if there is one."""
+        run = await asyncio.to_thread(self.run_store.claim, self.worker_id)
+        if run is None:
+            return None
+        if run.attempts > self.max_attempts:
+            await self._finish(
+                RunCheckpoint(run, self.run_store),
+                ScrapeRunStatus.FAILED,
+                f"Gave up after {self.max_attempts} attempts",
+            )
+            return run
+        await self.execute(run)
+        return run
+
+    async def execute(self, run: ScrapeRun) -> None:
+        logger.info("Worker %s running scrape run %s", self.worker_id, run.id)
+        checkpoint = RunCheckpoint(run, self.run_store)
+        plan = ScrapePlan(
+            keywords=run.keywords,
+            locations=run.locations,
+            timespan=run.timespan,
+            max_pages=run.max_pages,
+        )
+        scrape = asyncio.create_task(run_plan(plan, checkpoint))
+        heartbeat = asyncio.create_task(self._heartbeat(checkpoint, scrape))
+        try:
+            stats = await scrape
+        except asyncio.CancelledError:
+            if not heartbeat.done():
+                raise
+            logger.warning("Lost the lease on scrape run %s, stopping", run.id)
+            return
+        except Exception as e:
+            if _lease_lost(e):
+                logger.warning("Lost the lease on scrape run %s, stopping", run.id)
+                return
+            logger.error("Scrape run %s failed: %s", run.id, str(e))
+            if run.attempts >= self.max_attempts:
+                await self._finish(checkpoint, ScrapeRunStatus.FAILED, str(e))
+            else:
+                await self._finish(checkpoint, ScrapeRunStatus.QUEUED, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self._finish(checkpoint, ScrapeRunStatus.SUCCEEDED, stats=stats)
+        if stats.jobs_stored or stats.jobs_updated:
+            await self._publish_search_index()
+
+    async def _heartbeat(self, checkpoint: RunCheckpoint, scrape: asyncio.Task) -> None:
+        """Renew the lease until cancelled; cancel the scrape if it is lost."""
+        while True:
+            await asyncio.sleep(self.run_store.lease_seconds / 3)
+            try:
+                await checkpoint.save()
+            except LeaseLost:
+                scrape.cancel()
+                return
+
+    async def _publish_search_index(self) -> None:
+        if not settings.SEARCH_INDEX_BUCKET:
+            return
+        try:
+            await asyncio.to_thread(
+                publish_snapshot,
+                get_job_store(),
+                settings.SEARCH_INDEX_BUCKET,
+                settings.SEARCH_INDEX_KEY,
+            )
+        except Exception as e:
+            # The scheduled build publishes one later.
+            logger.error("Could not publish the search index snapshot: %s", e)
+
+    async def _finish(
+        self,
+        checkpoint: RunCheckpoint,
+        status: ScrapeRunStatus,
+        error: Optional[str] = None,
+        stats: Optional[PipelineStats] = None,
+    ) -> None:
+        run = checkpoint.run
+        run.status = status
+        run.error = error
+        if status != ScrapeRunStatus.QUEUED:
+            run.finished_at = datetime.datetime.now(datetime.UTC).isoformat()
+        try:
+            await checkpoint.save(stats)
+        except LeaseLost:
+            logger.warning("Lost the lease on scrape run %s before saving", run.id)
+            return
+        logger.info("Scrape run %s is now %s", run.id, status.value)
+
+
+def handler(event, context):
+    """Lambda entry point: carry out at most one queued run."""
+    asyncio.run(ScrapeWorker(get_scrape_run_store()).run_next())
+
+
+async def _poll() -> None:
+    worker = ScrapeWorker(get_scrape_run_store())
+    logger.info("Worker %s polling for scrape runs", worker.worker_id)
+    while True:
+        if await worker.run_next() is None:
+            await asyncio.sleep(settings.SCRAPE_POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    asyncio.run(_poll())
@@ -1,10 +1,12 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
 
 from src.auth.routes import router as auth_router
+from src.dependencies import get_cached_job_store
 from src.health.routes import router as health_router
 from src.job.routes import router as job_router
 from src.linkedin.routes import router as linkedin_scraper_router
@@ -14,13 +16,19 @@ environment = os.environ.get("STAGE", "")
 root_path = f"/{environment}" if environment else ""
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    await get_cached_job_store().close()
+
+
 def create_application() -> FastAPI:
     """
     Create and configure FastAPI application.
     Returns:
         FastAPI: Configured FastAPI application instance.
     """
-    application = FastAPI(title="KamaCareer", root_path=root_path)
+    application = FastAPI(title="KamaCareer", root_path=root_path, lifespan=lifespan)
     application.include_router(auth_router, prefix="/api/v1")
     application.include_router(user_router, prefix="/api/v1")
     application.include_router(job_router, prefix="/api/v1")
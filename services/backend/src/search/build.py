@@ -0,0 +1,71 @@
+"""
+Build a job search index snapshot from every job in the table.
+
+The `handler` Lambda publishes it to SEARCH_INDEX_BUCKET on a schedule,
+so writes made through the API reach other processes too. Locally, run
+from services/backend:
+
+    python -m src.search.build [path]
+
+to write it to a path (SEARCH_INDEX_PATH by default), where API processes
+without a bucket pick it up.
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import boto3
+
+from src.config import get_settings
+from src.search.index import build_index, iter_jobs
+from src.stores import get_job_store
+
+logger = logging.getLogger("search.build")
+
+settings = get_settings()
+
+
+def build_snapshot(job_store, path: str) -> int:
+    """Index every job in `job_store` into a snapshot at `path`."""
+    start = time.perf_counter()
+    index = build_index(iter_jobs(job_store))
+    index.write(path)
+    logger.info(
+        "Indexed %d jobs into %s in %.1fs",
+        index.size,
+        path,
+        time.perf_counter() - start,
+    )
+    return index.size
+
+
+def publish_snapshot(job_store, bucket: str, key: str, s3=None) -> int:
+    """
+    Index every job in `job_store` and upload the snapshot to
+    `bucket`/`key`, where API processes pick it up.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "jobs.idx")
+        size = build_snapshot(job_store, path)
+        (s3 or boto3.client("s3")).upload_file(path, bucket, key)
+    logger.info("Published the snapshot to s3://%s/%s", bucket, key)
+    return size
+
+
+def handler(event, context):
+    """Lambda entry point: publish a fresh snapshot to SEARCH_INDEX_BUCKET."""
+    size = publish_snapshot(
+        get_job_store(), settings.SEARCH_INDEX_BUCKET, settings.SEARCH_INDEX_KEY
+    )
+    return {"jobs": size}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("path", nargs="?", default=settings.SEARCH_INDEX_PATH)
+    args = arg_parser.parse_args()
+    build_snapshot(get_job_store(), args.path)
@@ -0,0 +1,606 @@
+import array
+import bisect
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from src.job.model import Job, JobStatus
+
+logger = logging.getLogger("search.index")
+
+# How much a term occurrence in each field counts towards a job's score.
+FIELD_WEIGHTS = {"title": 3.0, "company": 2.0, "location": 2.0, "description": 1.0}
+
+# Fields that can also be filtered on. Their tokens are indexed a second
+# time as "field:token" terms, which take no part in scoring. A job's
+# status is indexed the same way, as a single "status:VALUE" term.
+FILTER_FIELDS = ("company", "location")
+
+# BM25 term frequency saturation and length normalisation.
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or that the this "
+    "to was we will with you your our".split()
+)
+
+_TOKEN = re.compile(r"\w+")
+
+# Combining diacritical marks left over once accented letters are
+# decomposed.
+_MARKS = re.compile(
+    "[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]"
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased words of `text` with accents removed, so "Zürich" and
+    "zurich" match, minus common English stopwords.
+    """
+    text = text.casefold()
+    if not text.isascii():
+        text = _MARKS.sub("", unicodedata.normalize("NFKD", text))
+    return [token for token in _TOKEN.findall(text) if token not in STOPWORDS]
+
+
+def _analyze(job: Job) -> Tuple[Dict[str, float], Set[str], float]:
+    """A job's weighted term frequencies, filter terms and weighted length."""
+    frequencies: Counter = Counter()
+    filters = set()
+    for name, weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(getattr(job, name) or "")
+        for token, count in Counter(tokens).items():
+            frequencies[token] += count * weight
+        if name in FILTER_FIELDS:
+            filters.update(f"{name}:{token}" for token in tokens)
+    filters.add(f"status:{job.status.value}")
+    return dict(frequencies), filters, sum(frequencies.values())
+
+
+def _summary(job: Job) -> dict:
+    return {
+        "id": str(job.id),
+        "title": job.title,
+        "company": job.company,
+        "location": job.location,
+        "job_url": job.job_url,
+        "logo_url": job.logo_url,
+        "status": job.status.value,
+        "author": job.author,
+        "created_at": job.created_at,
+    }
+
+
+def _bm25(frequency: float, length: float, average_length: float) -> float:
+    """The BM25 weight of a term occurrence, before idf."""
+    return (
+        frequency
+        * (K1 + 1)
+        / (frequency + K1 * (1 - B + B * length / (average_length or 1)))
+    )
+
+
+@dataclass
+class SearchResult:
+    total: int
+    hits: List[Tuple[dict, float]]
+
+
+class _MemoryIndex:
+    """Mutable inverted index of jobs written since the snapshot."""
+
+    def __init__(self):
+        self.summaries: Dict[str, dict] = {}
+        self.lengths: Dict[str, float] = {}
+        self.terms: Dict[str, List[str]] = {}
+        # term -> job id -> weighted frequency; filter terms map to 0.
+        self.postings: Dict[str, Dict[str, float]] = {}
+        self.total_length = 0.0
+
+    def add(self, job: Job) -> None:
+        doc_id = str(job.id)
+        self.remove(doc_id)
+        frequencies, filters, length = _analyze(job)
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+        for term in filters:
+            self.postings.setdefault(term, {})[doc_id] = 0.0
+        self.summaries[doc_id] = _summary(job)
+        self.lengths[doc_id] = length
+        self.terms[doc_id] = [*frequencies, *filters]
+        self.total_length += length
+
+    def remove(self, doc_id: str) -> None:
+        if doc_id not in self.summaries:
+            return
+        for term in self.terms.pop(doc_id):
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+        del self.summaries[doc_id]
+        self.total_length -= self.lengths.pop(doc_id)
+
+
+# Snapshot layout, in native byte order, every section 8-byte aligned:
+#
+#   header     magic, version, docs, terms, postings, blob sizes, total length
+#   doc ids    16-byte UUIDs, sorted
+#   lengths    float32 per doc
+#   doc index  uint64 offsets into the summary blob, docs + 1
+#   summaries  JSON per doc
+#   term index uint64 offsets into the term blob, terms + 1
+#   terms      UTF-8, sorted
+#   posting index  uint64 offsets into the postings, terms + 1
+#   posting docs   uint32 doc numbers
+#   posting weights float32 BM25 weight before idf, computed with the
+#                   snapshot's average length; 0 for filter terms
+_MAGIC = b"JIDX"
+_VERSION = 2
+_HEADER = struct.Struct("=4sIIIQQQd")
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
+
+
+class IndexSnapshot:
+    """
+    Read-only inverted index memory-mapped from a snapshot file.
+
+    Opening one only reads the header; terms are found by binary search
+    over the sorted term table and postings are read in place, so cold
+    start cost does not grow with the index and pages are shared between
+    processes mapping the same file.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mmap)
+        magic, version, docs, terms, postings, summary_size, term_size, total = (
+            _HEADER.unpack_from(view)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"{path} is not a search index snapshot")
+        self.size = docs
+        self.term_count = terms
+        self.total_length = total
+
+        offset = _aligned(_HEADER.size)
+
+        def take(length: int, fmt: Optional[str] = None) -> memoryview:
+            nonlocal offset
+            section = view[offset : offset + length]
+            offset = _aligned(offset + length)
+            return section.cast(fmt) if fmt else section
+
+        self._doc_ids = take(16 * docs)
+        self._lengths = take(4 * docs, "f")
+        self._summary_offsets = take(8 * (docs + 1), "Q")
+        self._summaries = take(summary_size)
+        self._term_offsets = take(8 * (terms + 1), "Q")
+        self._terms = take(term_size)
+        self._posting_offsets = take(8 * (terms + 1), "Q")
+        self._posting_docs = take(4 * postings, "I")
+        self._posting_weights = take(4 * postings, "f")
+
+    @property
+    def average_length(self) -> float:
+        return self.total_length / self.size if self.size else 0.0
+
+    def _term(self, number: int) -> bytes:
+        start, end = self._term_offsets[number], self._term_offsets[number + 1]
+        return bytes(self._terms[start:end])
+
+    def find_term(self, term: str) -> Optional[int]:
+        target = term.encode()
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._term(low) == target:
+            return low
+        return None
+
+    def postings(self, term: str) -> Tuple[memoryview, memoryview]:
+        """Doc numbers and weights of a term; empty if it is not indexed."""
+        number = self.find_term(term)
+        if number is None:
+            return memoryview(b"").cast("I"), memoryview(b"").cast("f")
+        start = self._posting_offsets[number]
+        end = self._posting_offsets[number + 1]
+        return self._posting_docs[start:end], self._posting_weights[start:end]
+
+    def find_doc(self, doc_id: str) -> Optional[int]:
+        target = UUID(doc_id).bytes
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if bytes(self._doc_ids[16 * middle : 16 * middle + 16]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.size and bytes(self._doc_ids[16 * low : 16 * low + 16]) == target:
+            return low
+        return None
+
+    def doc_id(self, number: int) -> str:
+        return str(UUID(bytes=bytes(self._doc_ids[16 * number : 16 * number + 16])))
+
+    def length(self, number: int) -> float:
+        return self._lengths[number]
+
+    def summary(self, number: int) -> dict:
+        start = self._summary_offsets[number]
+        end = self._summary_offsets[number + 1]
+        return json.loads(bytes(self._summaries[start:end]))
+
+    def terms(self) -> Iterator[Tuple[str, memoryview, memoryview]]:
+        for number in range(self.term_count):
+            start = self._posting_offsets[number]
+            end = self._posting_offsets[number + 1]
+            yield (
+                self._term(number).decode(),
+                self._posting_docs[start:end],
+                self._posting_weights[start:end],
+            )
+
+    def close(self) -> None:
+        for name in (
+            "_doc_ids",
+            "_lengths",
+            "_summary_offsets",
+            "_summaries",
+            "_term_offsets",
+            "_terms",
+            "_posting_offsets",
+            "_posting_docs",
+            "_posting_weights",
+            "_view",
+        ):
+            getattr(self, name).release()
+        self._mmap.close()
+
+
+class JobSearchIndex:
+    """
+    Full-text index of job titles, companies, locations and descriptions,
+    ranked with BM25 over field-weighted term frequencies.
+
+    A memory-mapped snapshot holds the bulk of the jobs; jobs saved or
+    deleted since are kept in a small in-memory index that shadows the
+    snapshot. Subscribe the index to the job stores so every write reaches
+    it, and `write` a fresh snapshot to fold the changes in.
+
+    """
+
+    def __init__(self, snapshot: Optional[IndexSnapshot] = None):
+        self.snapshot = snapshot
+        self._memory = _MemoryIndex()
+        # Snapshot doc numbers of jobs changed or deleted since.
+        self._shadowed: Set[int] = set()
+        self._shadowed_length = 0.0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def open(cls, path: str) -> "JobSearchIndex":
+        return cls(IndexSnapshot(path))
+
+    @property
+    def size(self) -> int:
+        snapshot_size = self.snapshot.size if self.snapshot else 0
+        return snapshot_size - len(self._shadowed) + len(self._memory.summaries)
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            previous = self._shadow(str(job.id))
+            if previous and job.created_at != previous["created_at"]:
+                # Refreshed listings arrive with the time they were scraped;
+                # the stored job keeps its original creation time.
+                job = Job(**{**job.__dict__, "created_at": previous["created_at"]})
+            self._memory.add(job)
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            self._shadow(job_id)
+            self._memory.remove(job_id)
+
+    def _shadow(self, doc_id: str) -> Optional[dict]:
+        """Hide a job's snapshot entry; return its latest summary."""
+        if doc_id in self._memory.summaries:
+            return self._memory.summaries[doc_id]
+        if self.snapshot is None:
+            return None
+        number = self.snapshot.find_doc(doc_id)
+        if number is None or number in self._shadowed:
+            return None
+        self._shadowed.add(number)
+        self._shadowed_length += self.snapshot.length(number)
+        return self.snapshot.summary(number)
+
+    # JobListener
+    def job_saved(self, job: Job) -> None:
+        self.add(job)
+
+    def job_deleted(self, job_id: str, author: str) -> None:
+        self.remove(job_id)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        company: Optional[str] = None,
+        location: Optional[str] = None,
+        statuses: Optional[Iterable[JobStatus]] = None,
+    ) -> SearchResult:
+        """
+        Jobs matching any word of `query`, best first. `company` and
+        `location` restrict hits to jobs with every word of the given
+        value in that field, and `statuses` to jobs in one of them.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        filters = [
+            [f"{name}:{token}"]
+            for name, value in (("company", company), ("location", location))
+            if value
+            for token in tokenize(value)
+        ]
+        if statuses is not None:
+            filters.append([f"status:{status.value}" for status in statuses])
+        with self._lock:
+            snapshot_scores, memory_scores = self._score(terms)
+            if filters:
+                snapshot_allowed, memory_allowed = self._filter(filters)
+                snapshot_scores = {
+                    doc: score
+                    for doc, score in snapshot_scores.items()
+                    if doc in snapshot_allowed
+                }
+                memory_scores = {
+                    doc: score
+                    for doc, score in memory_scores.items()
+                    if doc in memory_allowed
+                }
+            total = len(snapshot_scores) + len(memory_scores)
+            # Ranked by score alone, so ties keep index order and do not
+            # churn the heap.
+            count = offset + limit
+            best = heapq.nlargest(
+                count,
+                [
+                    *(
+                        (snapshot_scores[doc], 0, doc)
+                        for doc in heapq.nlargest(
+                            count, snapshot_scores, key=snapshot_scores.__getitem__
+                        )
+                    ),
+                    *(
+                        (memory_scores[doc], 1, doc)
+                        for doc in heapq.nlargest(
+                            count, memory_scores, key=memory_scores.__getitem__
+                        )
+                    ),
+                ],
+                key=lambda hit: hit[0],
+            )[offset:]
+            hits = [
+                (
+                    self.snapshot.summary(doc)
+                    if source == 0
+                    else self._memory.summaries[doc],
+                    score,
+                )
+                for score, source, doc in best
+            ]
+        return SearchResult(total=total, hits=hits)
+
+    def _score(self, terms: List[str]) -> Tuple[Dict[int, float], Dict[str, float]]:
+        snapshot, memory = self.snapshot, self._memory
+        count = self.size
+        total_length = memory.total_length + (
+            snapshot.total_length - self._shadowed_length if snapshot else 0.0
+        )
+        average_length = total_length / count if count else 0.0
+        shadowed = self._shadowed
+        snapshot_scores: Dict[int, float] = {}
+        memory_scores: Dict[str, float] = {}
+        for term in terms:
+            docs, weights = snapshot.postings(term) if snapshot else ((), ())
+            memory_postings = memory.postings.get(term, {})
+            # Postings are in doc number order, so shadowed docs are found
+            # by bisection rather than by walking them.
+            frequency = (
+                len(docs)
+                - sum(_contains(docs, doc) for doc in shadowed)
+                + len(memory_postings)
+            )
+            if not frequency:
+                continue
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            # Build each term's scores in one pass, then fold the smaller of
+            # the two maps into the larger.
+            term_scores = dict(zip(docs, map(idf.__mul__, weights)))
+            if len(term_scores) > len(snapshot_scores):
+                snapshot_scores, term_scores = term_scores, snapshot_scores
+            get = snapshot_scores.get
+            for doc, score in term_scores.items():
+                snapshot_scores[doc] = get(doc, 0.0) + score
+            for doc, term_frequency in memory_postings.items():
+                memory_scores[doc] = memory_scores.get(doc, 0.0) + idf * _bm25(
+                    term_frequency, memory.lengths[doc], average_length
+                )
+        for doc in shadowed.intersection(snapshot_scores):
+            del snapshot_scores[doc]
+        return snapshot_scores, memory_scores
+
+    def _filter(self, filters: List[List[str]]) -> Tuple[Set[int], Set[str]]:
+        """Docs with at least one term of every filter."""
+        snapshot_allowed: Optional[Set[int]] = None
+        memory_allowed: Optional[Set[str]] = None
+        for terms in filters:
+            docs, found = set(), set()
+            for term in terms:
+                if self.snapshot:
+                    docs.update(self.snapshot.postings(term)[0])
+                found.update(self._memory.postings.get(term, {}))
+            snapshot_allowed = (
+                docs if snapshot_allowed is None else snapshot_allowed & docs
+            )
+            memory_allowed = found if memory_allowed is None else memory_allowed & found
+        return snapshot_allowed or set(), memory_allowed or set()
+
+    def write(self, path: str) -> None:
+        """
+        Write every job in the index to a new snapshot at `path`,
+        replacing any file there atomically.
+        """
+        with self._lock:
+            docs = self._collect()
+        _write_snapshot(path, docs)
+        logger.info("Wrote search index snapshot of %d jobs to %s", len(docs), path)
+
+    def _collect(self) -> List[Tuple[bytes, dict, float, Dict[str, float]]]:
+        """(uuid bytes, summary, length, term weights) of every current job."""
+        docs: Dict[str, Tuple[dict, float, Dict[str, float]]] = {}
+        snapshot = self.snapshot
+        if snapshot:
+            live = [n for n in range(snapshot.size) if n not in self._shadowed]
+            weights: Dict[int, Dict[str, float]] = {n: {} for n in live}
+            for term, term_docs, term_weights in snapshot.terms():
+                for doc, weight in zip(term_docs, term_weights):
+                    if doc in weights:
+                        weights[doc][term] = weight
+            for n in live:
+                length = snapshot.length(n)
+                docs[snapshot.doc_id(n)] = (
+                    snapshot.summary(n),
+                    length,
+                    {
+                        term: _unweight(weight, length, snapshot.average_length)
+                        for term, weight in weights[n].items()
+                    },
+                )
+        memory = self._memory
+        for doc_id, summary in memory.summaries.items():
+            docs[doc_id] = (
+                summary,
+                memory.lengths[doc_id],
+                {term: memory.postings[term][doc_id] for term in memory.terms[doc_id]},
+            )
+        return [
+            (UUID(doc_id).bytes, summary, length, frequencies)
+            for doc_id, (summary, length, frequencies) in docs.items()
+        ]
+
+
+def _contains(docs: memoryview, doc: int) -> bool:
+    position = bisect.bisect_left(docs, doc)
+    return position < len(docs) and docs[position] == doc
+
+
+def _unweight(weight: float, length: float, average_length: float) -> float:
+    """Recover the term frequency a snapshot BM25 weight was computed from."""
+    if not weight:
+        return 0.0
+    norm = K1 * (1 - B + B * length / (average_length or 1))
+    return weight * norm / (K1 + 1 - weight)
+
+
+def _write_snapshot(
+    path: str, docs: List[Tuple[bytes, dict, float, Dict[str, float]]]
+) -> None:
+    docs.sort(key=lambda doc: doc[0])
+    total_length = sum(length for _, _, length, _ in docs)
+    average_length = total_length / len(docs) if docs else 0.0
+
+    postings: Dict[str, Tuple[array.array, array.array]] = {}
+    for number, (_, _, length, frequencies) in enumerate(docs):
+        # _bm25 inlined, with the length normalisation hoisted out.
+        norm = K1 * (1 - B + B * length / (average_length or 1))
+        for term, frequency in frequencies.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = (array.array("I"), array.array("f"))
+            entry[0].append(number)
+            entry[1].append(frequency * (K1 + 1) / (frequency + norm))
+
+    summaries = [json.dumps(summary).encode() for _, summary, _, _ in docs]
+    terms = sorted(postings, key=str.encode)
+    encoded_terms = [term.encode() for term in terms]
+
+    def offsets(sizes: Iterable[int]) -> array.array:
+        result = array.array("Q", [0])
+        for size in sizes:
+            result.append(result[-1] + size)
+        return result
+
+    posting_docs = array.array("I")
+    posting_weights = array.array("f")
+    for term in terms:
+        term_docs, term_weights = postings[term]
+        posting_docs.extend(term_docs)
+        posting_weights.extend(term_weights)
+
+    sections = [
+        b"".join(doc_id for doc_id, _, _, _ in docs),
+        array.array("f", (length for _, _, length, _ in docs)).tobytes(),
+        offsets(map(len, summaries)).tobytes(),
+        b"".join(summaries),
+        offsets(map(len, encoded_terms)).tobytes(),
+        b"".join(encoded_terms),
+        offsets(len(postings[term][0]) for term in terms).tobytes(),
+        posting_docs.tobytes(),
+        posting_weights.tobytes(),
+    ]
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(docs),
+        len(terms),
+        len(posting_docs),
+        len(sections[3]),
+        len(sections[5]),
+        total_length,
+    )
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        for section in [header, *sections]:
+            f.write(section)
+            f.write(b"\0" * (_aligned(len(section)) - len(section)))
+    os.replace(temporary, path)
+
+
+def build_index(jobs: Iterable[Job]) -> JobSearchIndex:
+    index = JobSearchIndex()
+    for job in jobs:
+        index.add(job)
+    return index
+
+
+def iter_jobs(job_store, page_size: int = 1000) -> Iterator[Job]:
+    """Every job in a JobStore, scanned a page at a time."""
+    last_key = None
+    while True:
+        jobs, last_key = job_store.get_all(page_size, last_key)
+        yield from jobs
+        if not last_key:
+            return
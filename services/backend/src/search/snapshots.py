@@ -0,0 +1,127 @@
+"""
+Search index snapshots shared through S3.
+
+Snapshots are built from the table and published to SEARCH_INDEX_BUCKET
+by src.search.build, after scrape runs that stored jobs and on a schedule
+for writes made through the API. API processes copy the latest one to
+local disk, open it with mmap and check for a newer one every
+SEARCH_INDEX_REFRESH_SECONDS, so no request ever waits on a scan of the
+table.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from src.job.model import Job
+from src.search.index import JobSearchIndex
+
+logger = logging.getLogger("search.snapshots")
+
+
+class SearchSnapshots:
+    """
+    The latest search index snapshot, kept at `path`.
+
+    With a `bucket`, the snapshot published at `bucket`/`key` is downloaded
+    on first use, and its ETag checked again at most every
+    `refresh_seconds`; a newer one is downloaded and swapped in. Without
+    one, the file at `path` is reopened whenever it changes. Until a
+    snapshot exists the index starts out empty.
+
+    Subscribe it to the job stores: writes made by this process are passed
+    to the current index, so they are searchable before the next snapshot
+    picks them up. A swapped-in snapshot replaces them, so a write made
+    after that snapshot was built disappears from search until the next
+    one.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        bucket: str = "",
+        key: str = "",
+        refresh_seconds: float = 300,
+        s3=None,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.bucket = bucket
+        self.key = key
+        self.refresh_seconds = refresh_seconds
+        self._s3 = s3
+        self._timer = timer
+        self._index: Optional[JobSearchIndex] = None
+        self._version: Optional[str] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            self._s3 = boto3.client("s3")
+        return self._s3
+
+    def current(self) -> JobSearchIndex:
+        """The index of the latest snapshot, refreshed if it is due."""
+        with self._lock:
+            if (
+                self._index is None
+                or self._timer() - self._checked_at >= self.refresh_seconds
+            ):
+                self._refresh()
+            return self._index
+
+    def _refresh(self) -> None:
+        self._checked_at = self._timer()
+        try:
+            version = self._latest_version()
+            if version is not None and version != self._version:
+                if self.bucket:
+                    self._download()
+                index = JobSearchIndex.open(self.path)
+                logger.info(
+                    "Opened search index snapshot %s of %d jobs", version, index.size
+                )
+                # Searches still running keep the old index until they end.
+                self._index, self._version = index, version
+        except (ClientError, OSError, ValueError) as e:
+            logger.error("Could not refresh the search index snapshot: %s", e)
+        if self._index is None:
+            logger.warning("No search index snapshot yet, starting empty")
+            self._index = JobSearchIndex()
+
+    def _latest_version(self) -> Optional[str]:
+        """ETag or modification time of the latest snapshot, if there is one."""
+        if not self.bucket:
+            try:
+                return str(os.stat(self.path).st_mtime_ns)
+            except FileNotFoundError:
+                return None
+        try:
+            return self.s3.head_object(Bucket=self.bucket, Key=self.key)["ETag"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            raise
+
+    def _download(self) -> None:
+        # Replaced by rename, so an index still mapping the previous file
+        # keeps reading it.
+        temporary = f"{self.path}.download"
+        self.s3.download_file(self.bucket, self.key, temporary)
+        os.replace(temporary, self.path)
+
+    # JobListener
+    def job_saved(self, job: Job) -> None:
+        if self._index is not None:
+            self._index.job_saved(job)
+
+    def job_deleted(self, job_id: str, author: str) -> None:
+        if self._index is not None:
+            self._index.job_deleted(job_id, author)
@@ -0,0 +1,66 @@
+"""
+Shared stores of each process.
+
+Kept apart from src.dependencies so the scraper and worker Lambdas can
+build them without importing the API, and created on first use rather
+than at import time.
+"""
+
+from functools import lru_cache
+
+from aiobotocore.config import AioConfig
+from botocore.config import Config
+
+from src.config import get_settings
+from src.job.store import AsyncJobStore, JobStore
+from src.linkedin.runs import ScrapeRunStore
+
+settings = get_settings()
+
+
+@lru_cache()
+def get_job_store() -> JobStore:
+    """
+    Shared JobStore, created once per process so warm invocations reuse its
+    pooled DynamoDB connections.
+    """
+    return JobStore(
+        settings.TABLE_NAME,
+        dynamodb_url=settings.DYNAMODB_URL,
+        config=Config(
+            max_pool_connections=settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.DYNAMODB_CONNECT_TIMEOUT,
+            read_timeout=settings.DYNAMODB_READ_TIMEOUT,
+            tcp_keepalive=settings.DYNAMODB_TCP_KEEPALIVE,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
+        feed_max_empty_months=settings.FEED_MAX_EMPTY_MONTHS,
+    )
+
+
+@lru_cache()
+def get_async_job_store() -> AsyncJobStore:
+    """
+    Shared AsyncJobStore used by the async job routes; its connection pool
+    lives on the application's event loop.
+    """
+    return AsyncJobStore(
+        settings.TABLE_NAME,
+        dynamodb_url=settings.DYNAMODB_URL,
+        config=AioConfig(
+            max_pool_connections=settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+            connect_timeout=settings.DYNAMODB_CONNECT_TIMEOUT,
+            read_timeout=settings.DYNAMODB_READ_TIMEOUT,
+            tcp_keepalive=settings.DYNAMODB_TCP_KEEPALIVE,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
+        feed_max_empty_months=settings.FEED_MAX_EMPTY_MONTHS,
+    )
+
+
+@lru_cache()
+def get_scrape_run_store() -> ScrapeRunStore:
+    """Queue of scrape runs, kept in the jobs table."""
+    return ScrapeRunStore(
+        get_job_store().table, lease_seconds=settings.SCRAPE_LEASE_SECONDS
+    )
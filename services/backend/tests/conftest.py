@@ -7,10 +7,19 @@ import pytest
 from fastapi.testclient import TestClient
 from jose import jwt
 from moto import mock_aws
-
-from src.dependencies import get_job_store
-from src.job.store import JobStore
+from moto.server import ThreadedMotoServer
+
+from src.dependencies import (
+    _user_cache,
+    get_cached_job_store,
+    get_search_index,
+)
+from src.job.cache import CachedJobStore, MemoryCacheBackend
+from src.job.store import AsyncJobStore, JobStore
+from src.linkedin.runs import ScrapeRunStore
 from src.main import app
+from src.search.index import JobSearchIndex
+from src.stores import get_async_job_store, get_job_store, get_scrape_run_store
 
 
 @pytest.fixture
@@ -28,9 +37,22 @@ def mock_cognito_get_user():
 
 
 @pytest.fixture
-def client(job_store, mock_cognito_get_user):
+def client(
+    job_store,
+    async_job_store,
+    cached_job_store,
+    scrape_run_store,
+    search_index,
+    mock_cognito_get_user,
+):
     app.dependency_overrides[get_job_store] = lambda: job_store
-    return TestClient(app)
+    app.dependency_overrides[get_async_job_store] = lambda: async_job_store
+    app.dependency_overrides[get_cached_job_store] = lambda: cached_job_store
+    app.dependency_overrides[get_scrape_run_store] = lambda: scrape_run_store
+    app.dependency_overrides[get_search_index] = lambda: search_index
+    with TestClient(app) as test_client:
+        yield test_client
+        test_client.portal.call(async_job_store.close)
 
 
 @pytest.fixture
@@ -38,6 +60,45 @@ def job_store(dynamodb_table):
     return JobStore(dynamodb_table)
 
 
+@pytest.fixture
+def scrape_run_store(job_store):
+    return ScrapeRunStore(job_store.table)
+
+
+@pytest.fixture
+def search_index(job_store, async_job_store):
+    index = JobSearchIndex()
+    job_store.listeners.subscribe(index)
+    async_job_store.listeners.subscribe(index)
+    return index
+
+
+@pytest.fixture(scope="session")
+def moto_server_url():
+    """
+    Moto in server mode, for clients that bypass botocore's HTTP layer
+    (aioboto3). It shares state with `mock_aws`, so tables created by the
+    `dynamodb_table` fixture are visible through it.
+    """
+    server = ThreadedMotoServer(port=0, verbose=False)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def async_job_store(dynamodb_table, moto_server_url):
+    return AsyncJobStore(dynamodb_table, dynamodb_url=moto_server_url)
+
+
+@pytest.fixture
+def cached_job_store(async_job_store):
+    return CachedJobStore(
+        async_job_store, MemoryCacheBackend(maxsize=128, ttl=60), ttl=60
+    )
+
+
 @pytest.fixture
 def user_email():
     return "user@email.com"
@@ -99,6 +160,13 @@ def admin_token(admin_email):
     return token
 
 
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    _user_cache.clear()
+    yield
+    _user_cache.clear()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def set_testing_env():
     os.environ["TESTING"] = "1"
@@ -119,6 +187,8 @@ def dynamodb_table():
                 {"AttributeName": "SK", "AttributeType": "S"},
                 {"AttributeName": "GS1PK", "AttributeType": "S"},
                 {"AttributeName": "GS1SK", "AttributeType": "S"},
+                {"AttributeName": "GS2PK", "AttributeType": "S"},
+                {"AttributeName": "GS2SK", "AttributeType": "S"},
             ],
             TableName=table_name,
             KeySchema=[
@@ -137,6 +207,16 @@ def dynamodb_table():
                         "ProjectionType": "ALL",
                     },
                 },
+                {
+                    "IndexName": "GS2",
+                    "KeySchema": [
+                        {"AttributeName": "GS2PK", "KeyType": "HASH"},
+                        {"AttributeName": "GS2SK", "KeyType": "RANGE"},
+                    ],
+                    "Projection": {
+                        "ProjectionType": "ALL",
+                    },
+                },
             ],
         )
         yield table_name
@@ -0,0 +1,34 @@
+from src.common.cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+    cache.set("short", 1, ttl=5)
+    cache.set("long", 2)
+
+    timer.now = 10
+
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
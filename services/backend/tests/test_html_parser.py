@@ -0,0 +1,33 @@
+from pathlib import Path
+
+import pytest
+
+from src.common.html_parser import HtmlParser, available_backends
+from src.linkedin.parser import (
+    card_fields,
+    description_text,
+    extract_description,
+    extract_job_cards,
+    find_job_cards,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures" / "linkedin"
+
+
+@pytest.mark.parametrize("backend", available_backends())
+def test_targeted_parse_matches_full_parse(backend):
+    search_page = (FIXTURES / "search_page.html").read_bytes()
+    job_page = (FIXTURES / "job_page.html").read_bytes()
+    full_page = HtmlParser("html.parser").parse(search_page)
+
+    cards = extract_job_cards(search_page, backend)
+
+    assert cards == [card_fields(card) for card in find_job_cards(full_page)]
+    assert extract_description(job_page, backend) == description_text(
+        HtmlParser("html.parser").parse(job_page)
+    )
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        HtmlParser("html5lib")
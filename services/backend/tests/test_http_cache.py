@@ -0,0 +1,120 @@
+import asyncio
+import random
+import zlib
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.common.http_cache import HttpCache
+from src.common.http_client import HttpClient
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_freshness_follows_ttl_rules(tmp_path):
+    timer = FakeTimer()
+    cache = HttpCache(
+        str(tmp_path / "cache.db"), ttls={r"/jobs/view/\d+": 60}, timer=timer
+    )
+    cache.store("https://host/jobs/view/1/", b"job", etag='"v1"')
+    cache.store("https://host/search", b"search", last_modified="Sat, 17 Oct 2026")
+
+    timer.now = 30
+    job = cache.lookup("https://host/jobs/view/1/")
+    search = cache.lookup("https://host/search")
+
+    assert job.body == b"job"
+    assert job.conditional_headers() == {"If-None-Match": '"v1"'}
+    assert cache.is_fresh("https://host/jobs/view/1/", job)
+    assert not cache.is_fresh("https://host/search", search)
+    timer.now = 61
+    assert not cache.is_fresh("https://host/jobs/view/1/", job)
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(tmp_path):
+    timer = FakeTimer()
+    body = random.Random(0).randbytes(1000)  # does not compress
+    cache = HttpCache(str(tmp_path / "cache.db"), max_bytes=2500, timer=timer)
+    for i, url in enumerate(["a", "b"]):
+        timer.now = i
+        cache.store(url, body, etag='"v1"')
+    timer.now = 2
+    cache.lookup("a")
+
+    timer.now = 3
+    cache.store("c", body, etag='"v1"')
+
+    assert cache.lookup("a") is not None
+    assert cache.lookup("b") is None
+    assert cache.lookup("c") is not None
+    assert cache.stats["evicted"] == 1
+
+
+def test_responses_without_ttl_or_validators_are_not_stored(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache.db"), ttls={r"/jobs/view/\d+": 60})
+    search_url = "https://host/jobs/search?keywords=python&start=0"
+    cache.store(search_url, b"stale", etag='"v1"')
+
+    # The page now comes back without validators, so the old entry goes too.
+    cache.store(search_url, b"search")
+    cache.store("https://host/jobs/view/1/", b"job")
+
+    assert cache.lookup(search_url) is None
+    assert cache.lookup("https://host/jobs/view/1/").body == b"job"
+    assert cache.stats["uncacheable"] == 1
+    assert cache._size == len(zlib.compress(b"job"))
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = HttpCache(path)
+    cache.store("https://host/page", b"body", last_modified="Sat, 17 Oct 2026")
+    cache.close()
+
+    reopened = HttpCache(path)
+
+    assert reopened.lookup("https://host/page").last_modified == "Sat, 17 Oct 2026"
+
+
+def test_client_serves_fresh_hits_and_revalidates_stale_entries(tmp_path):
+    requests = []
+
+    async def job_page(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b"<html>job</html>", headers={"ETag": '"v1"'})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/jobs/view/1/", job_page)
+        app.router.add_get("/search", job_page)
+        async with TestServer(app) as server:
+            cache = HttpCache(
+                str(tmp_path / "cache.db"), ttls={r"/jobs/view/\d+": 3600}
+            )
+            client = HttpClient(cache=cache)
+            try:
+                job_url = str(server.make_url("/jobs/view/1/"))
+                search_url = str(server.make_url("/search"))
+                bodies = [
+                    await client.get_bytes(job_url),
+                    await client.get_bytes(job_url),
+                    await client.get_bytes(search_url),
+                    await client.get_bytes(search_url),
+                ]
+                return bodies, dict(cache.stats)
+            finally:
+                await client.close()
+
+    bodies, stats = asyncio.run(run())
+
+    assert bodies == [b"<html>job</html>"] * 4
+    assert requests == [None, None, '"v1"']
+    assert stats == {"misses": 2, "hits": 1, "revalidated": 1}
@@ -0,0 +1,55 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.common.http_client import ConnectionConfig, HttpClient
+
+
+async def chunked_page(request):
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for _ in range(int(request.query["chunks"])):
+        await response.write(b"x" * 1024)
+    await response.write_eof()
+    return response
+
+
+async def fetch(*paths, **client_kwargs):
+    app = web.Application()
+    app.router.add_get("/page", chunked_page)
+    async with TestServer(app) as server:
+        client = HttpClient(**client_kwargs)
+        try:
+            return [
+                await client.get_bytes(str(server.make_url(path))) for path in paths
+            ]
+        finally:
+            await client.close()
+
+
+def test_bodies_over_the_size_cap_are_dropped():
+    config = ConnectionConfig(max_response_bytes=4096)
+
+    bodies = asyncio.run(
+        fetch("/page?chunks=2", "/page?chunks=8", connection_config=config)
+    )
+
+    assert bodies == [b"x" * 2048, None]
+
+
+def test_connection_settings_reach_the_session():
+    config = ConnectionConfig(limit=20, limit_per_host=4, connect_timeout=2)
+
+    async def inspect():
+        client = HttpClient(connection_config=config, timeout=7)
+        try:
+            connector = client._session.connector
+            return connector.limit, connector.limit_per_host, client.timeout
+        finally:
+            await client.close()
+
+    limit, limit_per_host, timeout = asyncio.run(inspect())
+
+    assert (limit, limit_per_host) == (20, 4)
+    assert (timeout.total, timeout.connect) == (7, 2)
@@ -1,9 +1,25 @@
+import asyncio
+import datetime
 import uuid
+from unittest.mock import PropertyMock, patch
 
+import boto3
+import pytest
 from starlette import status
 
-from src.job.model import Job
-from src.job.store import JobStore
+from src.job import routes as job_routes
+from src.job.backfill import backfill_index_keys
+from src.job.compress_descriptions import compress_descriptions
+from src.job.compression import CompressedText
+from src.job.publish_scraped import publish_scraped_jobs
+from src.job.model import JOB_FIELDS, SUMMARY_FIELDS, Job
+from src.job.util import encode_last_key
+from src.job.store import (
+    COMPRESSED_DESCRIPTION,
+    JobStore,
+    LookupThrottled,
+    listing_fingerprint,
+)
 
 
 def test_added_job_retrieved_by_id(dynamodb_table):
@@ -61,6 +77,503 @@ def test_active_jobs_retrieved_by_status(dynamodb_table):
     assert repository.get_active(author=active_job.author) == [active_job]
 
 
+def test_status_views_follow_status_transitions(dynamodb_table):
+    """
+    Ensures that updating a job's status moves it between status views.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    job = Job.create(
+        uuid.uuid4(),
+        "Software Engineer",
+        "Big Corp",
+        "Remote",
+        "https://example.com",
+        "Join us!",
+        "https://example.com/logo.png",
+        "admin@email.com",
+    )
+    job.activate()
+    repository.add(job)
+
+    job.close()
+    repository.update(job)
+
+    assert repository.get_active(author=job.author) == []
+    assert repository.get_closed(author=job.author) == [job]
+
+
+def test_backfill_adds_index_keys_to_existing_items(dynamodb_table):
+    """
+    Ensures that items written without index keys become visible to the
+    status views and the feed after the backfill, and drafts leave it.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    for _ in range(5):
+        job = Job.create(
+            uuid.uuid4(),
+            "Software Engineer",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        job.activate()
+        item = {
+            "PK": f"#{job.author}",
+            "SK": f"#{job.id}",
+            "id": str(job.id),
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "job_url": job.job_url,
+            "description": job.description,
+            "logo_url": job.logo_url,
+            "status": job.status.value,
+            "author": job.author,
+            "created_at": job.created_at,
+            "updated_at": job.updated_at,
+        }
+        repository.table.put_item(Item=item)
+    # A draft written when every job was in the feed.
+    draft_id = str(uuid.uuid4())
+    repository.table.put_item(
+        Item={
+            **item,
+            "SK": f"#{draft_id}",
+            "id": draft_id,
+            "status": "DRAFT",
+            "GS2PK": f"#FEED#{item['created_at'][:7]}",
+            "GS2SK": item["created_at"],
+        }
+    )
+
+    updated = backfill_index_keys(repository, segments=3)
+
+    assert updated == 6
+    assert len(repository.get_active(author="admin@email.com")) == 5
+    assert len(repository.get_feed(limit=10)[0]) == 5
+    assert backfill_index_keys(repository, segments=3) == 0
+
+
+def test_add_many_stores_jobs_in_batches(dynamodb_table):
+    """
+    Ensures that bulk-added jobs spanning several batches are all stored.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    jobs = [
+        Job.create(
+            uuid.uuid4(),
+            f"Software Engineer {i}",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        for i in range(30)
+    ]
+
+    result = repository.add_many(jobs)
+
+    assert result.written == 30
+    assert result.failed == {}
+    assert len(repository.get_all_by_author("admin@email.com")) == 30
+
+
+def test_listing_updates_only_when_card_fields_change(dynamodb_table):
+    """
+    Ensures fingerprints are looked up in bulk and a listing is only
+    rewritten when its scraped fields differ from the stored ones.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    stored = Job.create(
+        uuid.uuid4(),
+        "Software Engineer",
+        "Big Corp",
+        "Remote",
+        "https://example.com",
+        "Join us!",
+        "https://example.com/logo.png",
+        "admin@email.com",
+    )
+    unknown = Job.create(
+        uuid.uuid4(),
+        "Data Engineer",
+        "Big Corp",
+        "Remote",
+        "https://example.com/2",
+        "Join us!",
+        "https://example.com/logo.png",
+        "admin@email.com",
+    )
+    repository.add(stored)
+
+    fingerprints = repository.get_fingerprints([stored, unknown])
+    assert fingerprints == {stored.id: listing_fingerprint(stored)}
+    assert repository.update_listing(stored) is False
+
+    stored.title = "Senior Software Engineer"
+    assert repository.update_listing(stored) is True
+    assert repository.get(stored.id, "admin@email.com").title == stored.title
+    assert repository.update_listing(unknown) is False
+    assert repository.get_fingerprints([unknown]) == {}
+
+
+def test_add_many_retries_unprocessed_items(dynamodb_table):
+    """
+    Ensures that items DynamoDB leaves unprocessed are resubmitted.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    jobs = [
+        Job.create(
+            uuid.uuid4(),
+            "Software Engineer",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        for _ in range(3)
+    ]
+    dynamodb = boto3.resource("dynamodb")
+    batch_write_item = dynamodb.batch_write_item
+    calls = []
+
+    def flaky_batch_write_item(RequestItems):
+        calls.append(RequestItems)
+        requests = RequestItems[dynamodb_table]
+        if len(calls) == 1:
+            batch_write_item(RequestItems={dynamodb_table: requests[1:]})
+            return {"UnprocessedItems": {dynamodb_table: requests[:1]}}
+        return batch_write_item(RequestItems=RequestItems)
+
+    dynamodb.batch_write_item = flaky_batch_write_item
+    with patch.object(
+        JobStore, "dynamodb", new_callable=PropertyMock, return_value=dynamodb
+    ):
+        result = repository.add_many(jobs, base_delay=0)
+
+    assert result.written == 3
+    assert len(calls) == 2
+    assert len(calls[1][dynamodb_table]) == 1
+    assert len(repository.get_all_by_author("admin@email.com")) == 3
+
+
+def test_get_fingerprints_reports_what_it_found_when_throttled(dynamodb_table):
+    """
+    Ensures that keys DynamoDB keeps leaving unprocessed raise
+    LookupThrottled carrying the fingerprints that were found.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    found, throttled = [
+        Job.create(
+            uuid.uuid4(),
+            title,
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        for title in ("Software Engineer", "Data Engineer")
+    ]
+    repository.add_many([found, throttled])
+    dynamodb = boto3.resource("dynamodb")
+    batch_get_item = dynamodb.batch_get_item
+    throttled_key = {"PK": f"#{throttled.author}", "SK": f"#{throttled.id}"}
+
+    def throttling_batch_get_item(RequestItems):
+        request = RequestItems[dynamodb_table]
+        keys = [key for key in request["Keys"] if key != throttled_key]
+        response = {"Responses": {}}
+        if keys:
+            response = batch_get_item(
+                RequestItems={dynamodb_table: {**request, "Keys": keys}}
+            )
+        response["UnprocessedKeys"] = {
+            dynamodb_table: {**request, "Keys": [throttled_key]}
+        }
+        return response
+
+    dynamodb.batch_get_item = throttling_batch_get_item
+    with patch.object(
+        JobStore, "dynamodb", new_callable=PropertyMock, return_value=dynamodb
+    ):
+        with pytest.raises(LookupThrottled) as raised:
+            repository.get_fingerprints([found, throttled], max_retries=1)
+
+    assert raised.value.found == {found.id: listing_fingerprint(found)}
+
+
+def test_job_store_reuses_dynamodb_resource(dynamodb_table):
+    """
+    Ensures that a store builds its DynamoDB resource once and reuses it.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+
+    with patch("src.job.store.boto3.session.Session") as session:
+        table = session.return_value.resource.return_value.Table.return_value
+        table.query.return_value = {"Items": []}
+        repository.get_all_by_author("admin@email.com")
+        repository.get_all_by_author("admin@email.com")
+
+    session.return_value.resource.assert_called_once()
+
+
+def test_async_job_store_round_trip(async_job_store):
+    """
+    Verifies add, get, update and delete through the async store.
+    """
+    job = Job.create(
+        uuid.uuid4(),
+        "Software Engineer",
+        "Big Corp",
+        "Remote",
+        "https://example.com",
+        "Join us!",
+        "https://example.com/logo.png",
+        "admin@email.com",
+    )
+
+    async def round_trip():
+        try:
+            await async_job_store.add(job)
+            stored = await async_job_store.get(str(job.id), job.author)
+            job.activate()
+            await async_job_store.update(job)
+            updated = await async_job_store.get_all_by_author(job.author)
+            await async_job_store.delete(str(job.id), job.author)
+            remaining = await async_job_store.get_all_by_author(job.author)
+            return stored, updated, remaining
+        finally:
+            await async_job_store.close()
+
+    stored, updated, remaining = asyncio.run(round_trip())
+
+    assert stored.title == job.title
+    assert updated == [job]
+    assert remaining == []
+
+
+def test_feed_pages_newest_first_across_months(dynamodb_table):
+    """
+    Ensures that the feed returns jobs newest first, across monthly
+    partitions, and that its cursor resumes where the last page ended.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    now = datetime.datetime.now(datetime.UTC)
+    created = [
+        now.isoformat(),
+        (now - datetime.timedelta(minutes=5)).isoformat(),
+        (now - datetime.timedelta(days=40)).isoformat(),
+        (now - datetime.timedelta(days=75)).isoformat(),
+        (now - datetime.timedelta(days=800)).isoformat(),
+    ]
+    for created_at in created:
+        job = Job.create(
+            uuid.uuid4(),
+            "Software Engineer",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        job.activate()
+        job.created_at = created_at
+        repository.add(job)
+
+    first_page, cursor = repository.get_feed(limit=3)
+    second_page, last_cursor = repository.get_feed(limit=3, last_key=cursor)
+
+    assert [job.created_at for job in first_page] == created[:3]
+    assert [job.created_at for job in second_page] == created[3:4]
+    assert last_cursor is None
+
+
+def test_feed_ends_only_after_a_run_of_empty_months(dynamodb_table):
+    """
+    Ensures that the feed reaches past gaps shorter than the run of empty
+    months that ends it.
+    """
+    repository = JobStore(table_name=dynamodb_table, feed_max_empty_months=4)
+    now = datetime.datetime.now(datetime.UTC)
+    created = [
+        now.isoformat(),
+        (now - datetime.timedelta(days=100)).isoformat(),
+        (now - datetime.timedelta(days=200)).isoformat(),
+        (now - datetime.timedelta(days=500)).isoformat(),
+    ]
+    for created_at in created:
+        job = Job.create(
+            uuid.uuid4(),
+            "Software Engineer",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        job.activate()
+        job.created_at = created_at
+        repository.add(job)
+
+    first_page, cursor = repository.get_feed(limit=2)
+    second_page, last_cursor = repository.get_feed(limit=2, last_key=cursor)
+
+    assert [job.created_at for job in first_page + second_page] == created[:3]
+    assert last_cursor is None
+
+
+def test_feed_only_lists_active_jobs(dynamodb_table):
+    """
+    Ensures that drafts never reach the public feed and that jobs leave it
+    once they are closed.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    draft, active = [
+        Job.create(
+            uuid.uuid4(),
+            title,
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        for title in ("Draft Engineer", "Active Engineer")
+    ]
+    active.activate()
+    repository.add_many([draft, active])
+
+    assert [job.id for job in repository.get_feed(limit=10)[0]] == [active.id]
+
+    active.close()
+    repository.update(active)
+    draft.activate()
+    repository.update(draft)
+
+    assert [job.id for job in repository.get_feed(limit=10)[0]] == [draft.id]
+
+
+def test_migration_publishes_scraped_drafts_only(dynamodb_table):
+    """
+    Ensures that scraped listings stored as drafts are published, while
+    drafts of other authors stay out of the feed.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    scraped, drafted = [
+        Job.create(
+            uuid.uuid4(),
+            "Software Engineer",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            author,
+        )
+        for author in ("linkedin", "admin@email.com")
+    ]
+    repository.add_many([scraped, drafted])
+
+    assert publish_scraped_jobs(repository, author="linkedin", segments=3) == 1
+    assert publish_scraped_jobs(repository, author="linkedin", segments=3) == 0
+    [published], _ = repository.get_feed(limit=10)
+    assert published.id == scraped.id
+    assert repository.get_active(author="linkedin") == [published]
+
+
+def test_get_paginated_jobs(client, job_store, user_email, token):
+    jobs = [
+        Job.create(
+            id_=uuid.uuid4(),
+            title=f"Python Developer {i}",
+            company="Tech Corp",
+            location="Berlin",
+            job_url=f"https://example.com/job/{i}",
+            description="Python role",
+            logo_url="https://example.com/logo.png",
+            author=user_email,
+        )
+        for i in range(3)
+    ]
+    for job in jobs:
+        job.activate()
+        job_store.add(job)
+
+    first = client.get(
+        "/api/v1/jobs/paginated?limit=2",
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+    second = client.get(
+        f"/api/v1/jobs/paginated?limit=2&last_key={first['last_key']}",
+        headers={"Authorization": f"Bearer {token}"},
+    ).json()
+
+    assert [job["id"] for job in first["jobs"] + second["jobs"]] == [
+        str(job.id) for job in reversed(jobs)
+    ]
+
+
+def test_paginated_jobs_reject_malformed_cursors(client, token):
+    for last_key in (
+        "not base64!",
+        encode_last_key({"PK": "#user@email.com", "SK": "#1"}),
+        encode_last_key({"bucket": "2024-13", "key": None}),
+        encode_last_key(["2024-01"]),
+    ):
+        response = client.get(
+            "/api/v1/jobs/paginated",
+            params={"last_key": last_key},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_fast_json_responses_match_validated_responses(
+    client, job_store, user_email, token
+):
+    """
+    Jobs written straight to JSON have the same shape as jobs validated
+    against the response models.
+    """
+    job_store.add(
+        Job.create(
+            id_=uuid.uuid4(),
+            title="Python Developer",
+            company="Tech Corp",
+            location="Berlin",
+            job_url="https://example.com/job/1",
+            description="Python role",
+            logo_url=None,
+            author=user_email,
+        )
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    responses = {}
+    for fast in (True, False):
+        with patch.object(job_routes.settings, "FAST_JSON_RESPONSES", fast):
+            responses[fast] = [
+                client.get(path, headers=headers).json()
+                for path in ("/api/v1/jobs/mine", "/api/v1/jobs/paginated")
+            ]
+
+    assert responses[True] == responses[False]
+    assert responses[True][0][0]["logo_url"] is None
+
+
 def test_create_job(client, user_email, token):
     job_data = {
         "title": "Python Developer",
@@ -242,3 +755,201 @@ def test_update_job_maintains_unchanged_fields(client, job_store, user_email, to
     assert body["job_url"] == job.job_url
     assert body["description"] == job.description
     assert body["logo_url"] == job.logo_url
+
+
+def test_projected_reads_return_only_the_requested_fields(dynamodb_table):
+    """
+    Reads given `fields` fetch just those attributes; the rest are None.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    job = Job.create(
+        id_=uuid.uuid4(),
+        title="Python Developer",
+        company="Tech Corp",
+        location="Berlin",
+        job_url="https://example.com/job/1",
+        description="A long description " * 100,
+        logo_url=None,
+        author="admin@email.com",
+    )
+    job.activate()
+    repository.add(job)
+
+    [mine] = repository.get_all_by_author(job.author, fields=("title", "status"))
+    [summary], _ = repository.get_feed(limit=10, fields=SUMMARY_FIELDS)
+    [scanned], _ = repository.get_all(limit=10, fields=("company",))
+    [full] = repository.get_all_by_author(job.author, fields=JOB_FIELDS)
+
+    assert (mine.id, mine.title, mine.status) == (job.id, job.title, job.status)
+    assert mine.description is None and mine.company is None
+    assert summary == Job(**{**job.__dict__, "description": None})
+    assert (scanned.id, scanned.company, scanned.title) == (job.id, job.company, None)
+    assert full == job
+
+
+def test_listings_leave_out_descriptions_unless_asked(
+    client, job_store, user_email, token
+):
+    job = Job.create(
+        id_=uuid.uuid4(),
+        title="Python Developer",
+        company="Tech Corp",
+        location="Berlin",
+        job_url="https://example.com/job/1",
+        description="Python role",
+        logo_url=None,
+        author=user_email,
+    )
+    job.activate()
+    job_store.add(job)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    def get(path, **params):
+        return client.get(f"/api/v1/jobs/{path}", params=params, headers=headers)
+
+    [summary] = get("mine").json()
+    [sparse] = get("paginated", fields="title, description").json()["jobs"]
+    [full] = get("mine", fields="full").json()
+
+    assert set(summary) == set(SUMMARY_FIELDS)
+    assert sparse == {
+        "id": str(job.id),
+        "title": job.title,
+        "description": "Python role",
+    }
+    assert full["description"] == "Python role"
+    response = get("mine", fields="title,salary")
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert "salary" in response.json()["detail"]
+
+
+def test_long_descriptions_are_stored_compressed(dynamodb_table):
+    """
+    Ensures that long descriptions are stored only in the compressed
+    attribute, read back lazily, and that updates drop the stale attribute.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    job = Job.create(
+        id_=uuid.uuid4(),
+        title="Python Developer",
+        company="Tech Corp",
+        location="Berlin",
+        job_url="https://example.com/job/1",
+        description="We are looking for a Python developer. " * 50,
+        logo_url=None,
+        author="admin@email.com",
+    )
+    repository.add(job)
+
+    def stored_item():
+        key = {"PK": f"#{job.author}", "SK": f"#{job.id}"}
+        return repository.table.get_item(Key=key)["Item"]
+
+    item = stored_item()
+    assert "description" not in item
+    assert len(item[COMPRESSED_DESCRIPTION].value) < len(job.description)
+    fetched = repository.get(job_id=job.id, author=job.author)
+    assert isinstance(fetched.__dict__["description"], CompressedText)
+    assert fetched == job
+
+    job.description = "Python role"
+    repository.update(job)
+
+    item = stored_item()
+    assert COMPRESSED_DESCRIPTION not in item
+    assert item["description"] == "Python role"
+
+
+def test_migration_compresses_existing_descriptions(dynamodb_table):
+    """
+    Ensures that items written with plain-text descriptions get long ones
+    compressed by the migration, keeping short ones as they are.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    jobs = [
+        Job.create(
+            uuid.uuid4(),
+            "Software Engineer",
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            description,
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        for description in ["Join us! " * 200] * 4 + ["Join us!"]
+    ]
+    for job in jobs:
+        repository.add(job)
+        item = repository.table.get_item(
+            Key={"PK": f"#{job.author}", "SK": f"#{job.id}"}
+        )["Item"]
+        item.pop(COMPRESSED_DESCRIPTION, None)
+        item["description"] = job.description
+        repository.table.put_item(Item=item)
+
+    assert compress_descriptions(repository, segments=3) == 4
+    assert compress_descriptions(repository, segments=3) == 0
+    stored = {job.id: job for job in repository.get_all_by_author("admin@email.com")}
+    assert stored == {job.id: job for job in jobs}
+
+
+def test_rewrite_items_leaves_items_changed_since_the_scan(dynamodb_table):
+    """
+    Ensures that a migration does not overwrite a job written while it was
+    running.
+    """
+    repository = JobStore(table_name=dynamodb_table)
+    jobs = [
+        Job.create(
+            uuid.uuid4(),
+            title,
+            "Big Corp",
+            "Remote",
+            "https://example.com",
+            "Join us!",
+            "https://example.com/logo.png",
+            "admin@email.com",
+        )
+        for title in ("Software Engineer", "Data Engineer")
+    ]
+    repository.add_many(jobs)
+    edited = jobs[0]
+
+    def rename(item):
+        if item["id"] == str(edited.id):
+            edited.title = "Staff Engineer"
+            edited.updated_at = datetime.datetime.now(datetime.UTC).isoformat()
+            repository.update(edited)
+        return {"title": "Migrated", "logo_url": None}
+
+    assert repository.rewrite_items(rename, segments=2) == 1
+    stored = {job.id: job for job in repository.get_all_by_author(edited.author)}
+    assert stored[edited.id].title == "Staff Engineer"
+    assert stored[edited.id].logo_url == edited.logo_url
+    assert stored[jobs[1].id].title == "Migrated"
+    assert stored[jobs[1].id].logo_url is None
+
+
+def test_get_job_returns_decompressed_description(client, job_store, user_email, token):
+    job = Job.create(
+        id_=uuid.uuid4(),
+        title="Python Developer",
+        company="Tech Corp",
+        location="Berlin",
+        job_url="https://example.com/job/1",
+        description="A long description " * 100,
+        logo_url=None,
+        author=user_email,
+    )
+    job_store.add(job)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get(f"/api/v1/jobs/{job.id}", headers=headers)
+    [listed] = client.get(
+        "/api/v1/jobs/mine", params={"fields": "full"}, headers=headers
+    ).json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["description"] == job.description
+    assert listed["description"] == job.description
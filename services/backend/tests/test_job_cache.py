@@ -0,0 +1,272 @@
+import asyncio
+import uuid
+from collections import Counter
+
+from starlette import status
+
+from src.job import cache as job_cache
+from src.job.cache import CachedJobStore, MemoryCacheBackend, _job_key
+from src.job.compression import CompressedText, compress_text
+from src.job.model import Job
+
+
+def make_job(title="Python Developer", author="user@email.com"):
+    return Job.create(
+        id_=uuid.uuid4(),
+        title=title,
+        company="Tech Corp",
+        location="Zagreb",
+        job_url="https://example.com/job",
+        description="Python role",
+        logo_url=None,
+        author=author,
+    )
+
+
+class FakeJobStore:
+    """
+    In-memory AsyncJobStore stand-in that counts reads. Reads see the jobs
+    as they were when they started.
+    """
+
+    def __init__(self, *jobs):
+        self.jobs = {str(job.id): Job(**job.__dict__) for job in jobs}
+        self.reads = Counter()
+        # Cleared to hold reads until the test lets them finish.
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def get(self, job_id, author):
+        self.reads["get"] += 1
+        job = self.jobs.get(job_id)
+        await self.gate.wait()
+        if job is None or job.author != author:
+            raise ValueError(f"Job {job_id} not found for author {author}")
+        return Job(**job.__dict__)
+
+    async def get_all_by_author(self, author, fields=None):
+        self.reads["mine"] += 1
+        await self.gate.wait()
+        return [Job(**job.__dict__) for job in self.jobs.values()]
+
+    async def get_feed(self, limit, last_key=None, fields=None):
+        self.reads["feed"] += 1
+        await self.gate.wait()
+        jobs = sorted(self.jobs.values(), key=lambda job: job.created_at)
+        return [Job(**job.__dict__) for job in jobs[:limit]], None
+
+    async def add(self, job):
+        self.jobs[str(job.id)] = Job(**job.__dict__)
+
+    async def update(self, job):
+        self.jobs[str(job.id)] = Job(**job.__dict__)
+
+    async def delete(self, job_id, author):
+        self.jobs.pop(job_id, None)
+
+
+def cached(store):
+    return CachedJobStore(store, MemoryCacheBackend(maxsize=100, ttl=60), ttl=60)
+
+
+def test_repeated_reads_are_served_from_the_cache():
+    job = make_job()
+    store = FakeJobStore(job)
+    cache = cached(store)
+
+    async def read_twice():
+        for _ in range(2):
+            await cache.get(str(job.id), job.author)
+            await cache.get_all_by_author(job.author)
+            await cache.get_feed(limit=10)
+
+    asyncio.run(read_twice())
+
+    assert store.reads == {"get": 1, "mine": 1, "feed": 1}
+    assert cache.metrics.stats() == {
+        route: {"hits": 1, "misses": 1, "coalesced": 0}
+        for route in ("job", "mine", "feed")
+    }
+
+
+def test_reads_return_copies():
+    job = make_job()
+    cache = cached(FakeJobStore(job))
+
+    async def read():
+        first = await cache.get(str(job.id), job.author)
+        first.title = "Changed"
+        return await cache.get(str(job.id), job.author)
+
+    assert asyncio.run(read()) == job
+
+
+def test_cached_descriptions_stay_compressed():
+    job = make_job()
+    description = "We are looking for a Python developer. " * 50
+    job.description = CompressedText(compress_text(description))
+    store = FakeJobStore(job)
+    cache = cached(store)
+
+    async def read_twice():
+        reads = [await cache.get(str(job.id), job.author) for _ in range(2)]
+        return reads, await cache.backend.get(_job_key(str(job.id), job.author))
+
+    (first, second), entry = asyncio.run(read_twice())
+
+    assert store.reads["get"] == 1
+    assert "Python developer" not in entry
+    assert isinstance(second.__dict__["description"], CompressedText)
+    assert first.description == second.description == description
+
+
+def test_writes_invalidate_the_job_its_author_and_the_feed():
+    job, other = make_job(), make_job("Java Developer", author="other@email.com")
+    store = FakeJobStore(job, other)
+    cache = cached(store)
+
+    async def read_all():
+        return (
+            await cache.get(str(job.id), job.author),
+            await cache.get(str(other.id), other.author),
+            await cache.get_all_by_author(job.author),
+            await cache.get_feed(limit=10),
+        )
+
+    async def scenario():
+        await read_all()
+        job.title = "Rust Developer"
+        await cache.update(job)
+        return await read_all()
+
+    fetched, other_fetched, mine, (feed, _) = asyncio.run(scenario())
+
+    assert fetched.title == "Rust Developer"
+    assert "Rust Developer" in [j.title for j in mine]
+    assert "Rust Developer" in [j.title for j in feed]
+    # The other author's job was left in the cache.
+    assert store.reads == {"get": 3, "mine": 2, "feed": 2}
+    assert other_fetched == other
+
+
+def test_writes_invalidate_every_fieldset_of_the_author_list():
+    job = make_job()
+    store = FakeJobStore(job)
+    cache = cached(store)
+
+    async def scenario():
+        for fields in (None, ("title",)):
+            await cache.get_all_by_author(job.author, fields=fields)
+        job.title = "Rust Developer"
+        await cache.update(job)
+        return [
+            await cache.get_all_by_author(job.author, fields=fields)
+            for fields in (None, ("title",))
+        ]
+
+    lists = asyncio.run(scenario())
+
+    assert [jobs[0].title for jobs in lists] == ["Rust Developer"] * 2
+    assert store.reads["mine"] == 4
+
+
+def test_author_generations_stay_bounded(monkeypatch):
+    monkeypatch.setattr(job_cache, "AUTHOR_GENERATION_BUCKETS", 4)
+    jobs = [make_job(author=f"user{n}@email.com") for n in range(50)]
+    store = FakeJobStore(*jobs)
+    cache = cached(store)
+
+    async def scenario():
+        for job in jobs:
+            await cache.get_all_by_author(job.author)
+            await cache.update(job)
+        return await cache.get_all_by_author(jobs[0].author)
+
+    asyncio.run(scenario())
+
+    # The feed generation plus one per bucket.
+    assert len(cache.backend._counters) == 5
+    assert store.reads["mine"] == 51
+
+
+def test_concurrent_misses_share_one_load():
+    job = make_job()
+    store = FakeJobStore(job)
+    cache = cached(store)
+
+    async def stampede():
+        store.gate.clear()
+        readers = [
+            asyncio.create_task(cache.get(str(job.id), job.author)) for _ in range(10)
+        ]
+        await asyncio.sleep(0)
+        store.gate.set()
+        return await asyncio.gather(*readers)
+
+    results = asyncio.run(stampede())
+
+    assert results == [job] * 10
+    assert store.reads["get"] == 1
+    assert cache.metrics.stats()["job"] == {"hits": 0, "misses": 1, "coalesced": 9}
+
+
+def test_load_overlapping_a_write_is_not_cached():
+    job = make_job()
+    store = FakeJobStore(job)
+    cache = cached(store)
+
+    async def scenario():
+        store.gate.clear()
+        stale = asyncio.create_task(cache.get(str(job.id), job.author))
+        while not store.reads["get"]:
+            await asyncio.sleep(0)
+        # The write lands while the read is still in flight.
+        job.title = "Rust Developer"
+        await cache.update(job)
+        store.gate.set()
+        return await stale, await cache.get(str(job.id), job.author)
+
+    stale, fresh = asyncio.run(scenario())
+
+    assert stale.title == "Python Developer"
+    assert fresh.title == "Rust Developer"
+    assert store.reads["get"] == 2
+
+
+def test_missing_jobs_are_not_cached():
+    store = FakeJobStore()
+    cache = cached(store)
+
+    async def scenario():
+        for _ in range(2):
+            try:
+                await cache.get(str(uuid.uuid4()), "user@email.com")
+            except ValueError:
+                pass
+
+    asyncio.run(scenario())
+
+    assert store.reads["get"] == 2
+
+
+def test_job_routes_report_cache_hits(
+    client, job_store, user_email, token, admin_token
+):
+    job = make_job(author=user_email)
+    job_store.add(job)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for _ in range(3):
+        response = client.get(f"/api/v1/jobs/{job.id}", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(
+        "/api/v1/health/cache", headers={"Authorization": f"Bearer {admin_token}"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["job"] == {"hits": 2, "misses": 1, "coalesced": 0}
+    assert (
+        client.get("/api/v1/health/cache", headers=headers).status_code
+        == status.HTTP_403_FORBIDDEN
+    )
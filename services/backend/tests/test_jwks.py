@@ -0,0 +1,89 @@
+import asyncio
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from src.auth.jwks import JWKSKeyRegistry
+
+
+def make_key_pair(kid: str):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_jwk = jwk.construct(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ),
+        algorithm="RS256",
+    ).to_dict()
+    public_jwk["kid"] = kid
+    return private_pem, public_jwk
+
+
+class FakeJWKSEndpoint:
+    def __init__(self, *keys):
+        self.keys = list(keys)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"keys": self.keys}
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_concurrent_lookups_share_one_fetch():
+    private_pem, public_jwk = make_key_pair("key-1")
+    endpoint = FakeJWKSEndpoint(public_jwk)
+    registry = JWKSKeyRegistry("https://example.com/jwks.json", fetch=endpoint)
+    token = jwt.encode(
+        {"sub": "123"}, private_pem, algorithm="RS256", headers={"kid": "key-1"}
+    )
+
+    async def lookup_many():
+        return await asyncio.gather(*(registry.get_key("key-1") for _ in range(20)))
+
+    keys = asyncio.run(lookup_many())
+
+    assert endpoint.calls == 1
+    assert all(key is keys[0] for key in keys)
+    assert jwt.decode(token, keys[0], algorithms=["RS256"])["sub"] == "123"
+
+
+def test_unknown_kid_refreshes_at_most_once_per_interval():
+    _, old_jwk = make_key_pair("old")
+    _, new_jwk = make_key_pair("new")
+    endpoint = FakeJWKSEndpoint(old_jwk)
+    timer = FakeTimer()
+    registry = JWKSKeyRegistry(
+        "https://example.com/jwks.json",
+        min_refresh_interval=30,
+        fetch=endpoint,
+        timer=timer,
+    )
+
+    async def scenario():
+        await registry.get_key("old")
+        endpoint.keys.append(new_jwk)
+        missing = await registry.get_key("new")
+        timer.now += 30
+        rotated = await registry.get_key("new")
+        return missing, rotated
+
+    missing, rotated = asyncio.run(scenario())
+
+    assert missing is None
+    assert rotated is not None
+    assert endpoint.calls == 2
@@ -0,0 +1,98 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from src.linkedin.parser import LinkedInJobParser
+
+FIXTURES = Path(__file__).parent / "fixtures" / "linkedin"
+
+
+class FakeHttpClient:
+    """Serves the saved job page for every URL and tracks concurrency."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requested = []
+
+    async def get_bytes(self, url: str) -> bytes:
+        self.requested.append(url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        return (FIXTURES / "job_page.html").read_bytes()
+
+
+def load_search_page() -> bytes:
+    return (FIXTURES / "search_page.html").read_bytes()
+
+
+def parse_search_page(parser: LinkedInJobParser):
+    async def parse():
+        return [job for job, _ in await parser.parse_search_results(load_search_page())]
+
+    return asyncio.run(parse())
+
+
+def test_search_results_keep_card_order():
+    parser = LinkedInJobParser(FakeHttpClient())
+
+    results = asyncio.run(parser.parse_search_results(load_search_page()))
+
+    assert [job.job_url for job, _ in results] == [
+        f"https://www.linkedin.com/jobs/view/398451230{i}/" for i in range(1, 6)
+    ]
+    assert results[0][0].title == "Senior Python Developer"
+    assert results[0][0].company == "Infobip"
+    assert all(listed_at for _, listed_at in results)
+
+
+def test_fill_description_bounds_concurrent_fetches():
+    http_client = FakeHttpClient()
+    parser = LinkedInJobParser(http_client, concurrency=2)
+    jobs = parse_search_page(parser)
+
+    async def fill():
+        await asyncio.gather(*(parser.fill_description(job) for job in jobs))
+
+    asyncio.run(fill())
+
+    assert http_client.max_in_flight == 2
+    assert all(
+        "5+ years of professional experience with Python" in job.description
+        for job in jobs
+    )
+
+
+def test_search_results_derive_stable_ids_from_linkedin_job_ids():
+    parser = LinkedInJobParser(FakeHttpClient())
+
+    first = parse_search_page(parser)
+    second = parse_search_page(parser)
+
+    assert [job.id for job in first] == [job.id for job in second]
+    assert len({job.id for job in first}) == 5
+    assert all(job.description == "" for job in first)
+
+
+def test_search_page_parsed_in_process_pool():
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=2, mp_context=spawn) as executor:
+        http_client = FakeHttpClient()
+        parser = LinkedInJobParser(http_client, executor=executor)
+
+        async def parse():
+            results = await parser.parse_search_results(load_search_page())
+            jobs = [job for job, _ in results]
+            await parser.fill_description(jobs[0])
+            return jobs
+
+        jobs = asyncio.run(parse())
+
+    assert [job.job_url for job in jobs] == [
+        f"https://www.linkedin.com/jobs/view/398451230{i}/" for i in range(1, 6)
+    ]
+    assert "5+ years of professional experience with Python" in jobs[0].description
@@ -0,0 +1,251 @@
+import asyncio
+from pathlib import Path
+
+from src.job.store import BatchWriteResult, LookupThrottled, listing_fingerprint
+from src.linkedin.parser import LinkedInJobParser
+from src.linkedin.pipeline import ScrapePipeline
+from src.linkedin.plan import ScrapePlan
+from src.linkedin.watermark import SearchWatermark
+
+FIXTURES = Path(__file__).parent / "fixtures" / "linkedin"
+
+
+class FakeSearchClient:
+    """Serves `full_pages` search result pages followed by empty ones."""
+
+    def __init__(self, full_pages: int):
+        self.full_pages = full_pages
+        self.search_pages_requested = []
+        self.job_pages_requested = []
+
+    async def get_bytes(self, url: str) -> bytes:
+        if url.startswith("search"):
+            page = int(url.rsplit(":", 1)[1])
+            self.search_pages_requested.append(page)
+            if page >= self.full_pages:
+                return b""
+            return (FIXTURES / "search_page.html").read_bytes()
+        self.job_pages_requested.append(url)
+        return (FIXTURES / "job_page.html").read_bytes()
+
+
+class FakeJobStore:
+    def __init__(self):
+        self.jobs = {}
+        self.refreshed = []
+
+    def get_fingerprints(self, jobs):
+        return {
+            job.id: listing_fingerprint(self.jobs[job.id])
+            for job in jobs
+            if job.id in self.jobs
+        }
+
+    def add_many(self, jobs):
+        self.jobs.update((job.id, job) for job in jobs)
+        return BatchWriteResult(written=len(jobs))
+
+    def update_listing(self, job):
+        self.refreshed.append(job)
+        self.jobs[job.id] = job
+        return True
+
+
+def test_pipeline_stores_jobs_and_stops_at_first_empty_page():
+    http_client = FakeSearchClient(full_pages=2)
+    parser = LinkedInJobParser(http_client)
+    job_store = FakeJobStore()
+    pipeline = ScrapePipeline(http_client, parser, job_store, workers=3, queue_size=2)
+
+    stats = asyncio.run(pipeline.run(lambda page: f"search:{page}", max_pages=10))
+
+    assert http_client.search_pages_requested == [0, 1, 2]
+    assert stats.pages_fetched == 3
+    assert stats.cards_found == 10
+    # Both pages list the same five postings.
+    assert stats.jobs_stored == 5
+    assert stats.jobs_skipped == 5
+    assert len(job_store.jobs) == 5
+
+
+def test_rescrape_skips_stored_postings_and_refreshes_changed_ones():
+    http_client = FakeSearchClient(full_pages=1)
+    parser = LinkedInJobParser(http_client)
+    job_store = FakeJobStore()
+    pipeline = ScrapePipeline(http_client, parser, job_store)
+    asyncio.run(pipeline.run(lambda page: f"search:{page}", max_pages=10))
+    changed = next(iter(job_store.jobs.values()))
+    changed.title = "Old title"
+    http_client.job_pages_requested.clear()
+
+    rescrape = ScrapePipeline(http_client, parser, job_store)
+    stats = asyncio.run(rescrape.run(lambda page: f"search:{page}", max_pages=10))
+
+    assert stats.jobs_stored == 0
+    assert stats.jobs_skipped == 4
+    assert stats.jobs_updated == 1
+    assert http_client.job_pages_requested == [changed.job_url]
+    assert job_store.refreshed[0].id == changed.id
+
+
+class ThrottledJobStore(FakeJobStore):
+    """Only manages to look up the first `resolved` postings."""
+
+    def __init__(self, resolved: int):
+        super().__init__()
+        self.resolved = resolved
+
+    def get_fingerprints(self, jobs):
+        raise LookupThrottled(super().get_fingerprints(list(jobs)[: self.resolved]))
+
+
+def test_throttled_lookups_store_unresolved_postings_as_new():
+    http_client = FakeSearchClient(full_pages=1)
+    parser = LinkedInJobParser(http_client)
+    job_store = ThrottledJobStore(resolved=2)
+    asyncio.run(
+        ScrapePipeline(http_client, parser, job_store).run(
+            lambda page: f"search:{page}", max_pages=10
+        )
+    )
+
+    rescrape = ScrapePipeline(http_client, parser, job_store)
+    stats = asyncio.run(rescrape.run(lambda page: f"search:{page}", max_pages=10))
+
+    assert stats.pages_fetched == 2
+    assert stats.jobs_skipped == 2
+    assert stats.jobs_stored == 3
+    assert len(job_store.jobs) == 5
+
+
+def test_overlapping_searches_store_each_posting_once():
+    http_client = FakeSearchClient(full_pages=1)
+    parser = LinkedInJobParser(http_client)
+    job_store = FakeJobStore()
+    pipeline = ScrapePipeline(http_client, parser, job_store, search_concurrency=2)
+    searches = [lambda page, name=name: f"search-{name}:{page}" for name in "abc"]
+
+    stats = asyncio.run(pipeline.run_many(searches, max_pages=10))
+
+    assert stats.searches == 3
+    assert stats.pages_fetched == 6
+    # Every search lists the same five postings.
+    assert stats.jobs_stored == 5
+    assert stats.jobs_skipped == 10
+    assert len(http_client.job_pages_requested) == 5
+
+
+def test_scrape_plan_covers_every_keyword_and_location_once():
+    plan = ScrapePlan(
+        keywords=["Python developer", " python developer ", "Data engineer", ""],
+        locations=["Croatia", "Germany"],
+        timespan="r86400",
+    )
+
+    queries = plan.queries()
+
+    assert [(q.keywords, q.location) for q in queries] == [
+        ("Python developer", "Croatia"),
+        ("Python developer", "Germany"),
+        ("Data engineer", "Croatia"),
+        ("Data engineer", "Germany"),
+    ]
+    assert "f_TPR=r86400" in queries[0].url(2)
+    assert "start=50" in queries[0].url(2)
+
+
+def test_watermark_stops_paging_at_postings_seen_in_earlier_runs():
+    http_client = FakeSearchClient(full_pages=3)
+    parser = LinkedInJobParser(http_client)
+    job_store = FakeJobStore()
+    watermark = SearchWatermark("python developer|croatia")
+    pipeline = ScrapePipeline(http_client, parser, job_store)
+
+    asyncio.run(
+        pipeline.run_many(
+            [lambda page: f"search:{page}"], max_pages=10, watermarks=[watermark]
+        )
+    )
+
+    assert http_client.search_pages_requested == [0, 1, 2, 3]
+    assert pipeline.advanced == [watermark]
+    assert watermark.newest == "2026-10-16"
+    # Postings dated within a day of the newest are remembered by id.
+    assert len(watermark.seen) == 3
+
+    http_client.search_pages_requested.clear()
+    stats = asyncio.run(
+        pipeline.run_many(
+            [lambda page: f"search:{page}"], max_pages=10, watermarks=[watermark]
+        )
+    )
+
+    assert http_client.search_pages_requested == [0]
+    assert stats.searches_caught_up == 1
+    assert stats.jobs_skipped == 5
+
+
+def test_watermark_advances_when_paging_stops_at_the_page_limit():
+    http_client = FakeSearchClient(full_pages=5)
+    parser = LinkedInJobParser(http_client)
+    watermark = SearchWatermark("python developer|croatia")
+    pipeline = ScrapePipeline(http_client, parser, FakeJobStore())
+
+    asyncio.run(
+        pipeline.run_many(
+            [lambda page: f"search:{page}"], max_pages=2, watermarks=[watermark]
+        )
+    )
+
+    assert http_client.search_pages_requested == [0, 1]
+    assert pipeline.advanced == [watermark]
+    assert watermark.newest == "2026-10-16"
+
+
+def test_checkpoints_follow_persisted_pages_and_resume():
+    http_client = FakeSearchClient(full_pages=3)
+    parser = LinkedInJobParser(http_client)
+    pipeline = ScrapePipeline(http_client, parser, FakeJobStore(), workers=2)
+    checkpoints = []
+
+    async def checkpoint(index, next_page, finished):
+        checkpoints.append((index, next_page, finished))
+
+    asyncio.run(
+        pipeline.run_many(
+            [lambda page: f"search:{page}"], max_pages=10, checkpoint=checkpoint
+        )
+    )
+
+    # Page 0's new jobs are written with the final batch, so nothing is
+    # finished before then; pages 1 and 2 only repeat page 0.
+    assert checkpoints == [(0, 3, True)]
+
+    checkpoints.clear()
+    http_client.search_pages_requested.clear()
+    asyncio.run(
+        pipeline.run_many(
+            [lambda page: f"search:{page}"],
+            max_pages=10,
+            start_pages=[1],
+            checkpoint=checkpoint,
+        )
+    )
+
+    # Every posting is stored now, so each page finishes as it is read.
+    assert http_client.search_pages_requested == [1, 2, 3]
+    assert checkpoints == [(0, 2, False), (0, 3, False), (0, 3, True)]
+
+
+def test_scraped_jobs_are_published_to_search_and_the_feed(client, job_store):
+    http_client = FakeSearchClient(full_pages=1)
+    pipeline = ScrapePipeline(http_client, LinkedInJobParser(http_client), job_store)
+
+    asyncio.run(pipeline.run(lambda page: f"search:{page}", max_pages=10))
+
+    search = client.get("/api/v1/jobs/search", params={"q": "django"}).json()
+    feed = client.get("/api/v1/jobs/paginated", params={"limit": 10}).json()
+    assert [hit["title"] for hit in search["hits"]] == [
+        "Backend Engineer (Python/Django)"
+    ]
+    assert len(feed["jobs"]) == 5
@@ -0,0 +1,69 @@
+import random
+from collections import Counter
+
+from src.common.proxy_pool import ProxyPool
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_throttled_and_slow_proxies_get_less_traffic():
+    pool = ProxyPool(
+        ["fast", "slow", "throttled"], timer=FakeTimer(), rng=random.Random(1)
+    )
+    pool.record_success("fast", 0.1)
+    pool.record_success("slow", 1.0)
+    pool.record_success("throttled", 0.1)
+    pool.record_failure("throttled", throttled=True)
+
+    picks = Counter(pool.acquire() for _ in range(1000))
+
+    assert picks["fast"] > 5 * picks["slow"]
+    assert picks["fast"] > 2 * picks["throttled"]
+
+
+def test_circuit_opens_after_consecutive_failures_and_probes_after_cooldown():
+    timer = FakeTimer()
+    pool = ProxyPool(["good", "bad"], failure_threshold=2, cooldown=30, timer=timer)
+    pool.record_failure("bad")
+    pool.record_failure("bad")
+
+    assert {pool.acquire() for _ in range(50)} == {"good"}
+
+    timer.now = 31
+    assert pool.acquire() == "bad"  # half-open probe
+    pool.record_failure("bad")
+    assert {pool.acquire() for _ in range(50)} == {"good"}
+
+    timer.now = 62
+    assert pool.acquire() == "bad"
+    pool.record_success("bad", 0.2)
+    assert "bad" in {pool.acquire() for _ in range(200)}
+
+
+def test_quarantined_proxy_is_used_when_no_other_is_available():
+    pool = ProxyPool(["only"], failure_threshold=1, timer=FakeTimer())
+    pool.record_failure("only")
+
+    assert pool.acquire() == "only"
+
+
+def test_stats_report_health_per_proxy():
+    pool = ProxyPool(["a"], timer=FakeTimer())
+    pool.record_success("a", 0.25)
+    pool.record_failure("a", throttled=True)
+
+    [stats] = pool.stats()
+
+    assert stats["proxy"] == "a"
+    assert stats["state"] == "closed"
+    assert stats["requests"] == 2
+    assert stats["throttled"] == 1
+    assert stats["recent_throttles"] == 1
+    assert stats["latency_ms"] == 250.0
+    assert 0 < stats["success_rate"] < 1
@@ -0,0 +1,108 @@
+import asyncio
+
+from src.common.rate_limiter import AdaptiveConcurrency, RateLimiter, TokenBucket
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    timer = FakeTimer()
+    bucket = TokenBucket(rate=2, burst=2, timer=timer)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays == [0.0, 0.0, 0.5, 1.0]
+    timer.now = 10
+    assert bucket.reserve() == 0.0
+
+
+def test_token_bucket_rate_backs_off_and_recovers():
+    bucket = TokenBucket(rate=10, min_rate=2, timer=FakeTimer())
+
+    for _ in range(5):
+        bucket.penalize()
+    assert bucket.rate == 2
+
+    for _ in range(40):
+        bucket.reward()
+    assert bucket.rate == 10
+
+
+def test_rate_limiter_keeps_a_bucket_per_key():
+    limiter = RateLimiter(rate=1)
+
+    assert limiter.bucket(("linkedin.com", "proxy-a")) is limiter.bucket(
+        ("linkedin.com", "proxy-a")
+    )
+    assert limiter.bucket(("linkedin.com", "proxy-a")) is not limiter.bucket(
+        ("linkedin.com", "proxy-b")
+    )
+
+
+def test_concurrency_grows_on_success_and_halves_on_throttling():
+    timer = FakeTimer()
+    concurrency = AdaptiveConcurrency(initial=4, maximum=8, timer=timer)
+
+    for _ in range(20):
+        concurrency.on_success(0.1)
+    assert concurrency.limit > 6
+
+    concurrency.on_throttled()
+    limit = concurrency.limit
+    concurrency.on_throttled()
+    assert limit == concurrency.limit  # within the cooldown
+
+    timer.now = 5
+    concurrency.on_throttled()
+    assert concurrency.limit == limit / 2
+
+
+def test_concurrency_backs_off_when_latency_rises():
+    timer = FakeTimer()
+    concurrency = AdaptiveConcurrency(initial=8, latency_tolerance=2, timer=timer)
+    concurrency.on_success(0.1)
+
+    for _ in range(10):
+        timer.now += 2
+        concurrency.on_success(1.0)
+
+    assert concurrency.limit == 1
+
+
+def test_concurrency_recovers_from_one_fast_outlier():
+    timer = FakeTimer()
+    concurrency = AdaptiveConcurrency(
+        initial=4, maximum=8, latency_tolerance=2, baseline_window=20, timer=timer
+    )
+    concurrency.on_success(0.001)
+
+    for _ in range(100):
+        timer.now += 2
+        concurrency.on_success(0.1)
+
+    assert concurrency.limit == 8
+
+
+def test_concurrency_limits_requests_in_flight():
+    concurrency = AdaptiveConcurrency(initial=2, maximum=2)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with concurrency:
+            peak = max(peak, concurrency.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert peak == 2
+    assert concurrency.in_flight == 0
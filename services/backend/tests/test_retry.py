@@ -0,0 +1,85 @@
+import asyncio
+
+from aiohttp import ClientConnectionError, ClientResponseError, RequestInfo
+from multidict import CIMultiDict
+from yarl import URL
+
+from src.common.retry import RetryBudget, RetryMetrics, RetryPolicy, retry_after
+
+
+def response_error(status: int, **headers) -> ClientResponseError:
+    url = URL("https://host/page")
+    request_info = RequestInfo(url, "GET", CIMultiDict(), url)
+    return ClientResponseError(
+        request_info, (), status=status, headers=CIMultiDict(headers)
+    )
+
+
+class FlakyFetch:
+    """Raises the given errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+def run(policy: RetryPolicy, fetch: FlakyFetch, url: str = "https://host/page"):
+    return asyncio.run(policy.run(url, fetch))
+
+
+def test_transient_errors_are_retried():
+    fetch = FlakyFetch(
+        response_error(503), ClientConnectionError(), response_error(429)
+    )
+    policy = RetryPolicy(max_retries=3, base_delay=0, jitter=False)
+
+    assert run(policy, fetch) == "ok"
+    assert fetch.calls == 4
+
+
+def test_permanent_client_errors_are_not_retried():
+    fetch = FlakyFetch(response_error(404))
+    policy = RetryPolicy(max_retries=3, base_delay=0)
+
+    assert run(policy, fetch) is None
+    assert fetch.calls == 1
+
+
+def test_retry_after_overrides_backoff_up_to_max_delay():
+    policy = RetryPolicy(base_delay=1, max_delay=30, jitter=False)
+
+    assert policy.backoff(1, response_error(429, **{"Retry-After": "7"})) == 7
+    assert policy.backoff(1, response_error(429, **{"Retry-After": "120"})) == 30
+    assert policy.backoff(3, response_error(503)) == 4
+    assert retry_after(response_error(503, **{"Retry-After": "soon"})) is None
+
+
+def test_budget_limits_retries_across_requests():
+    budget = RetryBudget(ratio=0.1, min_retries=1)
+    policy = RetryPolicy(max_retries=5, base_delay=0, budget=budget)
+
+    fetches = [FlakyFetch(response_error(503), response_error(503)) for _ in range(3)]
+    results = [run(policy, fetch) for fetch in fetches]
+
+    assert results == ["ok", None, None]
+    assert budget.retries == 2
+
+
+def test_metrics_are_grouped_by_url_pattern():
+    metrics = RetryMetrics({"job": r"/jobs/view/\d+"})
+    policy = RetryPolicy(max_retries=1, base_delay=0, jitter=False, metrics=metrics)
+
+    run(policy, FlakyFetch(response_error(500)), "https://host/jobs/view/1/")
+    run(policy, FlakyFetch(response_error(500), response_error(500)), "https://host/x")
+
+    stats = metrics.stats()
+    assert stats["job"]["attempts"] == 2
+    assert stats["job"]["giveups"] == 0
+    assert stats["host"]["attempts"] == 2
+    assert stats["host"]["giveups"] == 1
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from src.linkedin import scraper, worker
+from src.linkedin.pipeline import PipelineStats
+from src.linkedin.runs import LeaseLost, ScrapeRun, ScrapeRunStatus, ScrapeRunStore
+from src.linkedin.worker import ScrapeWorker
+
+
+def queued_run():
+    return ScrapeRun.create(
+        keywords=["python developer"],
+        locations=["Croatia"],
+        timespan="r86400",
+        max_pages=5,
+    )
+
+
+def test_runs_are_claimed_by_one_worker_at_a_time(scrape_run_store, job_store):
+    run = queued_run()
+    scrape_run_store.add(run)
+
+    claimed = scrape_run_store.claim("worker-a")
+
+    assert claimed.id == run.id
+    assert claimed.status == ScrapeRunStatus.RUNNING
+    assert claimed.attempts == 1
+    assert scrape_run_store.claim("worker-b") is None
+    stolen = scrape_run_store.get(str(run.id))
+    stolen.worker = "worker-b"
+    with pytest.raises(LeaseLost):
+        scrape_run_store.save(stolen)
+    jobs, _ = job_store.get_all(limit=10)
+    assert jobs == []
+
+
+def test_abandoned_runs_are_reclaimed(scrape_run_store):
+    scrape_run_store.add(queued_run())
+    expired = ScrapeRunStore(scrape_run_store.table, lease_seconds=-60)
+    abandoned = expired.claim("worker-a")
+
+    resumed = scrape_run_store.claim("worker-b")
+
+    assert resumed.id == abandoned.id
+    assert resumed.worker == "worker-b"
+    assert resumed.attempts == 2
+    with pytest.raises(LeaseLost):
+        expired.save(abandoned)
+
+
+def test_scheduled_scraper_only_queues_a_run(scrape_run_store, monkeypatch):
+    monkeypatch.setattr(scraper, "get_scrape_run_store", lambda: scrape_run_store)
+
+    result = scraper.handler({"keywords": "rust developer", "max_pages": 3}, None)
+
+    run = scrape_run_store.claim("worker-a")
+    assert str(run.id) == result["run_id"]
+    assert (run.keywords, run.max_pages) == (["rust developer"], 3)
+    assert run.locations == scraper.settings.SCRAPE_LOCATIONS
+
+
+def test_worker_retries_a_failed_run_from_its_checkpoint(scrape_run_store, monkeypatch):
+    run = queued_run()
+    scrape_run_store.add(run)
+    resumed_from = []
+
+    async def fake_run_plan(plan, checkpoint):
+        queries, start_pages = checkpoint.resume(plan.queries())
+        resumed_from.append(start_pages)
+        stats = PipelineStats(pages_fetched=2, jobs_stored=25)
+        if len(resumed_from) == 1:
+            await checkpoint.record(queries[0], 2, False, stats)
+            raise RuntimeError("proxy pool exhausted")
+        await checkpoint.record(queries[0], 3, True, stats)
+        return stats
+
+    monkeypatch.setattr(worker, "run_plan", fake_run_plan)
+    scrape_worker = ScrapeWorker(scrape_run_store, worker_id="worker-a")
+
+    asyncio.run(scrape_worker.run_next())
+    failed = scrape_run_store.get(str(run.id))
+    asyncio.run(scrape_worker.run_next())
+    done = scrape_run_store.get(str(run.id))
+
+    assert failed.status == ScrapeRunStatus.QUEUED
+    assert failed.error == "proxy pool exhausted"
+    assert resumed_from == [[0], [2]]
+    assert done.status == ScrapeRunStatus.SUCCEEDED
+    assert done.finished_at is not None
+    assert done.searches_finished == 1
+    assert done.stats["pages_fetched"] == 4
+    assert done.stats["jobs_stored"] == 50
+
+
+def test_queue_scrape_and_report_its_progress(client, admin_token, token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    response = client.post(
+        "/api/v1/scrape/linkedin",
+        params={"keywords": ["python developer", "data engineer"]},
+        headers=headers,
+    )
+    assert response.status_code == 202
+    run_id = response.json()["id"]
+
+    response = client.get(f"/api/v1/scrape/jobs/{run_id}", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "QUEUED"
+    assert body["keywords"] == ["python developer", "data engineer"]
+    assert body["progress"]["pages_fetched"] == 0
+    assert body["throughput"]["pages_per_minute"] == 0.0
+
+    response = client.get(
+        "/api/v1/scrape/jobs/00000000-0000-0000-0000-000000000000", headers=headers
+    )
+    assert response.status_code == 404
+    response = client.get(
+        f"/api/v1/scrape/jobs/{run_id}",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 403
@@ -0,0 +1,282 @@
+import uuid
+
+import boto3
+from starlette import status
+
+from src.job.model import Job, JobStatus
+from src.search.build import build_snapshot, publish_snapshot
+from src.search.index import JobSearchIndex, build_index, tokenize
+from src.search.snapshots import SearchSnapshots
+
+
+def make_job(title, company="Tech Corp", location="Zagreb", description=""):
+    job = Job.create(
+        id_=uuid.uuid4(),
+        title=title,
+        company=company,
+        location=location,
+        job_url="https://example.com/job",
+        description=description,
+        logo_url=None,
+        author="admin@email.com",
+    )
+    job.activate()
+    return job
+
+
+def draft_job(title):
+    job = make_job(title)
+    job.status = JobStatus.DRAFT
+    return job
+
+
+def hit_titles(result):
+    return [summary["title"] for summary, _ in result.hits]
+
+
+def test_tokenize_folds_case_and_accents_and_drops_stopwords():
+    assert tokenize("Developer in Zürich, ŠIBENIK & the Čakovec") == [
+        "developer",
+        "zurich",
+        "sibenik",
+        "cakovec",
+    ]
+
+
+def test_title_matches_rank_above_description_matches():
+    index = build_index(
+        [
+            make_job("Accountant", description="Works with our python team"),
+            make_job("Python Developer"),
+            make_job("Java Developer"),
+        ]
+    )
+
+    result = index.search("python developer")
+
+    assert result.total == 3
+    assert hit_titles(result) == ["Python Developer", "Java Developer", "Accountant"]
+    assert index.search("rust").total == 0
+
+
+def test_filters_restrict_hits_to_company_and_location():
+    index = build_index(
+        [
+            make_job("Python Developer", company="Big Corp", location="Split"),
+            make_job("Python Engineer", company="Big Corp", location="Zagreb"),
+            make_job("Python Developer", company="Small Corp", location="Zagreb"),
+        ]
+    )
+
+    result = index.search("python", company="big corp", location="zagreb")
+
+    assert result.total == 1
+    assert hit_titles(result) == ["Python Engineer"]
+
+
+def test_statuses_restrict_hits_in_the_snapshot_and_since(tmp_path):
+    closed = make_job("Python Architect")
+    closed.close()
+    path = str(tmp_path / "jobs.idx")
+    build_index(
+        [make_job("Python Developer"), draft_job("Python Intern"), closed]
+    ).write(path)
+    index = JobSearchIndex.open(path)
+    index.job_saved(draft_job("Python Engineer"))
+    published = draft_job("Python Tester")
+    index.job_saved(published)
+    published.activate()
+    index.job_saved(published)
+
+    active = index.search("python", statuses=[JobStatus.ACTIVE])
+    unpublished = index.search("python", statuses=[JobStatus.DRAFT, JobStatus.CLOSED])
+
+    assert sorted(hit_titles(active)) == ["Python Developer", "Python Tester"]
+    assert sorted(hit_titles(unpublished)) == [
+        "Python Architect",
+        "Python Engineer",
+        "Python Intern",
+    ]
+    assert index.search("python").total == 5
+    index.snapshot.close()
+
+
+def test_limit_and_offset_page_through_hits():
+    index = build_index([make_job(f"Python Developer {n}") for n in range(5)])
+
+    first = index.search("python", limit=2)
+    rest = index.search("python", limit=10, offset=2)
+
+    assert first.total == rest.total == 5
+    assert len(first.hits) == 2
+    assert len(rest.hits) == 3
+    assert not set(hit_titles(first)) & set(hit_titles(rest))
+
+
+def test_snapshot_serves_the_same_results(tmp_path):
+    jobs = [
+        make_job("Python Developer", description="Django and FastAPI"),
+        make_job("Data Engineer", description="Python, Spark and Airflow"),
+        make_job("Frontend Developer", company="Web Shop", location="Split"),
+    ]
+    built = build_index(jobs)
+    path = str(tmp_path / "jobs.idx")
+
+    built.write(path)
+    mapped = JobSearchIndex.open(path)
+
+    assert mapped.size == 3
+    for query in ("python", "developer", "airflow", "frontend split"):
+        expected, actual = built.search(query), mapped.search(query)
+        assert actual.total == expected.total
+        assert hit_titles(actual) == hit_titles(expected)
+        for (_, expected_score), (_, score) in zip(expected.hits, actual.hits):
+            assert abs(score - expected_score) < 1e-4
+    assert mapped.search("developer", location="split").total == 1
+    mapped.snapshot.close()
+
+
+def test_changes_shadow_the_snapshot_until_it_is_rewritten(tmp_path):
+    python, java = make_job("Python Developer"), make_job("Java Developer")
+    path = str(tmp_path / "jobs.idx")
+    build_index([python, java]).write(path)
+    index = JobSearchIndex.open(path)
+    created_at = python.created_at
+
+    python.title = "Rust Developer"
+    python.created_at = "2030-01-01T00:00:00+00:00"
+    index.job_saved(python)
+    index.job_deleted(str(java.id), java.author)
+    index.job_saved(make_job("Go Developer"))
+
+    assert index.size == 2
+    assert index.search("python").total == 0
+    assert index.search("java").total == 0
+    assert hit_titles(index.search("developer")) == ["Rust Developer", "Go Developer"]
+    # Refreshed listings keep the creation time of the indexed job.
+    assert index.search("rust").hits[0][0]["created_at"] == created_at
+
+    rewritten = str(tmp_path / "rewritten.idx")
+    index.write(rewritten)
+    reopened = JobSearchIndex.open(rewritten)
+    assert reopened.size == 2
+    assert sorted(hit_titles(reopened.search("developer"))) == [
+        "Go Developer",
+        "Rust Developer",
+    ]
+    index.snapshot.close()
+    reopened.snapshot.close()
+
+
+def test_index_follows_job_store_writes(job_store, search_index):
+    job = make_job("Python Developer")
+
+    job_store.add(job)
+    assert hit_titles(search_index.search("python")) == ["Python Developer"]
+
+    job.title = "Rust Developer"
+    job_store.update(job)
+    assert search_index.search("python").total == 0
+    assert hit_titles(search_index.search("rust")) == ["Rust Developer"]
+
+    job_store.delete(str(job.id), job.author)
+    assert search_index.size == 0
+
+
+def test_build_snapshot_indexes_every_job_in_the_table(job_store, tmp_path):
+    job_store.add_many([make_job(f"Python Developer {n}") for n in range(3)])
+    path = str(tmp_path / "jobs.idx")
+
+    assert build_snapshot(job_store, path) == 3
+
+    index = JobSearchIndex.open(path)
+    assert index.search("python").total == 3
+    index.snapshot.close()
+
+
+def test_search_jobs(client, job_store):
+    job_store.add(make_job("Python Developer", company="Big Corp"))
+    job_store.add(make_job("Java Developer"))
+
+    response = client.get(
+        "/api/v1/jobs/search", params={"q": "python", "company": "big corp"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["total"] == 1
+    assert body["hits"][0]["title"] == "Python Developer"
+    assert body["hits"][0]["score"] > 0
+    assert "description" not in body["hits"][0]
+
+
+def test_search_jobs_only_returns_active_jobs(client, job_store):
+    job_store.add(make_job("Python Developer"))
+    job_store.add(draft_job("Python Engineer"))
+
+    response = client.get("/api/v1/jobs/search", params={"q": "python"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [hit["title"] for hit in response.json()["hits"]] == ["Python Developer"]
+
+
+def test_snapshots_follow_the_published_snapshot(job_store, tmp_path):
+    s3 = boto3.client("s3", region_name="eu-central-1")
+    s3.create_bucket(
+        Bucket="search-index",
+        CreateBucketConfiguration={"LocationConstraint": "eu-central-1"},
+    )
+    now = [0.0]
+    snapshots = SearchSnapshots(
+        str(tmp_path / "jobs.idx"),
+        bucket="search-index",
+        key="search/jobs.idx",
+        refresh_seconds=60,
+        s3=s3,
+        timer=lambda: now[0],
+    )
+    assert snapshots.current().size == 0
+
+    job_store.add(make_job("Python Developer"))
+    assert publish_snapshot(job_store, "search-index", "search/jobs.idx", s3=s3) == 1
+    now[0] = 60
+    first = snapshots.current()
+    assert hit_titles(first.search("python")) == ["Python Developer"]
+
+    # Writes of this process reach the current index straight away.
+    job_store.listeners.subscribe(snapshots)
+    job_store.add(make_job("Python Engineer"))
+    assert first.search("python").total == 2
+
+    publish_snapshot(job_store, "search-index", "search/jobs.idx", s3=s3)
+    now[0] = 90
+    assert snapshots.current() is first
+    now[0] = 120
+    second = snapshots.current()
+    assert second is not first
+    assert second.snapshot.size == 2
+    # The previous snapshot stays readable for searches still using it.
+    assert first.search("developer").total == 1
+    first.snapshot.close()
+    second.snapshot.close()
+
+
+def test_snapshots_start_empty_and_never_scan_the_table(job_store, tmp_path):
+    job_store.add(make_job("Python Developer"))
+    path = str(tmp_path / "jobs.idx")
+    now = [0.0]
+    snapshots = SearchSnapshots(path, refresh_seconds=60, timer=lambda: now[0])
+
+    assert snapshots.current().size == 0
+
+    build_snapshot(job_store, path)
+    now[0] = 60
+    index = snapshots.current()
+    assert hit_titles(index.search("python")) == ["Python Developer"]
+    index.snapshot.close()
+
+
+def test_search_jobs_requires_a_query(client):
+    response = client.get("/api/v1/jobs/search", params={"q": ""})
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -84,6 +84,31 @@ def test_get_current_user(client, token, user_email):
     assert body["roles"] == ["User"]
 
 
+def test_get_current_user_is_cached(client, token, mock_cognito_get_user):
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/v1/users/me", headers=headers)
+    second = client.get("/api/v1/users/me", headers=headers)
+
+    assert first.status_code == status.HTTP_200_OK
+    assert second.json() == first.json()
+    assert mock_cognito_get_user.call_count == 1
+
+
+@patch("src.aws.cognito.Cognito.sign_out")
+def test_sign_out_evicts_cached_user(
+    mock_sign_out, client, token, mock_cognito_get_user
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    client.get("/api/v1/users/me", headers=headers)
+
+    response = client.post("/api/v1/auth/sign_out", headers=headers)
+    client.get("/api/v1/users/me", headers=headers)
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert mock_cognito_get_user.call_count == 2
+
+
 @patch("src.aws.cognito.Cognito.authenticate_refresh_token")
 def test_refresh_token(mock_refresh_token, client):
     mock_refresh_token.return_value = {
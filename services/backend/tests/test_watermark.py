@@ -0,0 +1,57 @@
+import datetime
+
+from src.job.model import Job
+from src.job.store import JobStore
+from src.linkedin.watermark import SearchWatermark, WatermarkStore
+
+NOW = datetime.datetime(2026, 10, 18, 12, tzinfo=datetime.UTC)
+
+
+def test_timespan_reaches_back_to_the_overlap_only():
+    watermark = SearchWatermark("python developer|croatia", newest="2026-10-17")
+
+    # From the start of 2026-10-16 until noon on 2026-10-18.
+    assert watermark.timespan("r2592000", now=NOW) == "r216000"
+    assert watermark.timespan("r86400", now=NOW) == "r86400"
+    assert SearchWatermark("new search").timespan("r2592000") == "r2592000"
+
+
+def test_advance_keeps_only_postings_inside_the_overlap():
+    watermark = SearchWatermark("python developer|croatia")
+    watermark.advance([("a", "2026-10-15"), ("b", "2026-10-14"), ("c", "")])
+    watermark.advance([("d", "2026-10-16")])
+
+    assert watermark.newest == "2026-10-16"
+    assert watermark.seen == {"a": "2026-10-15", "d": "2026-10-16"}
+    assert watermark.reached([("a", "2026-10-15"), ("d", "2026-10-16")])
+    assert watermark.reached([("e", "2026-10-16"), ("b", "2026-10-14")])
+    assert not watermark.reached([("e", "2026-10-16"), ("f", "2026-10-15")])
+
+
+def test_watermarks_round_trip_without_showing_up_as_jobs(dynamodb_table):
+    job_store = JobStore(dynamodb_table)
+    job_store.add(
+        Job.create(
+            id_="7c2c0f56-7d0b-4d43-a35c-5c2f1bd1d1aa",
+            title="Backend Developer",
+            company="Acme",
+            location="Zagreb",
+            job_url="https://www.linkedin.com/jobs/view/1/",
+            description="",
+            logo_url="",
+            author="admin@email.com",
+        )
+    )
+    store = WatermarkStore(job_store.table)
+    watermark = SearchWatermark(
+        "python developer|croatia", newest="2026-10-16", seen={"a": "2026-10-16"}
+    )
+
+    store.put(watermark)
+
+    assert store.get("python developer|croatia") == watermark
+    assert store.get("data engineer|croatia") == SearchWatermark(
+        "data engineer|croatia"
+    )
+    jobs, _ = job_store.get_all(limit=10)
+    assert [job.title for job in jobs] == ["Backend Developer"]